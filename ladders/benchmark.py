@@ -0,0 +1,456 @@
+"""
+Benchmarks of the ladder algorithms.
+
+A benchmark runs every algorithm, with and without a cache, both looking for
+the first ladder and for a shortest one, on a set of word lists and a
+reproducible random set of START TARGET pairs from each of them. For every
+query it records the wall time, the search stats (see
+``search.SearchStats``), how much memory the query needed and the length of
+the ladder found. Results are saved as JSON, and two runs can be compared to
+find regressions.
+
+There is also a micro-benchmark of the ways to compute the distance between
+two words, packed (see ``ladders.packed``) and letter by letter.
+"""
+import argparse
+import collections
+import json
+import os
+import pickle
+import random
+import sqlite3
+import string
+import sys
+import time
+import timeit
+import traceback
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from ladders import cache, graph, main, packed, parallel, search, wordlist
+
+
+SAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                       "samples")
+
+Result = collections.namedtuple("Result", [
+    "dictionary", "algorithm", "cache", "optimal", "start", "target",
+    "seconds", "nodes_expanded", "nodes_generated", "max_queue",
+    "lookup_seconds", "peak_memory", "length", "timed_out"])
+
+
+
+def sample_dictionaries(directory=SAMPLES):
+    """
+    Returns the paths of the word lists shipped in the samples directory.
+    """
+    return [os.path.join(directory, fn) for fn in sorted(os.listdir(directory))
+            if not fn.startswith(".")]
+
+
+def synthetic_words(length, count, seed=0, alphabet=string.ascii_uppercase[:8]):
+    """
+    Generates a reproducible random word list.
+
+    Words are drawn from a small alphabet, so that the list is dense enough
+    for most words to be connected by ladders.
+    """
+    if count > len(alphabet) ** length:
+        raise ValueError("can't make {} distinct words of length {}".format(
+            count, length))
+
+    rng = random.Random("{}:{}:{}".format(seed, length, count))
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(alphabet) for _ in xrange(length)))
+    return sorted(words)
+
+
+def random_pairs(words, count, seed=0):
+    """
+    Picks a reproducible random set of START TARGET pairs of words of the
+    same length.
+    """
+    by_length = collections.defaultdict(list)
+    for word in sorted(set(words)):
+        by_length[len(word)].append(word)
+    groups = [group for _, group in sorted(by_length.items()) if len(group) > 1]
+    if not groups:
+        return []
+
+    rng = random.Random(seed)
+    pairs = []
+    for _ in xrange(count):
+        group = rng.choice(groups)
+        pairs.append(tuple(rng.sample(group, 2)))
+    return pairs
+
+
+def isolated(function, *args):
+    """
+    Calls a function in a forked child process.
+
+    Returns what the function returned, which must be picklable, and how
+    much the peak resident memory of the child grew during the call, in
+    kilobytes. A forked child's peak starts out at what the parent has
+    resident when it forks, so the growth is what the call itself needed, no
+    matter what earlier calls made the parent use. Nothing the function
+    caches survives the call, either.
+
+    Where processes can't be forked, the function is called in this process
+    and the growth is None.
+    """
+    if resource is None or not hasattr(os, "fork"):
+        return function(*args), None
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0: # pragma: no cover (the child exits without reporting)
+        os.close(read_fd)
+        try:
+            before = _peak_memory()
+            outcome = True, (function(*args), _peak_memory() - before)
+        except BaseException:
+            outcome = False, traceback.format_exc()
+        try:
+            with os.fdopen(write_fd, "wb") as f:
+                pickle.dump(outcome, f, pickle.HIGHEST_PROTOCOL)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as f:
+        data = f.read()
+    os.waitpid(pid, 0)
+    if not data:
+        raise RuntimeError("the benchmark process died")
+
+    succeeded, outcome = pickle.loads(data)
+    if not succeeded:
+        raise RuntimeError("the benchmark process failed:\n" + outcome)
+    return outcome
+
+
+def _peak_memory():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_query(algorithm, start, target, words, source, optimal=False,
+              timeout=None):
+    """
+    Finds one ladder with an algorithm and measures how it went.
+
+    Returns the wall time in seconds, the stats of the search, the length of
+    the ladder found (None if there was none) and whether the query timed
+    out. A query that times out reports no ladder.
+    """
+    stats = search.SearchStats()
+    ladder, timed_out = [], False
+    began = time.time()
+
+    try:
+        with parallel.time_limit(timeout):
+            ladder.append(main.find_ladder(algorithm, start, target, words,
+                                           source, optimal, stats))
+    except parallel.Timeout:
+        timed_out = True
+
+    seconds = time.time() - began
+    length = len(ladder[0]) if ladder and ladder[0] is not None else None
+    return seconds, stats, length, timed_out
+
+
+def run(dictionaries, algorithms=None, pairs=10, seed=0, timeout=None,
+        progress=None):
+    """
+    Runs the benchmark and returns a list of results.
+
+    The dictionaries are ``(name, words)`` pairs. Algorithms are names from
+    ``main.algorithms``; all of them by default. Every algorithm runs with
+    and without a cache, looking for the first ladder and for a shortest one,
+    on the same random pairs of each dictionary. Every query runs in a
+    process of its own (see ``isolated``), so it starts with the same caches
+    as the others and its peak memory use is its own. The progress function,
+    if given, is called with every result.
+    """
+    if algorithms is None:
+        algorithms = sorted(main.algorithms)
+
+    results = []
+    for name, words in dictionaries:
+        sources = [(False, main.make_neighbor_source(words, None))]
+        word_cache = cache.Cache(sqlite3.connect(":memory:"))
+        word_cache.add_words(words)
+        sources.append((True, word_cache))
+
+        queries = random_pairs(words, pairs, seed)
+        for algorithm_name in algorithms:
+            algorithm = main.algorithms[algorithm_name]
+            for cached, source in sources:
+                for optimal in (False, True):
+                    for start, target in queries:
+                        measured, memory = isolated(
+                            run_query, algorithm, start, target, words,
+                            source, optimal, timeout)
+                        seconds, stats, length, timed_out = measured
+                        result = Result(name, algorithm_name, cached, optimal,
+                                        start, target, seconds, stats.expanded,
+                                        stats.generated, stats.max_queue,
+                                        stats.lookup_time, memory, length,
+                                        timed_out)
+                        results.append(result)
+                        if progress is not None:
+                            progress(result)
+
+    return results
+
+
+def save(results, f, **settings):
+    """
+    Writes results as JSON, along with the settings they were made with.
+    """
+    json.dump({"settings": settings,
+               "results": [result._asdict() for result in results]},
+              f, indent=1, sort_keys=True)
+    f.write("\n")
+
+
+def load(f):
+    """
+    Reads results written by ``save``.
+
+    Fields that older results don't have are None.
+    """
+    missing = dict.fromkeys(Result._fields)
+    return [Result(**dict(missing, **result))
+            for result in json.load(f)["results"]]
+
+
+def summarize(results):
+    """
+    Adds up results per dictionary, algorithm, cache and optimal setting.
+
+    Returns a dictionary from those to the total time, the total number of
+    nodes expanded, the number of ladders found, their total length and the
+    number of queries that timed out.
+    """
+    totals = collections.OrderedDict()
+    for result in results:
+        key = (result.dictionary, result.algorithm, result.cache,
+               result.optimal)
+        seconds, nodes, found, length, timeouts = totals.get(key,
+                                                             (0, 0, 0, 0, 0))
+        totals[key] = (seconds + result.seconds,
+                       nodes + result.nodes_expanded,
+                       found + (result.length is not None),
+                       length + (result.length or 0),
+                       timeouts + result.timed_out)
+    return totals
+
+
+def compare(old, new, threshold=0.2):
+    """
+    Compares two runs and returns messages about regressions.
+
+    Only the queries that are in both runs are compared. Each configuration
+    is a regression if it got slower on them by more than the threshold (a
+    fraction), expanded more nodes, found fewer ladders or longer ones, or
+    timed out more often.
+    """
+    common = set(map(_query, old)) & set(map(_query, new))
+    old_totals = summarize(result for result in old if _query(result) in common)
+    new_totals = summarize(result for result in new if _query(result) in common)
+    regressions = []
+    for key, (seconds, nodes, found, length, timeouts) in new_totals.items():
+        old_seconds, old_nodes, old_found, old_length, old_timeouts = \
+            old_totals[key]
+        label = "{} {}{}{}".format(key[0], key[1],
+                                   " --cache" if key[2] else "",
+                                   " --optimal" if key[3] else "")
+
+        if seconds > old_seconds * (1 + threshold):
+            regressions.append("{}: {:.3f}s, was {:.3f}s".format(
+                label, seconds, old_seconds))
+        if nodes > old_nodes:
+            regressions.append("{}: {} nodes expanded, was {}".format(
+                label, nodes, old_nodes))
+        if found < old_found:
+            regressions.append("{}: {} ladders found, was {}".format(
+                label, found, old_found))
+        elif found == old_found and length > old_length:
+            regressions.append("{}: total ladder length {}, was {}".format(
+                label, length, old_length))
+        if timeouts > old_timeouts:
+            regressions.append("{}: {} queries timed out, was {}".format(
+                label, timeouts, old_timeouts))
+
+    return regressions
+
+
+def _query(result):
+    return (result.dictionary, result.algorithm, result.cache, result.optimal,
+            result.start, result.target)
+
+
+def _zip_distance(word_one, word_two):
+    return sum(1 for (x, y) in zip(word_one, word_two) if x != y)
+
+
+def _list_distance(word_one, word_two):
+    return sum([1 for (x, y) in zip(word_one, word_two) if x != y])
+
+
+def _loop_distance(word_one, word_two):
+    s = 0
+    for (x, y) in zip(word_one, word_two):
+        s += x != y
+    return s
+
+
+def _packed_distance(word_one, word_two):
+    return packed.distance(packed.try_encode(word_one),
+                           packed.try_encode(word_two),
+                           packed.lane_mask(len(word_one)))
+
+
+distance_functions = collections.OrderedDict([
+    ("generator", _zip_distance),
+    ("loop", _loop_distance),
+    ("list", _list_distance),
+    ("packed", _packed_distance),
+    ("graph", graph.distance),
+])
+
+DISTANCE_SAMPLES = [
+    ("PIG", "WIG"),
+    ("PIG", "STY"),
+    ("AAAAAAAAAAAAAA", "AAAAAAAAAAAAAA"),
+    ("AAAAAAAAAAAAAA", "AAAAAAAAAAAAAB"),
+]
+
+
+def time_distances(names=None, samples=DISTANCE_SAMPLES, number=100000):
+    """
+    Times the ways of computing the distance between two words.
+
+    Names are keys of ``distance_functions``; all of them by default. Returns
+    an ordered dictionary from every name to the seconds it took to compute
+    the distance between each pair of sample words ``number`` times.
+    """
+    timings = collections.OrderedDict()
+    for name in names or distance_functions:
+        f = distance_functions[name]
+        timings[name] = [timeit.Timer(lambda: f(a, b)).timeit(number)
+                         for a, b in samples]
+    return timings
+
+
+def parse_synthetic(spec):
+    """
+    Parses a synthetic dictionary spec of the form LENGTH:COUNT.
+    """
+    try:
+        length, count = [int(field) for field in spec.split(":")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected LENGTH:COUNT, got {!r}".format(spec))
+    return length, count
+
+
+def _print_result(result):
+    sys.stderr.write("{0.dictionary} {0.algorithm}{1}{2} {0.start} {0.target}: "
+                     "{0.seconds:.3f}s, {0.nodes_expanded} nodes, "
+                     "length {0.length}{3}\n".format(
+                         result, " --cache" if result.cache else "",
+                         " --optimal" if result.optimal else "",
+                         " (timed out)" if result.timed_out else ""))
+
+
+parser = argparse.ArgumentParser(prog="benchmark",
+    description="Benchmark the ladder algorithms")
+commands = parser.add_subparsers(dest="command")
+
+run_parser = commands.add_parser("run", help="run the benchmark")
+run_parser.add_argument('-o', '--output', dest="output", metavar="FILE",
+    action='store', type=argparse.FileType('w'), default=sys.stdout,
+    help='the file to write the results to (default: stdout)')
+run_parser.add_argument('-w', '--word-list', dest="word_lists", metavar="FILE",
+    action='append',
+    help='a word list to run on; may be given more than once (default: the '
+        'samples)')
+run_parser.add_argument('-s', '--synthetic', dest="synthetic",
+    metavar="LENGTH:COUNT", action='append', type=parse_synthetic,
+    help='also run on COUNT random words of LENGTH letters; may be given more '
+        'than once')
+run_parser.add_argument('-a', '--algorithm', dest="algorithms", metavar="ALGO",
+    action='append', choices=sorted(main.algorithms),
+    help='an algorithm to run; may be given more than once (default: all)')
+run_parser.add_argument('-p', '--pairs', dest="pairs", metavar="N",
+    action='store', type=int, default=10,
+    help='the number of START TARGET pairs per word list (default: 10)')
+run_parser.add_argument('--seed', dest="seed",
+    action='store', type=int, default=0,
+    help='the seed for picking pairs and making synthetic word lists')
+run_parser.add_argument('-t', '--timeout', dest="timeout", metavar="SECONDS",
+    action='store', type=float, default=5.0,
+    help='give up on a query after this long (default: 5, 0 for no limit)')
+
+compare_parser = commands.add_parser("compare",
+    help="compare two runs and report regressions")
+compare_parser.add_argument('old', metavar='OLD',
+    action='store', type=argparse.FileType('r'),
+    help='the results to compare against')
+compare_parser.add_argument('new', metavar='NEW',
+    action='store', type=argparse.FileType('r'),
+    help='the new results')
+compare_parser.add_argument('--threshold', dest="threshold", metavar="FRACTION",
+    action='store', type=float, default=0.2,
+    help='how much slower a configuration may get (default: 0.2)')
+
+
+distance_parser = commands.add_parser("distance",
+    help="time the ways of computing the distance between two words")
+distance_parser.add_argument('-f', '--function', dest="functions",
+    metavar="NAME", action='append', choices=list(distance_functions),
+    help='a function to time; may be given more than once (default: all)')
+distance_parser.add_argument('-n', '--number', dest="number", metavar="N",
+    action='store', type=int, default=100000,
+    help='how many times to compute each distance (default: 100000)')
+
+
+def benchmark_main(argv=None):
+    args = parser.parse_args(argv)
+
+    if args.command == "distance":
+        timings = time_distances(args.functions, number=args.number)
+        for name, seconds in timings.items():
+            print "{}:".format(name)
+            for (a, b), partial in zip(DISTANCE_SAMPLES, seconds):
+                print "    {} vs {}: {:.3f}s".format(a, b, partial)
+            print "    total: {:.3f}s".format(sum(seconds))
+        return 0
+
+    if args.command == "compare":
+        regressions = compare(load(args.old), load(args.new), args.threshold)
+        for regression in regressions:
+            print regression
+        return 1 if regressions else 0
+
+    dictionaries = []
+    for fn in args.word_lists or sample_dictionaries():
+        try:
+            dictionaries.append((os.path.basename(fn), wordlist.load_words(fn)))
+        except IOError as e:
+            run_parser.error(main.cant_open(fn, e))
+    for length, count in args.synthetic or ():
+        dictionaries.append(("synthetic-{}x{}".format(length, count),
+                             synthetic_words(length, count, args.seed)))
+
+    results = run(dictionaries, args.algorithms, args.pairs, args.seed,
+                  args.timeout, _print_result)
+    save(results, args.output, pairs=args.pairs, seed=args.seed,
+         timeout=args.timeout, dictionaries=[name for name, _ in dictionaries])
+    return 0
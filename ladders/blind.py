@@ -2,43 +2,334 @@
 """
 Functions of searching blindly in a search tree.
 """
+import functools
+import heapq
+import itertools
 import logging
 
-from ladders import search
+from ladders import graph, search
 
 
 log = logging.getLogger('ladders.blind')
 
 
-def _depth_first_expander(path, queue):
+def _depth_first_expander(extensions, queue):
     """
     A queue expander that results in a depth-first search.
     """
-    log.info("expanding queue depth-first for path %r" % (path,))
-    queue.extendleft(search._acyclic_extended_paths(path))
+    log.info("expanding queue depth-first for node %r", extensions[0][0])
+    queue.extendleft(extensions)
 
 
-def depth_first_search(root, goal):
+def _guided_depth_first_expander(extensions, queue, lower_bound):
+    """
+    A queue expander that results in a depth-first search that tries the
+    children with the smallest lower bound first.
+    """
+    log.info("expanding queue depth-first for node %r", extensions[0][0])
+    # extendleft reverses the extensions, so the last one is tried first
+    extensions.sort(key=lambda entry: lower_bound(entry[-1]), reverse=True)
+    queue.extendleft(extensions)
+
+
+def depth_first_search(root, goal, children=graph.node_children,
+                       lower_bound=None, stats=None):
     """
     Tries to find paths from the root node to a node satisfying the goal
     condition using depth-first search.
+
+    If a lower bound on the number of steps to a goal is given, searches for
+    a shortest path instead; the last path found is a shortest one. The
+    children of every node are then tried in order of their lower bound, so
+    that the first path is found quickly and is short: every node reached
+    again along a shorter path is expanded again, and the sooner paths are
+    short, the sooner the bound prunes the rest. If stats are given, what
+    the search does is counted in them.
     """
-    log.info("starting depth-first search from %r" % (root,))
-    return search._generic_search(root, goal, _depth_first_expander)
+    log.info("starting depth-first search from %r", root)
+    expander = _depth_first_expander
+    if lower_bound is not None:
+        expander = functools.partial(_guided_depth_first_expander,
+                                     lower_bound=lower_bound)
+    return search._generic_search(root, goal, expander, children,
+                                  lower_bound, stats)
 
 
-def _breadth_first_expander(path, queue):
+def _breadth_first_expander(extensions, queue):
     """
     A queue expander that results in a breadth-first search.
     """
-    log.info("expanding queue breadth-first for path %r" % (path,))
-    queue.extend(search._acyclic_extended_paths(path))
+    log.info("expanding queue breadth-first for node %r", extensions[0][0])
+    queue.extend(extensions)
 
 
-def breadth_first_search(root, goal):
+def breadth_first_search(root, goal, children=graph.node_children,
+                         lower_bound=None, stats=None):
     """
     Tries to find paths from the root node to a node satisfying the goal
     condition using breadth-first search.
+
+    If a lower bound on the number of steps to a goal is given, searches for
+    a shortest path instead; the last path found is a shortest one. If stats
+    are given, what the search does is counted in them.
     """
-    log.info("starting breadth-first search from %r" % (root,))
-    return search._generic_search(root, goal, _breadth_first_expander)
+    log.info("starting breadth-first search from %r", root)
+    return search._generic_search(root, goal, _breadth_first_expander, children,
+                                  lower_bound, stats)
+
+
+def bidirectional_search(root, target, children=graph.node_children,
+                         stats=None):
+    """
+    Tries to find a shortest path from the root node to the target node using
+    bidirectional breadth-first search.
+
+    One breadth-first search starts at the root and another one at the
+    target. Each step expands an entire layer of whichever side has the
+    smaller frontier, and the search stops as soon as the two sides meet.
+    The first meeting is always on a shortest path. Because the search from
+    the target follows children as well, this assumes the graph is
+    undirected (a node is always a child of its children), which is true for
+    word ladders.
+
+    Unlike the other search functions, this takes a target node rather than a
+    goal condition, and yields at most one path. If stats are given, what
+    the search does is counted in them.
+    """
+    log.info("starting bidirectional search from %r to %r", root, target)
+    if stats is not None:
+        children = stats.counted(children)
+        return stats.timed(_bidirectional_search(root, target, children,
+                                                 stats))
+
+    return _bidirectional_search(root, target, children)
+
+
+def _bidirectional_search(root, target, children, stats=None):
+    if root == target:
+        yield [root]
+        return
+
+    forward, backward = {root: None}, {target: None}
+    forward_frontier, backward_frontier = [root], [target]
+
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = _expand_frontier(
+                forward_frontier, forward, backward, children, stats)
+        else:
+            backward_frontier, meeting = _expand_frontier(
+                backward_frontier, backward, forward, children, stats)
+
+        if stats is not None:
+            stats.queued(len(forward_frontier) + len(backward_frontier))
+
+        if meeting is not None:
+            log.info("searches met at %r", meeting)
+            yield _join_paths(meeting, forward, backward)
+            return
+
+
+def _expand_frontier(frontier, parents, other_parents, children, stats=None):
+    """
+    Expands one layer of one side of a bidirectional search.
+
+    Returns the next frontier and the first node that has been reached from
+    both sides, if any.
+    """
+    next_frontier = []
+
+    for node in frontier:
+        if stats is not None:
+            stats.expanded += 1
+
+        for child in children(node):
+            if child in parents:
+                continue
+
+            parents[child] = node
+            if stats is not None:
+                stats.generated += 1
+            if child in other_parents:
+                return next_frontier, child
+
+            next_frontier.append(child)
+
+    return next_frontier, None
+
+
+def _join_paths(meeting, forward, backward):
+    """
+    Builds the path through a meeting point of a bidirectional search.
+    """
+    path = search._follow_parents(meeting, forward)
+    path.reverse()
+    path.extend(search._follow_parents(backward[meeting], backward))
+    return path
+
+
+def all_shortest_paths_search(root, goal, children=graph.node_children,
+                              stats=None):
+    """
+    Finds every shortest path from the root node to a node satisfying the
+    goal condition.
+
+    One breadth-first pass, a layer at a time, records all the parents of
+    every node in the layer before it, up to the first layer with a goal.
+    Those parents form a directed acyclic graph of all shortest paths to the
+    goals, and following them back from the goals gives every shortest path
+    exactly once. Like any breadth-first search, the pass visits every node
+    that is closer to the root than the goals, whether it is on a shortest
+    path or not. Paths are built one at a time, as they are asked for, so
+    only the current one is kept besides the graph, and building them only
+    follows nodes that are on a shortest path.
+
+    If stats are given, what the search does is counted in them.
+    """
+    if stats is not None:
+        children = stats.counted(children)
+        return stats.timed(_all_shortest_paths_search(root, goal, children,
+                                                      stats))
+
+    return _all_shortest_paths_search(root, goal, children)
+
+
+def _all_shortest_paths_search(root, goal, children, stats=None):
+    parents, goals = _shortest_path_dag(root, goal, children, stats)
+
+    # the stack holds an iterator over the parents still to be followed of
+    # every node on the path, and one over the goals; the path goes backward
+    path, stack = [], [iter(goals)]
+    while stack:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            if path:
+                path.pop()
+            continue
+
+        path.append(node)
+        if node is root:
+            yield path[::-1]
+            path.pop()
+        else:
+            stack.append(iter(parents[node]))
+
+
+def _shortest_path_dag(root, goal, children, stats=None):
+    """
+    Walks the graph a layer at a time, up to the first layer with a goal.
+
+    Returns the parents of every node reached (the nodes in the previous
+    layer it is a child of), and the goals in the last layer.
+    """
+    parents, depths = {root: []}, {root: 0}
+    layer, depth = [root], 0
+
+    while layer:
+        goals = [node for node in layer if goal(node)]
+        if goals:
+            return parents, goals
+
+        next_layer, depth = [], depth + 1
+        for node in layer:
+            if stats is not None:
+                stats.expanded += 1
+
+            for child in children(node):
+                child_depth = depths.get(child)
+                if child_depth is None:
+                    depths[child], parents[child] = depth, [node]
+                    next_layer.append(child)
+                    if stats is not None:
+                        stats.generated += 1
+                elif child_depth == depth:
+                    parents[child].append(node)
+
+        layer = next_layer
+        if stats is not None:
+            stats.queued(len(layer))
+
+    return parents, []
+
+
+def shortest_paths_search(root, target, children=graph.node_children,
+                          stats=None):
+    """
+    Finds the paths from the root node to the target node that don't visit
+    any node twice, shortest first.
+
+    One breadth-first pass from the target finds how far every node is from
+    it. Paths are then extended best first, by their length plus the
+    distance from their last node to the target. That distance is exact for
+    paths that may visit nodes again, and a lower bound for paths that
+    don't, so paths come out in order of length, and none of them is built
+    twice. Partial paths are linked lists of (node, rest of the path) pairs,
+    so they share their common beginnings.
+
+    Like ``bidirectional_search``, this takes a target node and assumes the
+    graph is undirected. Paths are found as they are asked for, so to get
+    the ``k`` shortest, take ``k`` paths (with ``itertools.islice``). If
+    stats are given, what the search does is counted in them.
+    """
+    if stats is not None:
+        children = stats.counted(children)
+        return stats.timed(_shortest_paths_search(root, target, children,
+                                                  stats))
+
+    return _shortest_paths_search(root, target, children)
+
+
+def _shortest_paths_search(root, target, children, stats=None):
+    distances = {}
+    for node, _, depth in search.breadth_first_layers(target, children):
+        distances[node] = depth
+    if root not in distances:
+        return
+
+    # entries are (estimate, -steps, counter, path): among paths with the
+    # same estimate, longer ones are closer to the target, so they go first;
+    # the counter breaks ties without comparing nodes
+    counter = itertools.count()
+    queue = [(distances[root], 0, next(counter), (root, None))]
+
+    while queue:
+        _, steps, _, link = heapq.heappop(queue)
+        node = link[0]
+        if node == target:
+            yield _linked_path(link)
+            continue # going on would pass the target again
+
+        steps = 1 - steps
+        if stats is not None:
+            stats.expanded += 1
+
+        for child in children(node):
+            distance = distances.get(child)
+            if distance is None or _linked_contains(link, child):
+                continue
+
+            heapq.heappush(queue, (steps + distance, -steps, next(counter),
+                                   (child, link)))
+            if stats is not None:
+                stats.generated += 1
+
+        if stats is not None:
+            stats.queued(len(queue))
+
+
+def _linked_contains(link, node):
+    while link is not None:
+        if link[0] == node:
+            return True
+        link = link[1]
+    return False
+
+
+def _linked_path(link):
+    path = []
+    while link is not None:
+        path.append(link[0])
+        link = link[1]
+    path.reverse()
+    return path
@@ -1,53 +1,254 @@
 """
 A SQLite-based word adjacency cache.
 """
-import string
+import contextlib
+import hashlib
+import logging
+import os
+import sqlite3
+import time
 
+from ladders import index
 
-UPPERCASE = frozenset(string.ascii_uppercase)
+
+log = logging.getLogger('ladders.cache')
+
+
+SCHEMA_VERSION = 2
+
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS words (
+        id INTEGER PRIMARY KEY,
+        word TEXT NOT NULL UNIQUE,
+        length INTEGER NOT NULL)""",
+    "CREATE INDEX IF NOT EXISTS words_by_length ON words (length)",
+    """CREATE TABLE IF NOT EXISTS patterns (
+        pattern TEXT NOT NULL,
+        word_id INTEGER NOT NULL)""",
+    "CREATE INDEX IF NOT EXISTS patterns_by_pattern ON patterns (pattern)",
+    """CREATE TABLE IF NOT EXISTS edges (
+        word_id INTEGER NOT NULL,
+        neighbor_id INTEGER NOT NULL,
+        PRIMARY KEY (word_id, neighbor_id)) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS word_lists (
+        digest TEXT PRIMARY KEY,
+        words INTEGER NOT NULL,
+        ingested REAL NOT NULL)"""
+]
 
 
 
 class Cache(object):
+    """
+    Stores words and the adjacency between them in a SQLite database.
+
+    Every word is stored together with its wildcard patterns (see
+    ``ladders.index``), and the edges between adjacent words are computed
+    when the words are added, so finding the adjacent words of a word is a
+    primary key lookup.
+
+    Whole word lists are best added with ``ingest``, which remembers a hash
+    of every list it has added, so that adding the same list again is
+    skipped.
+
+    A SQLite connection can't be shared with a forked process, so when a
+    cache backed by a file is used in a child process, it opens its own
+    connection to the same file.
+    """
     def __init__(self, db):
-        self.db = db
-        db.execute("CREATE TABLE IF NOT EXISTS words (word TEXT PRIMARY KEY)")
-        db.execute("PRAGMA case_sensitive_like=1;")
+        self._db, self._pid = db, os.getpid()
+        (_, _, self._path) = db.execute("PRAGMA database_list").fetchone()
+
+        (version,) = db.execute("PRAGMA user_version").fetchone()
+        if version < SCHEMA_VERSION:
+            if version < 1:
+                self._migrate()
+            for statement in SCHEMA:
+                db.execute(statement)
+            db.execute("PRAGMA user_version={}".format(SCHEMA_VERSION))
+            db.commit()
+
+
+    @property
+    def db(self):
+        """
+        The connection to the database, opened in this process.
+        """
+        if self._pid != os.getpid() and self._path:
+            self._db, self._pid = sqlite3.connect(self._path), os.getpid()
+        return self._db
+
+
+    def _migrate(self):
+        """
+        Upgrades caches that only have a table of words.
+
+        Those caches were created before edges were stored. The words are
+        kept and added again, which computes their edges.
+        """
+        columns = self.db.execute("PRAGMA table_info(words)").fetchall()
+        if not columns:
+            return
+
+        words = [word for (word,) in self.db.execute("SELECT word FROM words")]
+        self.db.execute("DROP TABLE words")
+        for statement in SCHEMA:
+            self.db.execute(statement)
+        self.add_words(word.encode("ascii") for word in words)
+
+
+    def ingest(self, words):
+        """
+        Adds a word list to the cache, unless it has been added before.
+
+        A list counts as added before if the same words (in any order) have
+        been ingested, and none have been removed since. Everything is done
+        in a single transaction, with the journal in write-ahead mode and
+        without waiting for the disk until it is committed.
+
+        Returns True if the words were added, and False if they were skipped.
+        """
+        words = sorted(set(words))
+        digest = hashlib.sha1("\n".join(words)).hexdigest()
+
+        row = self.db.execute("SELECT words FROM word_lists WHERE digest = ?",
+                              (digest,)).fetchone()
+        if row is not None:
+            log.info("skipping %d words that are already in the cache", row[0])
+            return False
+
+        with self._building():
+            self._add_words(words)
+            self.db.execute("INSERT INTO word_lists VALUES (?, ?, ?)",
+                            (digest, len(words), time.time()))
+            self.db.commit()
+
+        log.info("added %d words to the cache", len(words))
+        return True
+
+
+    @contextlib.contextmanager
+    def _building(self):
+        """
+        Tunes the database for writing lots of data, and restores the
+        journal mode and durability settings afterwards, so that older
+        SQLite versions and other tools can still read the file. The
+        transaction is rolled back if anything goes wrong.
+        """
+        db = self.db
+        (journal_mode,) = db.execute("PRAGMA journal_mode").fetchone()
+        db.execute("PRAGMA journal_mode=WAL")
+        (synchronous,) = db.execute("PRAGMA synchronous").fetchone()
+        db.execute("PRAGMA synchronous=OFF")
+
+        try:
+            yield db
+        except:
+            db.rollback()
+            raise
+        finally:
+            db.execute("PRAGMA synchronous={}".format(synchronous))
+            db.execute("PRAGMA journal_mode={}".format(journal_mode))
 
 
     def add_words(self, words):
-        tuples = ((word,) for word in words)
-        self.db.executemany("INSERT OR IGNORE INTO words VALUES (?)", tuples)
+        """
+        Adds some words to the cache, together with their edges.
+
+        Words that are already in the cache are ignored. All of the work is
+        done in bulk: the edges between the new words and every word in the
+        cache are found with a single self-join on the wildcard patterns.
+        """
+        self._add_words(words)
         self.db.commit()
 
 
-    def find_adjacent_words(self, word):
-        query = """SELECT word FROM words
-            WHERE word != ? AND (({exact}) OR ({pattern}))"""
-
-        exact_match_clause = "word IN ({})".format(",".join("?" * 25))
-        like_clause = " OR ".join(["(word LIKE ?)"] * (len(word) - 1))
-
-        exact_matches = _find_exact_matches(word)
-        like_patterns = _find_like_patterns(word)
-
-        query = query.format(exact=exact_match_clause, pattern=like_clause)
-        params = [word] + exact_matches + like_patterns
-        cursor = self.db.execute(query, params)
-        return (word.encode("ascii") for (word,) in cursor)
+    def _add_words(self, words):
+        (last_id,) = self.db.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM words").fetchone()
+
+        rows = ((word, len(word)) for word in words)
+        self.db.executemany(
+            "INSERT OR IGNORE INTO words (word, length) VALUES (?, ?)", rows)
+
+        new_words = self.db.execute(
+            "SELECT id, word FROM words WHERE id > ?", (last_id,)).fetchall()
+        patterns = ((pattern, word_id) for word_id, word in new_words
+                    for pattern in index.wildcard_patterns(word))
+        self.db.executemany("INSERT INTO patterns VALUES (?, ?)", patterns)
+
+        for edge in ["new.word_id, old.word_id", "old.word_id, new.word_id"]:
+            self.db.execute("""INSERT OR IGNORE INTO edges
+                SELECT {}
+                FROM patterns AS new JOIN patterns AS old USING (pattern)
+                WHERE new.word_id > ? AND old.word_id != new.word_id
+                """.format(edge), (last_id,))
+
+
+    def remove_words(self, words):
+        """
+        Removes some words from the cache, together with their edges.
+
+        Words that are not in the cache are ignored. Only the patterns and
+        edges of the removed words are touched. Since the cache no longer
+        holds every word of the lists ingested before, they are forgotten,
+        and ingesting them again adds the removed words back.
+        """
+        db = self.db
+        db.execute("CREATE TEMP TABLE IF NOT EXISTS removed "
+                   "(id INTEGER PRIMARY KEY, word TEXT NOT NULL)")
+        db.execute("DELETE FROM removed")
+        db.executemany("INSERT OR IGNORE INTO removed "
+                       "SELECT id, word FROM words WHERE word = ?",
+                       ((word,) for word in words))
+
+        removed = db.execute("SELECT id, word FROM removed").fetchall()
+        if not removed:
+            db.commit()
+            return
+
+        # every edge is stored both ways; the reverse edges are found
+        # through the forward ones, which are indexed by word
+        db.execute("""DELETE FROM edges
+            WHERE word_id IN (SELECT neighbor_id FROM edges
+                              WHERE word_id IN (SELECT id FROM removed))
+            AND neighbor_id IN (SELECT id FROM removed)""")
+        db.execute("""DELETE FROM edges
+            WHERE word_id IN (SELECT id FROM removed)""")
+        db.executemany("DELETE FROM patterns WHERE pattern = ? AND word_id = ?",
+                       ((pattern, word_id) for word_id, word in removed
+                        for pattern in index.wildcard_patterns(word)))
+        db.execute("DELETE FROM words WHERE id IN (SELECT id FROM removed)")
+        db.execute("DELETE FROM word_lists")
+        db.execute("DELETE FROM removed")
+        db.commit()
 
 
+    def find_adjacent_words(self, word):
+        row = self.db.execute(
+            "SELECT id FROM words WHERE word = ?", (word,)).fetchone()
 
-def _find_exact_matches(word):
-    pattern = "{{}}{}".format(word[1:])
-    return [pattern.format(c) for c in UPPERCASE - set(word[0])]
+        if row is not None:
+            cursor = self.db.execute("""SELECT word
+                FROM edges JOIN words ON words.id = edges.neighbor_id
+                WHERE edges.word_id = ?""", row)
+        else:
+            cursor = self._find_unknown_adjacent_words(word)
 
+        return (word.encode("ascii") for (word,) in cursor)
 
-def _find_like_patterns(word):
-    return [_replace(word, idx) for idx in xrange(1, len(word))]
 
+    def _find_unknown_adjacent_words(self, word):
+        """
+        Finds the words adjacent to a word that is not in the cache.
 
-def _replace(string, index, character="_"):
-    b = bytearray(string)
-    b[index] = character
-    return str(b)
+        That word has no edges, but its wildcard patterns can still be looked
+        up in the index of patterns.
+        """
+        patterns = index.wildcard_patterns(word)
+        query = """SELECT DISTINCT word
+            FROM patterns JOIN words ON words.id = patterns.word_id
+            WHERE pattern IN ({}) AND word != ?"""
+        query = query.format(",".join("?" * len(patterns)))
+        return self.db.execute(query, patterns + [word])
@@ -0,0 +1,219 @@
+"""
+Compiled word lists: a word graph in a binary file that is memory-mapped.
+
+A compiled word list holds the normalized words, their neighbors and their
+connected components, so nothing has to be read, normalized or indexed when
+it is used, and processes that map the same file share its pages. The file
+has this layout, all numbers little-endian:
+
+    - a header (see ``HEADER``)
+    - the words, sorted, as fixed-width records of ``width`` bytes, padded
+      with NUL bytes; the ID of a word is its position
+    - the neighbor offsets: ``count + 1`` unsigned 32-bit integers
+    - the neighbor IDs: ``edges`` unsigned 32-bit integers
+    - the components: ``count`` unsigned 32-bit integers
+
+The offsets, neighbor IDs and components are the arrays of a ``WordGraph``.
+"""
+import array
+import bisect
+import mmap
+import struct
+import sys
+
+from ladders import wordgraph
+
+
+MAGIC, VERSION = "LADRDICT", 1
+HEADER = struct.Struct("<8sHHII") # magic, version, width, count, edges
+UINT32 = struct.Struct("<I")
+
+
+
+class DictionaryError(Exception):
+    """
+    Raised when a compiled word list can't be used.
+    """
+
+
+
+class CompiledGraph(wordgraph.WordGraph):
+    """
+    A word graph read from a compiled word list.
+
+    Works like any other word graph, but opening one takes the same time
+    regardless of the size of the word list: words are found by binary
+    search over the records in the file, and nothing is read until it is
+    needed.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError: # empty files can't be mapped
+                raise DictionaryError("not a compiled word list: empty")
+
+        try:
+            header = _read_header(self._map)
+            _, _, width, count, edges = header
+            words, offsets, neighbor_ids, components = _offsets(header)
+            if len(self._map) < components + 4 * count:
+                raise DictionaryError(
+                    "compiled word list {} is truncated".format(path))
+        except DictionaryError:
+            self._map.close()
+            raise
+
+        super(CompiledGraph, self).__init__(
+            _Records(self._map, words, width, count),
+            _UInt32s(self._map, offsets, count + 1),
+            _UInt32s(self._map, neighbor_ids, edges),
+            _UInt32s(self._map, components, count))
+
+
+    def _index(self, words):
+        return _RecordIds(words)
+
+
+
+class _Records(object):
+    """
+    A read-only sequence of NUL-padded, fixed-width strings in a buffer.
+    """
+    def __init__(self, buffer, offset, width, count):
+        self._buffer = buffer
+        self._offset, self._width, self._count = offset, width, count
+
+
+    def __len__(self):
+        return self._count
+
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+
+        start = self._offset + i * self._width
+        return self._buffer[start:start + self._width].rstrip("\0")
+
+
+
+class _RecordIds(object):
+    """
+    Maps words to their IDs, by binary search over sorted records.
+    """
+    def __init__(self, records):
+        self._records = records
+
+
+    def __contains__(self, word):
+        return self._find(word) is not None
+
+
+    def __getitem__(self, word):
+        i = self._find(word)
+        if i is None:
+            raise KeyError(word)
+        return i
+
+
+    def _find(self, word):
+        i = bisect.bisect_left(self._records, word)
+        if i < len(self._records) and self._records[i] == word:
+            return i
+        return None
+
+
+
+class _UInt32s(object):
+    """
+    A read-only array of unsigned 32-bit integers in a buffer.
+    """
+    def __init__(self, buffer, offset, count):
+        self._buffer, self._offset, self._count = buffer, offset, count
+
+
+    def __len__(self):
+        return self._count
+
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(self._count)
+            if step != 1:
+                raise ValueError("only contiguous slices are supported")
+            count = max(stop - start, 0)
+            return struct.unpack_from("<{}I".format(count), self._buffer,
+                                      self._offset + 4 * start)
+
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        (value,) = UINT32.unpack_from(self._buffer, self._offset + 4 * i)
+        return value
+
+
+
+def write(path, words):
+    """
+    Writes a compiled word list with the given words to a file.
+    """
+    graph = wordgraph.WordGraph.from_words(sorted(set(words)))
+    width = max([len(word) for word in graph.words] or [0])
+    header = HEADER.pack(MAGIC, VERSION, width, len(graph),
+                         len(graph.neighbor_ids))
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write("".join(word.ljust(width, "\0") for word in graph.words))
+        for integers in [graph.offsets, graph.neighbor_ids, graph.components]:
+            f.write(_little_endian(integers))
+
+
+def is_compiled(path):
+    """
+    Checks if a file is a compiled word list, by its magic bytes.
+    """
+    if path == "-":
+        return False
+
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except IOError:
+        return False
+
+
+def _little_endian(integers):
+    integers = array.array("I", integers)
+    if sys.byteorder == "big":
+        integers.byteswap()
+    return integers.tostring()
+
+
+def _read_header(buffer):
+    if len(buffer) < HEADER.size:
+        raise DictionaryError("not a compiled word list: too short")
+
+    header = HEADER.unpack_from(buffer)
+    if header[0] != MAGIC:
+        raise DictionaryError("not a compiled word list")
+    elif header[1] != VERSION:
+        raise DictionaryError("unsupported compiled word list version {}"
+                              .format(header[1]))
+
+    return header
+
+
+def _offsets(header):
+    """
+    Returns the offsets of the words, neighbor offsets, neighbor IDs and
+    components in a compiled word list.
+    """
+    _, _, width, count, edges = header
+    words = HEADER.size
+    offsets = words + width * count
+    neighbor_ids = offsets + 4 * (count + 1)
+    components = neighbor_ids + 4 * edges
+    return words, offsets, neighbor_ids, components
@@ -4,6 +4,8 @@ Tools for describing graphs and operating on paths.
 """
 import itertools
 
+from ladders import neighborcache, packed
+
 
 class Node(object):
     """
@@ -11,6 +13,8 @@ class Node(object):
 
     This is also sometimes called a vertex in literature.
     """
+    __slots__ = ("name", "children")
+
     def __init__(self, name, children=None):
         """
         Initializes a node.
@@ -48,6 +52,22 @@ class Node(object):
         return hash(self.name)
 
 
+    def __getstate__(self):
+        """
+        Returns the state of this node, for pickling.
+
+        Classes with ``__slots__`` can't be pickled without this.
+        """
+        return self.name, self.children
+
+
+    def __setstate__(self, state):
+        """
+        Restores the state of an unpickled node.
+        """
+        self.name, self.children = state
+
+
     def __repr__(self):
         """
         Returns a textual representation of this node.
@@ -59,60 +79,225 @@ class Node(object):
 class LadderNode(Node):
     """
     A node in a word ladder search graph.
+
+    Ladder nodes are flyweights: all a node holds is its word, the ladder
+    graph it belongs to, which holds the word list and the neighbors, and
+    its children once they have been looked up. Get them from
+    ``LadderGraph.node`` rather than creating them directly, so that there
+    is only one node per word, and its children are only looked up once.
     """
-    def __init__(self, name, words, cache=None):
-        super(LadderNode, self).__init__(name)
-        self._words = words
-        self._cache = cache
+    __slots__ = ("_graph", "_children")
+
+    def __init__(self, name, ladder_graph):
+        self.name = name
+        self._graph = ladder_graph
+
+
+    def __getstate__(self):
+        return self.name, self._graph
+
+
+    def __setstate__(self, state):
+        self.name, self._graph = state
 
 
     @property
     def children(self):
-        children = self._get_children()
         try:
-            first_child = children.next()
-            return itertools.chain([first_child], children)
-        except StopIteration:
-            return []
+            return self._children
+        except AttributeError:
+            children = self._children = self._graph.children(self.name)
+            return children
+
+
 
+class LadderGraph(object):
+    """
+    The graph of a word list, shared by all the nodes of a ladder search.
+
+    Neighbors come from the cache if there is one (anything with a
+    ``find_adjacent_words`` method will do). Otherwise, they are found by
+    comparing against every word in the word list, which is slow, so those
+    lookups go through a ``NeighborCache`` that remembers the neighbors of up
+    to ``maxsize`` recently used words. Slow caches can be wrapped in one
+    too, before they are passed in, so that it is shared by many searches.
+    Code that runs many searches on the same word list should build its
+    neighbor source once and pass it in, like the command line tool does
+    with its word graph, rather than have every search make its own.
+
+    Nodes are interned, so a word that is reached again is the same node,
+    with the same memoized children. That memo lives as long as the search
+    does and takes one tuple per expanded node, so only the lookups that
+    are shared between searches need the bounded cache.
+    """
+    def __init__(self, words, cache=None, maxsize=neighborcache.DEFAULT_SIZE):
+        if cache is None:
+            cache = neighborcache.NeighborCache(LinearSource(words or ()),
+                                                maxsize)
 
-    def _get_children(self):
-        if self._cache is not None:
-            return self._cached_child_search()
-        else:
-            return self._linear_child_search()
+        self.neighbors = cache
+        self._nodes = {}
+
+
+    def node(self, word):
+        """
+        Returns the node for a word.
+        """
+        try:
+            return self._nodes[word]
+        except KeyError:
+            node = self._nodes[word] = LadderNode(word, self)
+            return node
 
 
-    def _cached_child_search(self):
-         for word in self._cache.find_adjacent_words(self.name):
-            yield LadderNode(word, None, self._cache)
+    def children(self, word):
+        """
+        Returns the nodes for the words adjacent to a word.
+        """
+        node = self.node
+        return tuple([node(w) for w in self.neighbors.find_adjacent_words(word)])
 
 
-    def _linear_child_search(self):
-        child_words = [word for word in self._words if word != self.name]
-        for word in child_words:
-            if distance(word, self.name) == 1:
-                yield LadderNode(word, child_words)
 
+class LinearSource(object):
+    """
+    A neighbor source that compares a word against every word in a list.
 
-    @children.setter
-    def children(self, words):
+    The first lookup packs every word in the list (see ``ladders.packed``),
+    grouped by length, so that each comparison after that is a few integer
+    operations on codes that are packed once. Words that can't be packed
+    are compared letter by letter. Lists and tuples are used as they are,
+    not copied, but words added to them after the first lookup aren't seen.
+    """
+    def __init__(self, words):
+        if not isinstance(words, (list, tuple)):
+            words = tuple(words)
         self._words = words
+        self._by_length = None # length -> ((code, word) pairs, other words)
+
+
+    def find_adjacent_words(self, word):
+        """
+        Finds the words adjacent to the given word.
+        """
+        if self._by_length is None:
+            self._by_length = self._pack()
+
+        length = len(word)
+        entries, others = self._by_length.get(length, ((), ()))
+        code = packed.try_encode(word, memoize=False)
+        if code is None:
+            others = [w for _, w in entries] + list(others)
+            return [w for w in others if distance(w, word) == 1]
+
+        found = packed.adjacent_words(entries, code, packed.lane_mask(length))
+        found.extend(w for w in others if distance(w, word) == 1)
+        return found
+
+
+    def _pack(self):
+        by_length = {}
+        for word in self._words:
+            entries, others = by_length.setdefault(len(word), ([], []))
+            code = packed.try_encode(word, memoize=False)
+            if code is None:
+                others.append(word)
+            else:
+                entries.append((code, word))
+        return by_length
 
 
 
 def distance(word_one, word_two):
+    """
+    Returns the number of positions in which two words have different
+    letters.
+
+    The words are compared letter by letter. Packing them (see
+    ``ladders.packed``) only pays off when a word is compared many times,
+    like the target in ``distance_to`` or the word list in
+    ``LinearSource``, so that is where it is done.
+    """
     return sum([1 for (x, y) in zip(word_one, word_two) if x != y])
 
 
-def extended_paths(path):
+def adjacent(word_one, word_two):
+    """
+    Checks if two words of the same length differ in exactly one letter.
+    """
+    return len(word_one) == len(word_two) and distance(word_one, word_two) == 1
+
+
+def distance_to(target, source=None):
+    """
+    Returns a function that computes the distance from a ladder node to the
+    target word.
+
+    This is never more than the number of steps it takes to get from that
+    node to the target, so it can be used as a lower bound.
+
+    If the neighbor source can compute distances to the target in bulk (it
+    has a ``distances_to`` method, like word matrices), it is used to do so.
+    """
+    distance_to_word = word_distance_to(target, source)
+
+    def distance_to_target(node):
+        return distance_to_word(node.name)
+
+    return distance_to_target
+
+
+def word_distance_to(target, source=None):
+    """
+    Like ``distance_to``, but the function it returns takes words instead of
+    ladder nodes.
+    """
+    distances_to = getattr(source, "distances_to", None)
+    if distances_to is not None:
+        return distances_to(target)
+    return _packed_distance_to(target)
+
+
+def node_children(node):
+    """
+    Returns the children of a node.
+
+    This is the default way of finding children for functions that operate on
+    paths. Those functions can also be given a different function, so they can
+    operate on things other than nodes (such as integer word IDs).
+    """
+    return node.children
+
+
+def _packed_distance_to(target):
+    """
+    Returns a function that computes the distance from a word to the target,
+    with the target packed once up front.
+    """
+    target_code, length = packed.try_encode(target), len(target)
+    if target_code is None:
+        return lambda word: distance(word, target)
+
+    mask = packed.lane_mask(length)
+
+    def distance_to_target(word):
+        code = packed.try_encode(word)
+        if code is None or len(word) != length:
+            return distance(word, target)
+        return packed.distance(code, target_code, mask)
+
+    return distance_to_target
+
+
+def extended_paths(path, children=node_children):
     """
     Extends a path with all possible children of the last node in the path.
 
+    @param children: A function returning the children of a node.
     @return: An iterable of the extended paths (one for each child node).
     @rtype: An iterable of paths.
     """
-    for child in path[-1].children:
+    for child in children(path[-1]):
         yield path + [child]
 
 
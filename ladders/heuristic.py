@@ -2,32 +2,367 @@
 Heuristic-based graph search.
 """
 import functools
+import heapq
+import itertools
+import operator
 
 from ladders import graph, search
 
 
-def find_ladders(start, target, words, cache=None):
+DEFAULT_BEAM_WIDTH = 20
+DEFAULT_TABLE_SIZE = 1 << 16 # nodes, for IDA*
+
+
+def find_ladders(start, target, words, cache=None, optimal=False,
+                 stats=None):
     """
     Find ladders heuristically.
-    """
-    root = graph.LadderNode(start, words, cache)
 
-    def heuristic(path):
-        return graph.distance(path[-1].name, target)
+    If optimal is set, every ladder found is shorter than the previous one,
+    and the last one is a shortest ladder. Stats, if given, are passed on to
+    the search.
+    """
+    root = graph.LadderGraph(words, cache).node(start)
+    distance_to_target = graph.distance_to(target, cache)
+    heuristic = _memoized_heuristic(distance_to_target)
 
     def goal(node):
         return node.name == target
 
-    return heuristic_search(root, goal, heuristic)
+    if optimal:
+        return heuristic_search(root, goal, heuristic,
+                                lower_bound=distance_to_target, stats=stats)
+
+    return heuristic_search(root, goal, heuristic, stats=stats)
 
 
-def _heuristic_expander(path, queue, heuristic):
-    queue.extend(search._acyclic_extended_paths(path))
+def _memoized_heuristic(distance_to_target):
+    """
+    Turns a function of a node into a heuristic for paths, which is computed
+    once per node.
+
+    The expanders sort the same entries many times, so this saves
+    computing the heuristic again every time.
+    """
+    estimates = {}
+
+    def heuristic(path):
+        node = path[-1]
+        try:
+            return estimates[node]
+        except KeyError:
+            h = estimates[node] = distance_to_target(node)
+            return h
+
+    return heuristic
+
+
+def _heuristic_expander(extensions, queue, heuristic):
+    queue.extend(extensions)
     prioritized = sorted(queue, key=heuristic)
     queue.clear()
     queue.extend(prioritized)
 
 
-def heuristic_search(root, goal, heuristic):
+def heuristic_search(root, goal, heuristic, children=graph.node_children,
+                     lower_bound=None, stats=None):
     expander = functools.partial(_heuristic_expander, heuristic=heuristic)
-    return search._generic_search(root, goal, expander)
+    return search._generic_search(root, goal, expander, children, lower_bound,
+                                  stats)
+
+
+def beam(start, target, words, cache=None, optimal=False, stats=None,
+         width=DEFAULT_BEAM_WIDTH, fallback=False):
+    """
+    Find ladders with beam search.
+
+    Only the ``width`` partial ladders closest to the target are kept at
+    each length, so a query takes bounded time and memory, but may miss
+    ladders (and shortest ladders) that do exist. If fallback is set and the
+    beam finds no ladder, the complete heuristic search (see
+    ``find_ladders``) is run instead. Stats, if given, are passed on to the
+    search.
+    """
+    root = graph.LadderGraph(words, cache).node(start)
+    distance_to_target = graph.distance_to(target, cache)
+    heuristic = _memoized_heuristic(distance_to_target)
+
+    def goal(node):
+        return node.name == target
+
+    lower_bound = distance_to_target if optimal else None
+    found = False
+    for ladder in beam_search(root, goal, heuristic, width,
+                              lower_bound=lower_bound, stats=stats):
+        found = True
+        yield ladder
+
+    if fallback and not found:
+        for ladder in find_ladders(start, target, words, cache, optimal,
+                                   stats):
+            yield ladder
+
+
+def _beam_expander(extensions, queue, heuristic, width):
+    """
+    A queue expander that results in a beam search.
+
+    The queue is in order of depth, so the entries one deeper than the node
+    being expanded are at its end, sorted by heuristic. Those and the new
+    extensions are sorted again, and only the best ``width`` of them are put
+    back. A node reached from several nodes of the same depth only takes up
+    one place in the beam.
+    """
+    depth = extensions[0][1]
+    full = len(queue) >= width and queue[-width][1] == depth
+    if full:
+        # most extensions are no better than anything in a full beam
+        worst = heuristic(queue[-1])
+        extensions = [entry for entry in extensions
+                      if heuristic(entry) < worst]
+        if not extensions:
+            return
+
+    level = list(extensions)
+    while queue and queue[-1][1] == depth:
+        level.append(queue.pop())
+
+    level.sort(key=heuristic)
+    kept = set()
+    for entry in level:
+        if entry[-1] not in kept:
+            kept.add(entry[-1])
+            queue.append(entry)
+            if len(kept) == width:
+                break
+
+
+def beam_search(root, goal, heuristic, width=DEFAULT_BEAM_WIDTH,
+                children=graph.node_children, lower_bound=None, stats=None):
+    """
+    Tries to find paths from the root node to a node satisfying the goal
+    condition using beam search.
+
+    The search goes breadth-first, but of all the children of one depth
+    only the ``width`` best according to the heuristic (called with a path,
+    like for ``heuristic_search``) are kept; the others are dropped. The
+    queue and the nodes expanded so far therefore never hold more than
+    ``width`` nodes per depth, however big the graph is, but the search is
+    not complete: it can miss every path to a goal.
+
+    If a lower bound is given, every path found is shorter than the previous
+    one, as in ``heuristic_search``, but the last one is only the shortest
+    the beam came across. If stats are given, what the search does is
+    counted in them.
+    """
+    if width < 1:
+        raise ValueError("the beam width has to be at least 1")
+
+    expander = functools.partial(_beam_expander, heuristic=heuristic,
+                                 width=width)
+    return search._generic_search(root, goal, expander, children, lower_bound,
+                                  stats)
+
+
+def a_star(start, target, words, cache=None, optimal=True, stats=None):
+    """
+    Find a shortest ladder with A* search.
+
+    The number of letters by which a word differs from the target is never
+    more than the number of steps left to get there, so the ladder found is
+    always a shortest one. Stats, if given, are passed on to the search.
+    """
+    root = graph.LadderGraph(words, cache).node(start)
+
+    def goal(node):
+        return node.name == target
+
+    return a_star_search(root, goal, graph.distance_to(target, cache),
+                         stats=stats)
+
+
+def a_star_search(root, goal, heuristic, children=graph.node_children,
+                  stats=None):
+    """
+    Tries to find a cheapest path from the root node to a node satisfying the
+    goal condition using A* search, where every step costs one.
+
+    Unlike the heuristic for ``heuristic_search``, the heuristic here is
+    called with a single node, and is only called once per node. It has to
+    be admissible (it may never overestimate the number of steps to a goal)
+    for the path found to be a shortest one. Every node is expanded at most
+    once, so it also has to be consistent, which Hamming distance is.
+
+    If stats are given, what the search does is counted in them. Yields at
+    most one path.
+    """
+    if stats is not None:
+        children = stats.counted(children)
+        return stats.timed(_a_star_search(root, goal, heuristic, children,
+                                          stats))
+
+    return _a_star_search(root, goal, heuristic, children)
+
+
+def _a_star_search(root, goal, heuristic, children, stats=None):
+    estimates = {}
+
+    def estimate(node):
+        try:
+            return estimates[node]
+        except KeyError:
+            h = estimates[node] = heuristic(node)
+            return h
+
+    costs, parents, closed = {root: 0}, {root: None}, set()
+    counter = itertools.count() # breaks ties without comparing nodes
+    queue = [(estimate(root), estimate(root), next(counter), root)]
+
+    while queue:
+        _, _, _, node = heapq.heappop(queue)
+        if node in closed:
+            continue # a stale entry; node was already reached more cheaply
+
+        if goal(node):
+            path = search._follow_parents(node, parents)
+            path.reverse()
+            yield path
+            return
+
+        closed.add(node)
+        cost = costs[node] + 1
+        if stats is not None:
+            stats.expanded += 1
+
+        for child in children(node):
+            if child in closed or cost >= costs.get(child, cost + 1):
+                continue
+
+            costs[child], parents[child] = cost, node
+            h = estimate(child)
+            heapq.heappush(queue, (cost + h, h, next(counter), child))
+            if stats is not None:
+                stats.generated += 1
+
+        if stats is not None:
+            stats.queued(len(queue))
+
+
+def ida_star(start, target, words, cache=None, optimal=True, stats=None):
+    """
+    Find a shortest ladder with iterative deepening A* search.
+
+    Like ``a_star``, but only keeps the ladder it is working on and a
+    bounded table of words it has expanded (see ``ida_star_search``) in
+    memory, instead of every word it has seen. The search runs on words,
+    straight from the neighbor source, so no ladder nodes are made for the
+    words it tries; only the ladder it finds is turned into nodes. Stats,
+    if given, are passed on to the search.
+    """
+    ladder_graph = graph.LadderGraph(words, cache)
+
+    def goal(word):
+        return word == target
+
+    def children(word):
+        return ladder_graph.neighbors.find_adjacent_words(word)
+
+    paths = ida_star_search(start, goal, graph.word_distance_to(target, cache),
+                            children, stats=stats)
+    for path in paths:
+        yield map(ladder_graph.node, path)
+
+
+def ida_star_search(root, goal, heuristic, children=graph.node_children,
+                    stats=None, table_size=DEFAULT_TABLE_SIZE):
+    """
+    Tries to find a cheapest path from the root node to a node satisfying the
+    goal condition using iterative deepening A* (IDA*), where every step
+    costs one.
+
+    Each iteration is a depth-first search that does not extend a path past
+    a bound on its length plus the heuristic of its last node; the first
+    bound is the heuristic of the root, and each next one is the smallest
+    cost that went over the previous one. The heuristic has to be admissible
+    for the path found to be a shortest one. The search keeps the current
+    path and the unvisited children along it on an explicit stack, so that
+    part of its memory use is linear in the length of the path, at the cost
+    of expanding nodes again in every iteration.
+
+    Within an iteration, a node can be reached along many paths of the
+    same length, and expanding it again every time makes the search
+    exponential in the length of the path. So a transposition table
+    remembers, for up to ``table_size`` nodes per iteration, the shortest
+    path they were expanded at, and nodes reached again along paths that
+    are no shorter are skipped: everything within the bound beyond them has
+    been tried already. Once the table is full, nodes that aren't in it
+    are only checked against the current path for cycles. A table size of
+    zero turns it off, but then the search is only practical for short
+    paths.
+
+    If stats are given, what the search does is counted in them, and the
+    longest the path has been is recorded as the largest queue. Yields at
+    most one path.
+    """
+    if stats is not None:
+        children = stats.counted(children)
+        return stats.timed(_ida_star_search(root, goal, heuristic, children,
+                                            table_size, stats))
+
+    return _ida_star_search(root, goal, heuristic, children, table_size)
+
+
+def _ida_star_search(root, goal, heuristic, children, table_size, stats=None):
+    estimate = operator.itemgetter(0)
+    bound = heuristic(root)
+
+    while True:
+        # the path holds the nodes being expanded; for each of them, and for
+        # the root, the stack holds an iterator over the (estimate, node)
+        # pairs still to be tried, so it is always one longer than the path
+        path, on_path = [], set()
+        stack = [iter([(bound, root)])]
+        table = {} # node -> the shortest path length it was expanded at
+        exceeded = None # the smallest cost over the bound
+
+        while stack:
+            entry = next(stack[-1], None)
+            if entry is None:
+                stack.pop()
+                if path:
+                    on_path.remove(path.pop())
+                continue
+
+            h, node = entry
+            depth = len(path)
+            cost = depth + h
+            if cost > bound:
+                if exceeded is None or cost < exceeded:
+                    exceeded = cost
+                continue
+
+            if goal(node):
+                path.append(node)
+                yield path
+                return
+
+            expanded_at = table.get(node)
+            if expanded_at is not None and expanded_at <= depth:
+                continue
+            if expanded_at is not None or len(table) < table_size:
+                table[node] = depth
+
+            path.append(node)
+            on_path.add(node)
+            extensions = [(heuristic(child), child) for child in children(node)
+                          if child not in on_path]
+            extensions.sort(key=estimate)
+            stack.append(iter(extensions))
+            if stats is not None:
+                stats.expanded += 1
+                stats.generated += len(extensions)
+                stats.queued(len(path))
+
+        if exceeded is None:
+            return # nothing was cut off, so there is no path
+        bound = exceeded
@@ -0,0 +1,70 @@
+"""
+An in-memory word adjacency index.
+"""
+import collections
+
+
+WILDCARD = "_"
+
+
+
+class WildcardIndex(object):
+    """
+    Indexes words by their wildcard patterns.
+
+    The wildcard patterns of PIG are _IG, P_G and PI_. Two different words
+    are adjacent exactly when they share a wildcard pattern, so finding the
+    adjacent words of a word takes one dictionary lookup per letter instead
+    of a scan of the entire word list.
+
+    Anything with a ``find_adjacent_words`` method can be used as a source of
+    neighbors for ladder nodes, so this can be used wherever a cache can.
+    """
+    def __init__(self, words=()):
+        self._buckets = collections.defaultdict(list)
+        self._words = set()
+        self.add_words(words)
+
+
+    def add_words(self, words):
+        """
+        Adds some words to the index.
+
+        Words that are already in the index are ignored.
+        """
+        for word in words:
+            if word in self._words:
+                continue
+
+            self._words.add(word)
+            for pattern in wildcard_patterns(word):
+                self._buckets[pattern].append(word)
+
+
+    def __contains__(self, word):
+        return word in self._words
+
+
+    def __len__(self):
+        return len(self._words)
+
+
+    def find_adjacent_words(self, word):
+        """
+        Finds the words in the index that differ from the given word by
+        exactly one letter.
+
+        The word itself does not have to be in the index.
+        """
+        for pattern in wildcard_patterns(word):
+            for other in self._buckets.get(pattern, ()):
+                if other != word:
+                    yield other
+
+
+
+def wildcard_patterns(word):
+    """
+    Returns the wildcard patterns of a word, one for each position.
+    """
+    return [word[:i] + WILDCARD + word[i + 1:] for i in xrange(len(word))]
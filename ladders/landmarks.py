@@ -0,0 +1,119 @@
+"""
+Landmarks: a lower bound on ladder lengths that knows about detours.
+
+The number of letters by which a word differs from the target is a lower
+bound on the number of steps from it to the target, but a poor one when the
+ladder has to go around. Landmarks do better: a few words are picked, and
+the lengths of the shortest ladders from each of them to every word are
+computed up front. Ladder lengths obey the triangle inequality, so a word
+``n`` is at least ``|d(L, t) - d(L, n)|`` steps away from the target ``t``
+for every landmark ``L``. (This is known as the ALT heuristic: A*,
+landmarks and the triangle inequality.)
+"""
+import array
+import collections
+
+from ladders import graph, search
+
+
+DEFAULT_COUNT = 16
+UNREACHABLE = 0xFFFF # the distance to words in another component
+
+
+
+class Landmarks(object):
+    """
+    A word graph with distances from landmark words.
+
+    Can be used as a neighbor source like the word graph it wraps; everything
+    but ``distances_to`` is passed through to it. ``graph.distance_to`` uses
+    that method, so the heuristic algorithms, and the lower bounds of the
+    others, get the larger of the number of differing letters and the
+    landmark bound.
+
+    The landmarks are picked in the largest connected component, so that
+    they help the most queries, by farthest point selection: the first one
+    is the word farthest from an arbitrary word, and every next one is the
+    word farthest from the landmarks picked so far. Landmarks on the edges
+    of the graph give the tightest bounds. The distances from each of them
+    take two bytes per word.
+    """
+    def __init__(self, word_graph, count=DEFAULT_COUNT):
+        self.graph = word_graph
+        self.landmarks = [] # word IDs
+        self.distances = [] # for each landmark, the distance to every word
+        if len(word_graph) and count > 0:
+            self._pick(count)
+
+
+    def __getattr__(self, name):
+        if name == "graph": # not set yet, while unpickling
+            raise AttributeError(name)
+        return getattr(self.graph, name)
+
+
+    def _pick(self, count):
+        components = self.graph.components
+        (largest, _), = collections.Counter(components).most_common(1)
+        start = next(word_id for word_id, component in enumerate(components)
+                     if component == largest)
+
+        def farthest(word_id):
+            d = nearest[word_id]
+            return d if d != UNREACHABLE else -1
+
+        nearest = self._distances_from(start)
+        while len(self.landmarks) < count:
+            landmark = max(xrange(len(nearest)), key=farthest)
+            if self.landmarks and nearest[landmark] == 0:
+                break # every word in the component is a landmark
+
+            distances = self._distances_from(landmark)
+            if self.landmarks:
+                nearest = array.array("H", map(min, nearest, distances))
+            else:
+                nearest = distances
+            self.landmarks.append(landmark)
+            self.distances.append(distances)
+
+
+    def _distances_from(self, word_id):
+        distances = array.array("H", [UNREACHABLE]) * len(self.graph)
+        layers = search.breadth_first_layers(word_id, self.graph.neighbors)
+        for node, _, depth in layers:
+            distances[node] = depth
+        return distances
+
+
+    def distances_to(self, target):
+        """
+        Returns a function that computes a lower bound on the number of steps
+        from a word to the target.
+
+        Words that aren't in the graph, and targets that aren't, only get the
+        number of letters they differ in.
+        """
+        try:
+            target_id = self.graph.id(target)
+        except KeyError:
+            return lambda word: graph.distance(word, target)
+
+        bounds = [(distances, distances[target_id])
+                  for distances in self.distances
+                  if distances[target_id] != UNREACHABLE]
+        word_id = self.graph.id
+
+        def distance_to_target(word):
+            h = graph.distance(word, target)
+            try:
+                i = word_id(word)
+            except KeyError:
+                return h
+
+            for distances, to_target in bounds:
+                d = distances[i]
+                if d != UNREACHABLE and abs(to_target - d) > h:
+                    h = abs(to_target - d)
+            return h
+
+        return distance_to_target
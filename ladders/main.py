@@ -1,25 +1,105 @@
 import argparse
+import functools
+import itertools
 import logging
 import sqlite3
+import sys
 
-from ladders import cache, naive, heuristic
+from ladders import (cache, compiled, naive, heuristic, landmarks,
+	neighborcache, parallel, search, table, vectorized, wordgraph, wordlist)
+
+
+log = logging.getLogger('ladders.main')
 
 
 algorithms = {
 	"depth-first": naive.depth_first,
 	"breadth-first": naive.breadth_first,
-	"heuristic": heuristic.find_ladders
+	"bidirectional": naive.bidirectional,
+	"heuristic": heuristic.find_ladders,
+	"a-star": heuristic.a_star,
+	"beam": heuristic.beam,
+	"ida-star": heuristic.ida_star
 }
 
 
-get_algorithm = lambda t: algorithms.get(t) # sigh, argparse. You can't use
-# algorithms.get; that gives you an unhashable type ('dict') error. Brownie
-# points if you can figure out why.
+def get_algorithm(name):
+	try:
+		return algorithms[name]
+	except KeyError:
+		raise argparse.ArgumentTypeError("unknown algorithm: {}".format(name))
+
+
+def make_neighbor_source(words, cache, vectorize=False,
+		cache_size=neighborcache.DEFAULT_SIZE, graph=None, landmark_count=0):
+	"""
+	Picks where ladder nodes get their neighbors from.
+
+	A cache is used if there is one, with the neighbors of up to cache_size
+	recently used words kept in memory, so that queries that go through
+	the same words don't have to ask the database again. Otherwise, the
+	adjacency graph of the word list is built once, so that nodes don't have
+	to scan the entire word list to find their children. If asked to, and
+	NumPy is available, the word list is stored in a word matrix instead,
+	which computes neighbors and distances with vectorized operations. A
+	word graph that has already been built, like the one in a compiled word
+	list, is used as it is.
+
+	If a landmark count is given, distances from that many landmarks are
+	added to the word graph (see ``ladders.landmarks``), for tighter
+	heuristics. The other sources can't have them.
+	"""
+	if landmark_count and (cache is not None or (words is not None and
+			vectorize and vectorized.numpy is not None)):
+		log.warning("landmarks need the word graph, not using them")
+
+	if cache is not None:
+		return neighborcache.NeighborCache(cache, cache_size)
+	elif words is not None and vectorize and vectorized.numpy is not None:
+		return vectorized.WordMatrix(words)
+	elif words is None and graph is None:
+		return None
+
+	if graph is None:
+		if vectorize:
+			log.warning("NumPy is not available, using the word graph")
+		graph = wordgraph.WordGraph.from_words(words)
+
+	if landmark_count:
+		return landmarks.Landmarks(graph, landmark_count)
+	return graph
+
 
+def load_word_list(fn, lengths=None):
+	"""
+	Reads a word list.
 
-def parse_word_list(fn):
-	with open(fn) as f:
-		return [word.strip().upper() for word in f]
+	Returns the words, and the word graph of a compiled word list (see
+	``ladders.compiled``), or None for any other word list. The words of a
+	compiled word list are read from the file as they are needed, and all
+	of them are kept, regardless of the lengths.
+
+	@raise compiled.DictionaryError: If a compiled word list is damaged.
+	"""
+	if compiled.is_compiled(fn):
+		graph = compiled.CompiledGraph(fn)
+		return graph.words, graph
+
+	return wordlist.load_words(fn, lengths), None
+
+
+def cant_open(fn, error):
+	"""
+	Formats an error opening a file for output.
+	"""
+	return "can't open '{}': {}".format(fn, error.strerror or error)
+
+
+def open_table(fn):
+	try:
+		return table.DistanceTable(fn)
+	except (IOError, table.TableError) as e:
+		raise argparse.ArgumentTypeError(str(e))
 
 
 def make_cache(fn):
@@ -29,45 +109,368 @@ def make_cache(fn):
 		return None
 
 
+def parse_pairs(f):
+	"""
+	Reads START TARGET pairs from a file, one pair per line.
+
+	Blank lines and lines starting with # are skipped, and so are malformed
+	lines, with an error message.
+	"""
+	for line_number, line in enumerate(f, 1):
+		line = line.strip()
+		if not line or line.startswith("#"):
+			continue
+
+		fields = line.split()
+		if len(fields) != 2:
+			log.error("skipping line %d: expected START TARGET, got %r",
+				line_number, line)
+			continue
+
+		start, target = fields
+		yield start.upper(), target.upper()
+
+
+def find_ladder(algorithm, start, target, words, source, optimal=False,
+		stats=None):
+	"""
+	Finds one ladder, or returns None if there is none.
+
+	Words of different lengths, and words the neighbor source knows are not
+	connected, are rejected without searching. If stats are given, the
+	search is counted in them.
+	"""
+	if not may_connect(source, start, target):
+		return None
+
+	shortest = None
+
+	for ladder in algorithm(start, target, words, source, optimal=optimal,
+			stats=stats):
+		if shortest is None or len(ladder) < len(shortest):
+			shortest = ladder
+		if not optimal:
+			break
+
+	return shortest
+
+
+def find_shortest_ladders(start, target, words, source, count=None,
+		stats=None):
+	"""
+	Finds every shortest ladder or, if a count is given, that many of the
+	shortest ladders that don't use a word twice, shortest first.
+
+	Returns an iterable of ladders, which are found as they are needed. If
+	stats are given, the search is counted in them.
+	"""
+	if not may_connect(source, start, target):
+		return iter(())
+	elif count is None:
+		return naive.all_shortest(start, target, words, source, stats=stats)
+
+	return itertools.islice(naive.shortest_ladders(start, target, words,
+		source, stats=stats), count)
+
+
+def may_connect(source, start, target):
+	"""
+	Checks if there might be a ladder between two words.
+
+	Neighbor sources that know the connected components of their words (like
+	word graphs) have a ``connected`` method that can rule a ladder out.
+	"""
+	if len(start) != len(target):
+		return False
+
+	connected = getattr(source, "connected", None)
+	return connected is None or connected(start, target)
+
+
+def word_lengths(args):
+	"""
+	Picks the lengths of the words to read from the word list.
+
+	A cache is kept for later queries, so it gets words of every length.
+	"""
+	if args.lengths:
+		return set(args.lengths)
+	elif args.cache is not None or args.batch is not None:
+		return None
+	else:
+		return set([len(args.start), len(args.target)])
+
+
+def format_ladder(start, target, ladder, verbose=False):
+	"""
+	Formats a ladder for output.
+
+	A missing ladder has length 0.
+	"""
+	if verbose:
+		return repr(ladder)
+	else:
+		length = len(ladder) if ladder is not None else 0
+		return "{} {} {}".format(start, target, length)
+
+
+def format_words(ladder):
+	"""
+	Formats the words of a ladder for output.
+	"""
+	return " ".join(node.name for node in ladder)
+
+
+def format_stats(start, target, stats):
+	"""
+	Formats the stats of the search for a ladder for output.
+	"""
+	return ("{} {}: {} generated, {} expanded, max queue {}, {} neighbor "
+		"lookups in {:.6f}s, searched in {:.6f}s".format(start, target,
+			stats.generated, stats.expanded, stats.max_queue, stats.lookups,
+			stats.lookup_time, stats.search_time))
+
+
 parser = argparse.ArgumentParser(description="Find word ladders")
 
-parser.add_argument('start', metavar='START',
+parser.add_argument('start', metavar='START', nargs='?',
 	action='store', type=str.upper,
 	help='the start of the word ladder')
-parser.add_argument('target', metavar='TARGET',
+parser.add_argument('target', metavar='TARGET', nargs='?',
 	action='store', type=str.upper,
 	help='the target of the word ladder')
-parser.add_argument('-a, --algorithm', dest='algorithm', metavar="ALGO",
-	action='store', type=get_algorithm, default=heuristic.find_ladders,
-    help='method to use for finding the word ladders')
-parser.add_argument('-o, --optimal', dest="optimal",
+parser.add_argument('-b', '--batch', dest="batch", metavar="FILE",
+	action='store', type=argparse.FileType('r'),
+	help='read START TARGET pairs from a file (- for stdin), one per line, '
+		'instead of from the command line')
+parser.add_argument('-j', '--jobs', dest="jobs", metavar="N",
+	action='store', type=int, default=1,
+	help='number of processes to answer --batch queries with')
+parser.add_argument('-a', '--algorithm', dest='algorithm', metavar="ALGO",
+	action='store', type=get_algorithm, default=None,
+	help='method to use for finding the word ladders: {} (default: '
+		'heuristic, or bidirectional with --optimal)'.format(
+			", ".join(sorted(algorithms))))
+parser.add_argument('-o', '--optimal', dest="optimal",
 	action='store_true',
 	help='if set, finds the shortest possible ladder')
-parser.add_argument('-w, --word-list', dest="words",
-	action='store', type=parse_word_list)
-parser.add_argument('-c, --cache', dest="cache",
+shortest = parser.add_mutually_exclusive_group()
+shortest.add_argument('--all-shortest', dest="all_shortest",
+	action='store_true',
+	help='print the words of every shortest ladder, one ladder per line '
+		'(ignores --algorithm)')
+shortest.add_argument('--k', dest="k", metavar="N",
+	action='store', type=int,
+	help='print the words of the N shortest ladders that don\'t use a word '
+		'twice, one ladder per line, shortest first (ignores --algorithm)')
+parser.add_argument('--beam-width', dest="beam_width", metavar="K",
+	action='store', type=int, default=heuristic.DEFAULT_BEAM_WIDTH,
+	help='how many partial ladders of each length the beam algorithm keeps '
+		'(default: {})'.format(heuristic.DEFAULT_BEAM_WIDTH))
+parser.add_argument('--beam-fallback', dest="beam_fallback",
+	action='store_true',
+	help='if the beam algorithm finds no ladder, search the whole word list')
+parser.add_argument('-w', '--word-list', dest="words", metavar="FILE",
+	action='store',
+	help='the word list (- for stdin, may be gzipped, or compiled with '
+		'"ladder compile")')
+parser.add_argument('-l', '--length', dest="lengths", metavar="N",
+	action='append', type=int,
+	help='only use words of this length from the word list; may be given '
+		'more than once (default: the length of START and TARGET, or all '
+		'lengths with --batch)')
+parser.add_argument('-c', '--cache', dest="cache",
 	action='store', type=make_cache)
-parser.add_argument('-v, --verbose', dest="verbose",
+parser.add_argument('--neighbor-cache', dest="neighbor_cache_size",
+	metavar="N", action='store', type=int,
+	default=neighborcache.DEFAULT_SIZE,
+	help='remember the neighbors of up to N recently used words from the '
+		'cache, or from the word list when there is no index (default: '
+		'{})'.format(neighborcache.DEFAULT_SIZE))
+parser.add_argument('--landmarks', dest="landmark_count", metavar="N",
+	action='store', type=int, default=0,
+	help='compute distances from N landmark words to every word up front, '
+		'for searches that look at fewer words (around {} is a good start; '
+		'default: none)'.format(landmarks.DEFAULT_COUNT))
+parser.add_argument('-n', '--numpy', dest="vectorize",
+	action='store_true',
+	help='use NumPy to find neighbors and compute distances, if available')
+parser.add_argument('-t', '--table', dest="table", metavar="FILE",
+	action='store', type=open_table,
+	help='look ladders up in a table made with build-table instead of '
+		'searching for them')
+parser.add_argument('--stats', dest="stats",
+	action='store_true',
+	help='print how much work the search for each ladder took to stderr')
+parser.add_argument('-v', '--verbose', dest="verbose",
 	action='store_true',
 	help='verbose logging')
 
+
+table_parser = argparse.ArgumentParser(prog="ladder build-table",
+	description="Build a table of shortest ladders between all pairs of words "
+		"of one length. Building an existing table again resumes it.")
+
+table_parser.add_argument('output', metavar='OUTPUT',
+	action='store',
+	help='the file to write the table to')
+table_parser.add_argument('-w', '--word-list', dest="words", metavar="FILE",
+	required=True, action='store',
+	help='the word list (- for stdin, may be gzipped)')
+table_parser.add_argument('-l', '--length', dest="length", required=True,
+	action='store', type=int,
+	help='the length of the words in the table')
+
+
+def build_table(argv):
+	args = table_parser.parse_args(argv)
+	try:
+		words = wordlist.load_words(args.words, set([args.length]))
+	except IOError as e:
+		table_parser.error(cant_open(args.words, e))
+
+	def progress(done, total):
+		sys.stderr.write("\rbuilt {} of {} rows ({:.0%})".format(done, total,
+			float(done) / total))
+		if done == total:
+			sys.stderr.write("\n")
+
+	try:
+		table.build(args.output, words, progress)
+	except ValueError as e:
+		table_parser.error(str(e))
+
+
+compile_parser = argparse.ArgumentParser(prog="ladder compile",
+	description="Compile a word list into a binary file with its word graph, "
+		"which can be passed to -w instead of the word list and loads in "
+		"constant time.")
+
+compile_parser.add_argument('output', metavar='OUTPUT',
+	action='store',
+	help='the file to write the compiled word list to')
+compile_parser.add_argument('-w', '--word-list', dest="words", metavar="FILE",
+	required=True, action='store',
+	help='the word list (- for stdin, may be gzipped)')
+compile_parser.add_argument('-l', '--length', dest="lengths", metavar="N",
+	action='append', type=int,
+	help='only compile words of this length; may be given more than once '
+		'(default: all lengths)')
+
+
+def compile_word_list(argv):
+	args = compile_parser.parse_args(argv)
+	lengths = set(args.lengths) if args.lengths else None
+	try:
+		words = wordlist.load_words(args.words, lengths)
+	except IOError as e:
+		compile_parser.error(cant_open(args.words, e))
+	compiled.write(args.output, words)
+
+
+def serve(argv):
+	from ladders import server # which imports this module
+	server.serve_main(argv)
+
+
+commands = {
+	"build-table": build_table,
+	"compile": compile_word_list,
+	"serve": serve
+}
+
 def main():
+	if sys.argv[1:2] and sys.argv[1] in commands:
+		return commands[sys.argv[1]](sys.argv[2:])
+
 	args = parser.parse_args()
 
+	if args.batch is None and args.target is None:
+		parser.error("either START and TARGET or --batch is required")
+	elif args.batch is not None and args.start is not None:
+		parser.error("START and TARGET can not be combined with --batch")
+
 	level = (logging.DEBUG if args.verbose else logging.ERROR)
 	logging.basicConfig(level=level)
 
+	if args.beam_width < 1:
+		parser.error("--beam-width has to be at least 1")
+	if args.k is not None and args.k < 1:
+		parser.error("--k has to be at least 1")
+	several = args.all_shortest or args.k is not None
+	if several and (args.batch is not None or args.table is not None):
+		parser.error("--all-shortest and --k can not be combined with --batch "
+			"or --table")
+
+	if args.words == "-" and args.batch is sys.stdin:
+		parser.error("the word list and --batch can not both be read from stdin")
+
+	graph = None
+	if args.words is not None:
+		try:
+			args.words, graph = load_word_list(args.words, word_lengths(args))
+		except IOError as e:
+			parser.error(cant_open(args.words, e))
+		except compiled.DictionaryError as e:
+			parser.error(str(e))
+
 	if args.cache is not None and args.words is not None:
-		args.cache.add_words(args.words)
+		args.cache.ingest(args.words)
 
-	ladders = args.algorithm(args.start, args.target, args.words, args.cache)
+	algorithm = args.algorithm
+	if args.table is not None:
+		algorithm = args.table.find_ladders
+	elif algorithm is None:
+		algorithm = naive.bidirectional if args.optimal else heuristic.find_ladders
+	elif algorithm is heuristic.beam:
+		algorithm = functools.partial(heuristic.beam, width=args.beam_width,
+			fallback=args.beam_fallback)
 
-	if args.optimal:
-		ladder = min(ladders, key=len)
-	else:
-		ladder = ladders.next()
+	source = make_neighbor_source(args.words, args.cache, args.vectorize,
+		args.neighbor_cache_size, graph, args.landmark_count)
 
-	if not args.verbose:
-		print "{} {} {}".format(args.start, args.target, len(ladder))
-	else:
-		print ladder
\ No newline at end of file
+	if several:
+		stats = search.SearchStats() if args.stats else None
+		found = False
+		for ladder in find_shortest_ladders(args.start, args.target,
+				args.words, source, args.k, stats):
+			found = True
+			print format_words(ladder)
+			sys.stdout.flush()
+		if stats is not None:
+			print >>sys.stderr, format_stats(args.start, args.target, stats)
+		if not found:
+			parser.exit(1, "no ladder from {} to {}\n".format(args.start,
+				args.target))
+		return
+
+	if args.batch is None:
+		stats = search.SearchStats() if args.stats else None
+		ladder = find_ladder(algorithm, args.start, args.target, args.words,
+			source, args.optimal, stats)
+		if stats is not None:
+			print >>sys.stderr, format_stats(args.start, args.target, stats)
+		if ladder is None:
+			parser.exit(1, "no ladder from {} to {}\n".format(args.start,
+				args.target))
+
+		print format_ladder(args.start, args.target, ladder, args.verbose)
+		return
+
+	def answer((start, target)):
+		stats = search.SearchStats() if args.stats else None
+		ladder = find_ladder(algorithm, start, target, args.words, source,
+			args.optimal, stats)
+		return (format_ladder(start, target, ladder, args.verbose),
+			format_stats(start, target, stats) if stats is not None else None)
+
+	answers = parallel.imap(answer, parse_pairs(args.batch), args.jobs)
+	for line, stats_line in answers:
+		if stats_line is not None:
+			print >>sys.stderr, stats_line
+		print line
+		sys.stdout.flush()
+
+	if isinstance(source, neighborcache.NeighborCache):
+		log.info("neighbor cache: %d hits, %d misses", source.hits,
+			source.misses)
\ No newline at end of file
@@ -7,17 +7,62 @@ import functools
 from ladders import blind, graph
 
 
-def _find_ladders(search, start, target, words, cache=None):
+def _find_ladders(search, start, target, words, cache=None, optimal=False,
+                  stats=None):
     """
-    Naive word ladder algorithm that finds ladders by depth-first search.
+    Naive word ladder algorithm that finds ladders by blind search.
+
+    If optimal is set, every ladder found is shorter than the previous one,
+    and the last one is a shortest ladder. Stats, if given, are passed on to
+    the search.
     """
-    root = graph.LadderNode(start, words, cache)
+    root = graph.LadderGraph(words, cache).node(start)
 
     def goal(node):
         return node.name == target
 
-    return search(root, goal)
+    if optimal:
+        return search(root, goal, lower_bound=graph.distance_to(target, cache),
+                      stats=stats)
+
+    return search(root, goal, stats=stats)
 
 
 breadth_first, depth_first = [functools.partial(_find_ladders, s)
-    for s in [blind.depth_first_search, blind.breadth_first_search]]
\ No newline at end of file
+    for s in [blind.breadth_first_search, blind.depth_first_search]]
+
+
+def bidirectional(start, target, words, cache=None, optimal=True, stats=None):
+    """
+    Finds a shortest ladder by bidirectional breadth-first search.
+
+    The ladder found is always a shortest one. Stats, if given, are passed on
+    to the search.
+    """
+    ladder_graph = graph.LadderGraph(words, cache)
+    root, target_node = ladder_graph.node(start), ladder_graph.node(target)
+    return blind.bidirectional_search(root, target_node, stats=stats)
+
+
+def all_shortest(start, target, words, cache=None, optimal=True, stats=None):
+    """
+    Finds every shortest ladder, one at a time. Stats, if given, are passed
+    on to the search.
+    """
+    root = graph.LadderGraph(words, cache).node(start)
+
+    def goal(node):
+        return node.name == target
+
+    return blind.all_shortest_paths_search(root, goal, stats=stats)
+
+
+def shortest_ladders(start, target, words, cache=None, optimal=True,
+                     stats=None):
+    """
+    Finds every ladder that doesn't use a word twice, shortest first. Stats,
+    if given, are passed on to the search.
+    """
+    ladder_graph = graph.LadderGraph(words, cache)
+    root, target_node = ladder_graph.node(start), ladder_graph.node(target)
+    return blind.shortest_paths_search(root, target_node, stats=stats)
@@ -0,0 +1,101 @@
+"""
+A bounded, in-memory cache of neighbor lists.
+"""
+DEFAULT_SIZE = 10000
+
+PREVIOUS, NEXT, WORD, NEIGHBORS = 0, 1, 2, 3 # the fields of a link
+
+
+
+class NeighborCache(object):
+    """
+    Remembers the neighbors of recently looked up words.
+
+    Wraps a neighbor source (anything with a ``find_adjacent_words``
+    method) and keeps the neighbors of the most recently used words, up to
+    ``maxsize`` of them (or all of them, if that is None). When it is full,
+    the least recently used word is evicted. Everything but
+    ``find_adjacent_words`` is passed through to the source, so features like
+    ``connected`` keep working.
+
+    Recency is tracked with a circular doubly linked list of links (lists of
+    previous link, next link, word and neighbors), so a hit only relinks one
+    entry; the oldest entry is right after the root.
+    """
+    def __init__(self, source, maxsize=DEFAULT_SIZE):
+        self.source = source
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+
+        self._links = {}
+        self._root = []
+        self._root[:] = [self._root, self._root, None, None]
+
+
+    def __len__(self):
+        return len(self._links)
+
+
+    def __getattr__(self, name):
+        if name == "source": # not set yet, while unpickling
+            raise AttributeError(name)
+        return getattr(self.source, name)
+
+
+    def __getstate__(self):
+        """
+        Returns the source and size of this cache, for pickling.
+
+        The cached neighbors are left out; they can be looked up again.
+        """
+        return self.source, self.maxsize
+
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+
+    def find_adjacent_words(self, word):
+        """
+        Finds the words adjacent to the given word, as a tuple.
+        """
+        link = self._links.get(word)
+        if link is not None:
+            self.hits += 1
+            self._unlink(link)
+            self._append(link)
+            return link[NEIGHBORS]
+
+        self.misses += 1
+        neighbors = tuple(self.source.find_adjacent_words(word))
+        if self.maxsize is None or self.maxsize > 0:
+            if self.maxsize is not None and len(self._links) >= self.maxsize:
+                oldest = self._root[NEXT]
+                self._unlink(oldest)
+                del self._links[oldest[WORD]]
+
+            link = self._links[word] = [None, None, word, neighbors]
+            self._append(link)
+
+        return neighbors
+
+
+    def clear(self):
+        """
+        Forgets all neighbors, and resets the counters.
+        """
+        self._links.clear()
+        self._root[:] = [self._root, self._root, None, None]
+        self.hits = self.misses = 0
+
+
+    def _unlink(self, link):
+        previous, next_link = link[PREVIOUS], link[NEXT]
+        previous[NEXT], next_link[PREVIOUS] = next_link, previous
+
+
+    def _append(self, link):
+        root = self._root
+        last = root[PREVIOUS]
+        last[NEXT] = root[PREVIOUS] = link
+        link[PREVIOUS], link[NEXT] = last, root
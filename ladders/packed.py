@@ -0,0 +1,132 @@
+"""
+Words packed into integers, for computing distances without looping over
+letters.
+
+Every letter of an uppercase word is stored in its own five-bit lane of an
+integer, with the first letter in the lowest lane: A is 1, B is 2, and so
+on. The lanes in which two packed words differ are the nonzero lanes of
+their exclusive or. Folding every lane onto its lowest bit turns that into a
+mask with a single bit set per differing letter, so the distance is a
+population count, and "differs in exactly one letter" is a power of two
+test. Words of up to twelve letters fit in a machine word.
+"""
+BITS = 5
+LANE = (1 << BITS) - 1
+MEMO_SIZE = 1 << 17 # words
+
+
+_lane_masks = [0]
+_codes = {}
+
+
+def encodable(word):
+    """
+    Checks if a word can be packed: it has to be a string of uppercase
+    letters.
+    """
+    return isinstance(word, str) and word.isalpha() and word.isupper()
+
+
+def encode(word):
+    """
+    Packs a word of uppercase letters into an integer.
+
+    @raise ValueError: If the word can't be packed.
+    """
+    code = try_encode(word)
+    if code is None:
+        raise ValueError("can only pack uppercase letters: {!r}".format(word))
+    return code
+
+
+def try_encode(word, memoize=True):
+    """
+    Packs a word into an integer, or returns None if it can't be packed.
+
+    Packed words are memoized, so packing the same word again is a
+    dictionary lookup. The memo is emptied when it holds ``MEMO_SIZE``
+    words, so a long-running process that sees many different words doesn't
+    keep all of them. Callers that keep the codes of many words themselves
+    can leave them out of the memo.
+    """
+    try:
+        return _codes[word]
+    except KeyError:
+        pass
+    except TypeError:
+        return None # unhashable, so certainly not a word
+
+    if not encodable(word):
+        return None
+
+    code = 0
+    for letter in reversed(word):
+        code = (code << BITS) | (ord(letter) - 64)
+
+    if not memoize:
+        return code
+    if len(_codes) >= MEMO_SIZE:
+        _codes.clear()
+    _codes[word] = code
+    return code
+
+
+def decode(code, length):
+    """
+    Unpacks a packed word of the given length.
+    """
+    return "".join(chr(((code >> (BITS * i)) & LANE) + 64)
+                   for i in xrange(length))
+
+
+def lane_mask(length):
+    """
+    Returns the mask with the lowest bit of each of the first length lanes
+    set.
+    """
+    while len(_lane_masks) <= length:
+        _lane_masks.append(_lane_masks[-1] | 1 << BITS * (len(_lane_masks) - 1))
+    return _lane_masks[length]
+
+
+def differing_lanes(code_one, code_two, mask):
+    """
+    Returns a mask with the lowest bit set of every lane in which two packed
+    words differ.
+
+    The mask is the lane mask for the length of the words.
+    """
+    x = code_one ^ code_two
+    return (x | x >> 1 | x >> 2 | x >> 3 | x >> 4) & mask
+
+
+def distance(code_one, code_two, mask):
+    """
+    Returns the number of letters in which two packed words differ.
+    """
+    return bin(differing_lanes(code_one, code_two, mask)).count("1")
+
+
+def adjacent(code_one, code_two, mask):
+    """
+    Checks if two packed words differ in exactly one letter.
+    """
+    lanes = differing_lanes(code_one, code_two, mask)
+    return lanes != 0 and lanes & (lanes - 1) == 0
+
+
+def adjacent_words(entries, code, mask):
+    """
+    Returns the words that differ in exactly one letter from a packed word,
+    out of ``(code, word)`` pairs of packed words of the same length.
+
+    This is ``adjacent`` for a whole list at once, without a function call
+    per word, which is most of the cost of calling it.
+    """
+    found = []
+    for other, word in entries:
+        x = other ^ code
+        lanes = (x | x >> 1 | x >> 2 | x >> 3 | x >> 4) & mask
+        if lanes and not lanes & (lanes - 1):
+            found.append(word)
+    return found
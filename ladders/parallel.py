@@ -0,0 +1,225 @@
+"""
+Running ladder queries in several processes, with time limits.
+"""
+import contextlib
+import itertools
+import multiprocessing
+import os
+import Queue
+import signal
+import threading
+
+
+_function = None # the function the workers call; inherited through fork
+
+
+
+class Timeout(Exception):
+    """
+    Raised when a query takes too long.
+    """
+
+
+
+class WorkerError(Exception):
+    """
+    Raised when a worker process dies, or can't be talked to.
+    """
+
+
+
+class WorkerPool(object):
+    """
+    A pool of worker processes that call one function.
+
+    Like ``imap``, the workers are forked once the function has been set up,
+    and only items and results are pickled. Each worker has a pipe of its
+    own, and an item goes straight to an idle worker, so the overhead of a
+    call is one round trip through a pipe. Where processes can't be forked,
+    or with no jobs, the function is called in the calling thread.
+
+    Items can be applied from several threads at once. Only one pool (or
+    ``imap``) can be in use at a time.
+    """
+    def __init__(self, function, jobs):
+        global _function
+        _function = function
+
+        self._idle = Queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock() # guards _workers
+        if hasattr(os, "fork"):
+            for _ in xrange(jobs):
+                self._start_worker()
+
+
+    def _start_worker(self):
+        """
+        Starts a worker and makes it available.
+
+        Callers other than ``__init__`` must hold the lock.
+        """
+        connection, worker_connection = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_work,
+                                          args=(worker_connection,))
+        process.daemon = True
+        process.start()
+        worker_connection.close()
+
+        worker = process, connection
+        self._workers.add(worker)
+        self._idle.put(worker)
+
+
+    def apply(self, item, timeout=None):
+        """
+        Calls the function on an item in one of the workers, and returns the
+        result.
+
+        A worker that doesn't answer within the timeout, or that dies, is
+        killed, and replaced by a new one.
+
+        @raise Timeout: If the result has not come back within the timeout.
+        @raise WorkerError: If the worker died, or its pipe broke.
+        """
+        with self._lock:
+            in_process = not self._workers
+        if in_process:
+            return _function(item)
+
+        worker = self._idle.get()
+        _, connection = worker
+        try:
+            connection.send(item)
+            answered = connection.poll(timeout)
+            if answered:
+                succeeded, result = connection.recv()
+        except (EOFError, IOError, OSError) as e:
+            self._replace(worker)
+            raise WorkerError("worker failed: {!r}".format(e))
+
+        if not answered:
+            self._replace(worker)
+            raise Timeout()
+
+        self._idle.put(worker)
+        if not succeeded:
+            raise result
+        return result
+
+
+    def _replace(self, worker):
+        """
+        Kills a worker, and starts a new one in its place.
+        """
+        process, connection = worker
+        with self._lock:
+            self._workers.discard(worker)
+            process.terminate()
+            connection.close()
+            self._start_worker()
+
+
+    def close(self):
+        """
+        Stops the workers.
+        """
+        global _function
+        with self._lock:
+            for process, connection in self._workers:
+                process.terminate()
+                connection.close()
+            for process, _ in self._workers:
+                process.join()
+            self._workers.clear()
+            _function = None
+
+
+
+def imap(function, iterable, jobs):
+    """
+    Like ``itertools.imap``, but calls the function in a pool of worker
+    processes.
+
+    The function itself is never pickled. The workers are forked after it
+    has been set up, so it can close over large read-only structures like a
+    word graph, which the workers then share with this process copy-on-write.
+    Only the items and the results go through pipes, so both should be small.
+
+    Results are produced in the order of the items they belong to, as soon as
+    they (and all of the results before them) are done.
+
+    Where processes can't be forked, or with a single job, the function is
+    just called in this process.
+    """
+    if jobs <= 1 or not hasattr(os, "fork"):
+        return itertools.imap(function, iterable)
+
+    return _imap_in_pool(function, iterable, jobs)
+
+
+def _imap_in_pool(function, iterable, jobs):
+    global _function
+    _function = function
+    pool = multiprocessing.Pool(jobs)
+
+    try:
+        for result in pool.imap(_call, iterable):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+        _function = None
+
+
+def _call(item):
+    return _function(item)
+
+
+def _work(connection):
+    """
+    Calls the function on items from a connection, and sends back the
+    results (or the exceptions), until the other end is closed.
+    """
+    while True:
+        try:
+            item = connection.recv()
+        except EOFError:
+            return
+
+        try:
+            connection.send((True, _function(item)))
+        except Exception as e:
+            connection.send((False, e))
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """
+    Raises ``Timeout`` in the block if it takes longer than the given number
+    of seconds.
+
+    Uses ``SIGALRM``, so it only works in the thread that handles signals
+    (the main thread, or in a forked worker the thread that forked it), and
+    not at all where there is no such signal; otherwise there is no limit.
+    """
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def alarm(signum, frame):
+        raise Timeout()
+
+    try:
+        previous = signal.signal(signal.SIGALRM, alarm)
+    except ValueError: # not the thread that handles signals
+        yield
+        return
+
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -3,6 +3,7 @@ Generic graph search algorithms.
 """
 import collections
 import logging
+import time
 
 from ladders import graph
 
@@ -10,33 +11,280 @@ from ladders import graph
 log = logging.getLogger('ladders.search')
 
 
-def _acyclic_extended_paths(path):
+class SearchStats(object):
+    """
+    Counts what a search does.
+
+    Pass one to a search function as ``stats`` and read it once the search is
+    done (or while it is running):
+
+        - ``generated``: the number of nodes put on the queue
+        - ``expanded``: the number of nodes whose children were looked up
+        - ``max_queue``: the largest the queue (or frontier) has been
+        - ``lookups`` and ``lookup_time``: the number of times children were
+          looked up, and the seconds that took
+        - ``search_time``: the seconds spent searching, including lookups
+
+    The same stats can be passed to several searches to add them up.
+    """
+    def __init__(self):
+        self.generated = 0
+        self.expanded = 0
+        self.max_queue = 0
+        self.lookups = 0
+        self.lookup_time = 0.0
+        self.search_time = 0.0
+
+
+    def __repr__(self):
+        return ("<SearchStats: {0.generated} generated, {0.expanded} expanded, "
+                "max queue {0.max_queue}, {0.lookups} lookups in "
+                "{0.lookup_time:.6f}s, searched in {0.search_time:.6f}s>"
+                ).format(self)
+
+
+    def queued(self, size):
+        """
+        Records the current size of the queue.
+        """
+        if size > self.max_queue:
+            self.max_queue = size
+
+
+    def counted(self, children):
+        """
+        Wraps a children function, so that lookups are counted and timed.
+
+        Children are looked up right away, instead of lazily, so that the
+        time it takes is measured.
+        """
+        def counted_children(node):
+            began = time.time()
+            try:
+                return list(children(node))
+            finally:
+                self.lookups += 1
+                self.lookup_time += time.time() - began
+
+        return counted_children
+
+
+    def timed(self, paths):
+        """
+        Wraps an iterable of paths, so that the time spent producing them is
+        added to the search time.
+        """
+        paths = iter(paths)
+        while True:
+            began = time.time()
+            try:
+                path = next(paths)
+            finally:
+                self.search_time += time.time() - began
+            yield path
+
+
+
+def _acyclic_extended_paths(path, children=graph.node_children):
     """
     Returns the extended paths of a given path that do not have any cycles.
     """
-    for new_path in graph.extended_paths(path):
+    for new_path in graph.extended_paths(path, children):
         if not graph.has_new_cycle(new_path):
             yield new_path
 
 
-def _generic_search(root, goal, expander):
+def _follow_parents(node, parents):
     """
-    A generic search tree pathfinder.
+    Follows parent pointers from a node up to the root of its search.
+
+    The root is the node whose parent is None. Returns the nodes along the
+    way, starting with the given node.
+    """
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    return path
+
+
+def breadth_first_layers(root, children=graph.node_children):
+    """
+    Walks everything reachable from the root, breadth-first.
+
+    Yields a (node, parent, depth) tuple for every reachable node, in order of
+    depth, where the parent is the node it was first reached from and the
+    depth is the number of steps from the root. The root has no parent.
+    Following the parents from any node leads back to the root along a
+    shortest path.
+    """
+    depths = {root: 0}
+    queue = collections.deque([root])
+    yield root, None, 0
+
+    while queue:
+        node = queue.popleft()
+        depth = depths[node] + 1
+
+        for child in children(node):
+            if child not in depths:
+                depths[child] = depth
+                queue.append(child)
+                yield child, node, depth
+
+
+def _generic_search(root, goal, expander, children=graph.node_children,
+                    lower_bound=None, stats=None):
+    """
+    A generic graph search pathfinder.
+
+    If a lower bound is given, this searches for a shortest path instead;
+    see ``_branch_and_bound_search``.
+
+    Instead of whole paths, the queue holds entries: (parent, depth, node)
+    tuples, where the parent is the node that was expanded to reach this one.
+    Like a path, the last element of an entry is the node that has been
+    reached, so expanders and heuristics written for paths keep working.
+
+    Every node is expanded at most once. The search remembers the parent of
+    every expanded node, and only builds a path when it reaches a goal. Goal
+    nodes are reported every time they are reached along a new path, so more
+    than one path can be found.
+
+    The expander is called with the entries for the children of the node
+    being expanded that have not been expanded themselves, and the queue. It
+    is expected to add those entries to the queue.
+
+    If stats are given, what the search does is counted in them.
 
     Returns an iterable of paths that end in a goal state.
     """
-    queue = collections.deque([[root]])
+    if stats is not None:
+        children = stats.counted(children)
+
+    if lower_bound is not None:
+        paths = _branch_and_bound_search(root, goal, expander, lower_bound,
+                                         children, stats)
+    else:
+        paths = _exhaustive_search(root, goal, expander, children, stats)
+
+    return stats.timed(paths) if stats is not None else paths
+
+
+def _exhaustive_search(root, goal, expander, children, stats=None):
+    """
+    Finds paths to goal states, expanding every node at most once.
+
+    See ``_generic_search``.
+    """
+    parents = {}
+    queue = collections.deque([(None, 0, root)])
 
     while queue:
-        path = queue.popleft()
-        log.info("considering path %r" % (path,))
+        parent, depth, node = queue.popleft()
+        log.info("considering %r at depth %d", node, depth)
 
-        if goal(path[-1]):
-            log.info("found a path that reaches goal state %r" % (path[-1],))
-            yield path
+        if goal(node):
+            path = _path_through(parent, node, parents)
+            if path is not None:
+                log.info("found a path that reaches goal state %r", node)
+                yield path
 
-        if not path[-1].children:
-            log.info("path is a dead end, ignoring")
+        if node in parents:
+            log.info("node was already expanded, ignoring")
             continue
 
-        expander(path, queue)
+        parents[node] = parent
+        extensions = [(node, depth + 1, child) for child in children(node)
+                      if child not in parents or goal(child)]
+
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(extensions)
+
+        if not extensions:
+            log.info("node is a dead end, ignoring")
+            continue
+
+        expander(extensions, queue)
+        if stats is not None:
+            stats.queued(len(queue))
+
+
+def _path_through(parent, node, parents):
+    """
+    Builds the path to a node reached from an expanded parent.
+
+    Returns None if the node is already on the path to its parent, since that
+    path would have a cycle.
+    """
+    path = _follow_parents(parent, parents)
+    if node in path:
+        return None
+
+    path.reverse()
+    path.append(node)
+    return path
+
+
+def _branch_and_bound_search(root, goal, expander, lower_bound,
+                             children=graph.node_children, stats=None):
+    """
+    A generic pathfinder that searches for a shortest path to a goal.
+
+    Works like ``_generic_search``, except that every path it returns is
+    shorter than the previous one, so the last one is a shortest path. The
+    lower bound is a function that, given a node, returns a number of steps
+    that is never more than the number of steps from that node to the
+    nearest goal. Once a path has been found, partial paths that can not be
+    extended into a shorter one according to that bound are dropped.
+
+    To guarantee that the last path is a shortest one, a node is expanded
+    again when it is reached along a shorter path than before.
+
+    Returns an iterable of successively shorter paths ending in a goal state.
+    """
+    depths, parents = {root: 0}, {root: None}
+    best = None # the length of the shortest path found so far
+    queue = collections.deque([(None, 0, root)])
+
+    def promising(depth, node):
+        return best is None or depth + 1 + lower_bound(node) < best
+
+    while queue:
+        _, depth, node = queue.popleft()
+
+        if depth > depths[node]:
+            continue # stale entry; node was reached along a shorter path since
+
+        if not promising(depth, node):
+            log.info("pruning %r at depth %d", node, depth)
+            continue
+
+        if goal(node):
+            path = _follow_parents(node, parents)
+            path.reverse()
+            best = len(path)
+            log.info("found a path of length %d to %r", best, node)
+            yield path
+            continue # extending it can only make it longer
+
+        extensions = []
+        for child in children(node):
+            child_depth = depth + 1
+            if child_depth >= depths.get(child, child_depth + 1):
+                continue
+            if not promising(child_depth, child):
+                continue
+
+            depths[child], parents[child] = child_depth, node
+            extensions.append((node, child_depth, child))
+
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(extensions)
+
+        if extensions:
+            expander(extensions, queue)
+            if stats is not None:
+                stats.queued(len(queue))
@@ -0,0 +1,303 @@
+"""
+A long-running ladder server.
+
+The server loads its dictionaries and builds their word graphs once, then
+answers queries over a Unix socket or a localhost TCP port, so a client pays
+neither process start-up nor indexing per query.
+
+The protocol is JSON lines: a client sends one JSON object per line and gets
+one JSON object back per line, in order, on the same connection. A query
+looks like::
+
+    {"start": "PIG", "target": "STY"}
+
+and can also have a ``dictionary`` (required when the server has more than
+one), an ``algorithm``, ``optimal``, ``timeout`` (in seconds, at most the
+server's own), and ``beam_width`` and ``beam_fallback`` for the beam
+algorithm. An ``id``, if given, is sent back with the answer::
+
+    {"start": "PIG", "target": "STY", "ladder": ["PIG", "WIG", ...],
+     "length": 6}
+
+There is no ladder if ``ladder`` is null (and the length is 0). Queries that
+can't be answered get an object with an ``error`` message instead.
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import signal
+import SocketServer
+import socket
+import stat
+import sys
+
+from ladders import compiled, heuristic, main, parallel
+
+
+log = logging.getLogger('ladders.server')
+
+
+
+class LadderService(object):
+    """
+    Answers ladder queries on a set of dictionaries.
+
+    The dictionaries map names to ``(words, neighbor source)`` pairs. Queries
+    are answered by a pool of worker processes that are forked once the
+    dictionaries are loaded, so searches run in parallel and share the
+    dictionaries with this process. Each query gets the server's timeout,
+    or less if it asks for less. The beam width and fallback are the
+    defaults for queries that use the beam algorithm.
+    """
+    def __init__(self, dictionaries, algorithm=None, optimal=False,
+                 timeout=None, jobs=1,
+                 beam_width=heuristic.DEFAULT_BEAM_WIDTH, beam_fallback=False):
+        self.dictionaries = dictionaries
+        self.algorithm = algorithm
+        self.optimal = optimal
+        self.timeout = timeout
+        self.beam_width = beam_width
+        self.beam_fallback = beam_fallback
+        self._pool = parallel.WorkerPool(self._answer, jobs)
+
+
+    def close(self):
+        self._pool.close()
+
+
+    def answer(self, query):
+        """
+        Answers a query (a dictionary, as decoded from JSON).
+        """
+        try:
+            parsed = self._parse(query)
+        except ValueError as e:
+            response = {"error": str(e)}
+        else:
+            # the workers give up by themselves; this is in case they can't
+            limit = parsed["timeout"] + 1 if parsed["timeout"] else None
+            try:
+                response = self._pool.apply(parsed, limit)
+            except parallel.Timeout:
+                response = {"error": "timed out"}
+            except parallel.WorkerError as e:
+                log.error("%s", e)
+                response = {"error": "the search failed"}
+
+        if isinstance(query, dict) and "id" in query:
+            response["id"] = query["id"]
+        return response
+
+
+    def _parse(self, query):
+        """
+        Checks a query, and fills in the defaults.
+
+        @raise ValueError: If the query is not valid.
+        """
+        if not isinstance(query, dict):
+            raise ValueError("a query has to be a JSON object")
+
+        try:
+            start = str(query["start"]).upper()
+            target = str(query["target"]).upper()
+        except KeyError:
+            raise ValueError("a query needs a start and a target")
+        except UnicodeError:
+            raise ValueError("words can only have ASCII letters")
+
+        name = query.get("dictionary")
+        if name is None and len(self.dictionaries) == 1:
+            (name,) = self.dictionaries
+        if not isinstance(name, basestring) or name not in self.dictionaries:
+            raise ValueError("unknown dictionary: {}; pick one of {}".format(
+                name, ", ".join(sorted(self.dictionaries))))
+
+        optimal = bool(query.get("optimal", self.optimal))
+        algorithm = query.get("algorithm", self.algorithm)
+        if algorithm is None:
+            algorithm = "bidirectional" if optimal else "heuristic"
+        if (not isinstance(algorithm, basestring)
+                or algorithm not in main.algorithms):
+            raise ValueError("unknown algorithm: {}".format(algorithm))
+
+        timeout = query.get("timeout")
+        if timeout is not None and (not isinstance(timeout, (int, float))
+                                    or isinstance(timeout, bool)
+                                    or timeout <= 0):
+            raise ValueError("the timeout has to be a positive number of "
+                             "seconds")
+        if self.timeout and (not timeout or timeout > self.timeout):
+            timeout = self.timeout
+
+        beam_width = query.get("beam_width", self.beam_width)
+        if (not isinstance(beam_width, int) or isinstance(beam_width, bool)
+                or beam_width < 1):
+            raise ValueError("the beam width has to be a positive integer")
+        beam_fallback = bool(query.get("beam_fallback", self.beam_fallback))
+
+        return {"start": start, "target": target, "dictionary": name,
+                "algorithm": algorithm, "optimal": optimal, "timeout": timeout,
+                "beam_width": beam_width, "beam_fallback": beam_fallback}
+
+
+    def _answer(self, query):
+        """
+        Finds the ladder for a parsed query. Runs in a worker.
+        """
+        start, target = query["start"], query["target"]
+        words, source = self.dictionaries[query["dictionary"]]
+        algorithm = main.algorithms[query["algorithm"]]
+        if algorithm is heuristic.beam:
+            algorithm = functools.partial(algorithm, width=query["beam_width"],
+                                          fallback=query["beam_fallback"])
+
+        try:
+            with parallel.time_limit(query["timeout"]):
+                ladder = main.find_ladder(algorithm, start, target, words,
+                                          source, query["optimal"])
+        except parallel.Timeout:
+            return {"error": "timed out"}
+
+        words = [node.name for node in ladder] if ladder is not None else None
+        return {"start": start, "target": target, "ladder": words,
+                "length": len(words) if words is not None else 0}
+
+
+
+class _Handler(SocketServer.StreamRequestHandler):
+    """
+    Answers the queries on one connection, one line at a time.
+    """
+    def handle(self):
+        for line in iter(self.rfile.readline, ""):
+            if not line.strip():
+                continue
+
+            try:
+                query = json.loads(line)
+            except ValueError:
+                response = {"error": "not a JSON object"}
+            else:
+                response = self.server.service.answer(query)
+
+            self.wfile.write(json.dumps(response) + "\n")
+            self.wfile.flush()
+
+
+
+class _UnixServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+    daemon_threads = True
+
+
+
+class _TCPServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+
+def make_server(service, path=None, port=None):
+    """
+    Makes a server for a service, on a Unix socket at the given path or on a
+    localhost TCP port.
+
+    A stale socket left at the path by an earlier server is removed.
+    """
+    if path is not None:
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        server = _UnixServer(path, _Handler)
+    else:
+        server = _TCPServer(("127.0.0.1", port), _Handler)
+
+    server.service = service
+    return server
+
+
+parser = argparse.ArgumentParser(prog="ladder serve",
+    description="Answer ladder queries over a socket, one JSON object per "
+        "line. The word lists are loaded once, when the server starts.")
+
+listen = parser.add_mutually_exclusive_group(required=True)
+listen.add_argument('-s', '--socket', dest="path", metavar="PATH",
+    action='store',
+    help='listen on a Unix socket at this path')
+listen.add_argument('-p', '--port', dest="port", metavar="PORT",
+    action='store', type=int,
+    help='listen on this TCP port on localhost')
+parser.add_argument('-w', '--word-list', dest="word_lists", metavar="FILE",
+    required=True, action='append',
+    help='a word list to serve, named after the file (may be gzipped or '
+        'compiled); may be given more than once')
+parser.add_argument('-a', '--algorithm', dest="algorithm", metavar="ALGO",
+    action='store', choices=sorted(main.algorithms),
+    help='the algorithm queries use by default (default: heuristic, or '
+        'bidirectional for optimal queries)')
+parser.add_argument('-o', '--optimal', dest="optimal",
+    action='store_true',
+    help='find shortest ladders unless a query says otherwise')
+parser.add_argument('-j', '--jobs', dest="jobs", metavar="N",
+    action='store', type=int, default=1,
+    help='number of processes to answer queries with (default: 1)')
+parser.add_argument('-t', '--timeout', dest="timeout", metavar="SECONDS",
+    action='store', type=float, default=10.0,
+    help='give up on a query after this long (default: 10, 0 for no limit)')
+parser.add_argument('--beam-width', dest="beam_width", metavar="K",
+    action='store', type=int, default=heuristic.DEFAULT_BEAM_WIDTH,
+    help='how many partial ladders of each length the beam algorithm keeps, '
+        'unless a query says otherwise (default: {})'.format(
+            heuristic.DEFAULT_BEAM_WIDTH))
+parser.add_argument('--beam-fallback', dest="beam_fallback",
+    action='store_true',
+    help='if the beam algorithm finds no ladder, search the whole word list, '
+        'unless a query says otherwise')
+parser.add_argument('--landmarks', dest="landmark_count", metavar="N",
+    action='store', type=int, default=0,
+    help='compute distances from N landmark words to every word when the '
+        'server starts, for searches that look at fewer words')
+parser.add_argument('-v', '--verbose', dest="verbose",
+    action='store_true',
+    help='verbose logging')
+
+
+def serve_main(argv):
+    args = parser.parse_args(argv)
+    if args.beam_width < 1:
+        parser.error("--beam-width has to be at least 1")
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR)
+
+    dictionaries = {}
+    for fn in args.word_lists:
+        try:
+            words, graph = main.load_word_list(fn)
+        except IOError as e:
+            parser.error(main.cant_open(fn, e))
+        except compiled.DictionaryError as e:
+            parser.error(str(e))
+        dictionaries[os.path.basename(fn)] = (words,
+            main.make_neighbor_source(words, None, graph=graph,
+                                      landmark_count=args.landmark_count))
+
+    service = LadderService(dictionaries, args.algorithm, args.optimal,
+                            args.timeout or None, args.jobs, args.beam_width,
+                            args.beam_fallback)
+    try:
+        server = make_server(service, args.path, args.port)
+    except socket.error as e:
+        service.close()
+        parser.exit(1, "can't listen: {}\n".format(e))
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    log.info("serving %s", ", ".join(sorted(dictionaries)))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.path is not None:
+            os.unlink(args.path)
@@ -0,0 +1,292 @@
+"""
+Precomputed tables of ladder lengths and paths between all pairs of words.
+
+A table is built for a list of words of a single length, by running a
+breadth-first search from every word. It is stored in a file with this
+layout, all numbers little-endian:
+
+    - a header (see ``HEADER``), including how many rows have been built
+    - the words, sorted, as fixed-width records of ``word_length`` bytes
+    - the distance matrix: ``count * count`` unsigned bytes
+    - the next-hop matrix: ``count * count`` unsigned 16-bit word IDs
+
+Row ``t`` of both matrices comes from the search starting at word ``t``.
+Column ``s`` of the distance matrix holds the number of steps between words
+``s`` and ``t``, and column ``s`` of the next-hop matrix holds the word after
+``s`` on a shortest ladder from ``s`` to ``t``. Rows are written in order and
+the header records how many are done, so an interrupted build can pick up
+where it left off.
+"""
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+
+from ladders import graph, search, wordgraph
+
+
+MAGIC, VERSION = "LADRDIST", 1
+HEADER = struct.Struct("<8sHHII20s") # magic, version, length, count, rows, hash
+UNREACHABLE, NO_WORD = 0xFF, 0xFFFF
+MAX_WORDS = NO_WORD
+
+
+
+class TableError(Exception):
+    """
+    Raised when a table file can't be used.
+    """
+
+
+
+class DistanceTable(object):
+    """
+    A memory-mapped table of ladders between all pairs of words.
+
+    Looking up a ladder length is one memory access; looking up a ladder is
+    one per word on it. Nothing is read from the file until it is needed, so
+    opening a table is fast regardless of its size.
+    """
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError: # empty files can't be mapped
+                raise TableError("not a ladder table: empty")
+
+        try:
+            header = _read_header(self._map)
+            magic, version, self.word_length, self.count, rows, _ = header
+            if rows != self.count:
+                raise TableError("table {} is incomplete ({} of {} rows); "
+                                 "build it again to finish it".format(
+                                     path, rows, self.count))
+
+            self._distances, self._next_hops = _matrix_offsets(header)
+            if len(self._map) < self._next_hops + 2 * self.count ** 2:
+                raise TableError("table {} is truncated".format(path))
+        except TableError:
+            self._map.close()
+            raise
+
+        self.words = _Records(self._map, HEADER.size, self.word_length,
+                              self.count)
+
+
+    def __len__(self):
+        return self.count
+
+
+    def __contains__(self, word):
+        return self.id(word) is not None
+
+
+    def id(self, word):
+        """
+        Returns the ID of a word, or None if it is not in the table.
+        """
+        if len(word) != self.word_length:
+            return None
+
+        i = bisect.bisect_left(self.words, word)
+        if i < self.count and self.words[i] == word:
+            return i
+        return None
+
+
+    def distance(self, start, target):
+        """
+        Returns the number of steps on a shortest ladder between two words,
+        or None if there is no ladder.
+        """
+        start_id, target_id = self.id(start), self.id(target)
+        if start_id is None or target_id is None:
+            return None
+
+        distance = ord(self._map[self._distances
+                                 + target_id * self.count + start_id])
+        return distance if distance != UNREACHABLE else None
+
+
+    def path(self, start, target):
+        """
+        Returns the words on a shortest ladder between two words, or None if
+        there is no ladder.
+        """
+        if self.distance(start, target) is None:
+            return None
+
+        start_id, target_id = self.id(start), self.id(target)
+        row = self._next_hops + 2 * target_id * self.count
+        path = [start_id]
+        while path[-1] != target_id:
+            (next_hop,) = struct.unpack_from("<H", self._map, row + 2 * path[-1])
+            path.append(next_hop)
+
+        return [self.words[word_id] for word_id in path]
+
+
+    def find_ladders(self, start, target, words=None, cache=None,
+                     optimal=True, stats=None):
+        """
+        Finds the ladder between two words by looking it up.
+
+        This has the same signature as the search algorithms, so a table can
+        be used in their place. The word list, cache and stats are not used,
+        and the ladder found is always a shortest one.
+        """
+        path = self.path(start, target)
+        if path is not None:
+            yield [graph.Node(word) for word in path]
+
+
+
+class _Records(object):
+    """
+    A read-only sequence of fixed-width strings in a buffer.
+
+    Supports just enough of the sequence protocol to be used with ``bisect``.
+    """
+    def __init__(self, buffer, offset, width, count):
+        self._buffer = buffer
+        self._offset, self._width, self._count = offset, width, count
+
+
+    def __len__(self):
+        return self._count
+
+
+    def __getitem__(self, i):
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+
+        start = self._offset + i * self._width
+        return self._buffer[start:start + self._width]
+
+
+
+def build(path, words, progress=None, batch_size=64):
+    """
+    Builds a table for some words and writes it to the given file.
+
+    All words have to have the same length. If the file already holds a
+    partially built table for the same words, building resumes from the
+    first missing row. The progress function, if given, is called with the
+    number of rows done and the total number of rows after every batch.
+    """
+    words = sorted(set(words))
+    lengths = set(len(word) for word in words)
+    if len(lengths) > 1:
+        raise ValueError("words of different lengths: {}".format(
+            sorted(lengths)))
+    elif len(words) >= MAX_WORDS:
+        raise ValueError("too many words for a table: {}".format(len(words)))
+
+    header = (MAGIC, VERSION, lengths.pop() if words else 0, len(words), 0,
+              _digest(words))
+    rows_done = _resume(path, header)
+    if rows_done is None:
+        _create(path, header, words)
+        rows_done = 0
+
+    word_graph = wordgraph.WordGraph.from_words(words)
+    distances_offset, next_hops_offset = _matrix_offsets(header)
+    count = len(words)
+
+    with open(path, "r+b") as f:
+        while rows_done < count:
+            batch_end = min(rows_done + batch_size, count)
+
+            for row in xrange(rows_done, batch_end):
+                distances, next_hops = _row(word_graph, row)
+                f.seek(distances_offset + row * count)
+                f.write(distances)
+                f.seek(next_hops_offset + 2 * row * count)
+                f.write(struct.pack("<{}H".format(count), *next_hops))
+
+            f.flush()
+            os.fsync(f.fileno())
+            rows_done = batch_end
+            f.seek(0)
+            f.write(HEADER.pack(*header[:4] + (rows_done,) + header[5:]))
+            f.flush()
+
+            if progress is not None:
+                progress(rows_done, count)
+
+
+def _row(word_graph, target_id):
+    """
+    Computes one row of both matrices, by searching from the target.
+    """
+    count = len(word_graph)
+    distances = bytearray([UNREACHABLE]) * count
+    next_hops = [NO_WORD] * count
+    next_hops[target_id] = target_id
+
+    layers = search.breadth_first_layers(target_id, word_graph.neighbors)
+    for word_id, parent_id, depth in layers:
+        if depth >= UNREACHABLE:
+            raise ValueError("ladder too long for a table: {} steps".format(
+                depth))
+
+        distances[word_id] = depth
+        if parent_id is not None:
+            next_hops[word_id] = parent_id
+
+    return distances, next_hops
+
+
+def _digest(words):
+    return hashlib.sha1("\n".join(words)).digest()
+
+
+def _read_header(buffer):
+    if len(buffer) < HEADER.size:
+        raise TableError("not a ladder table: too short")
+
+    header = HEADER.unpack_from(buffer)
+    if header[0] != MAGIC:
+        raise TableError("not a ladder table")
+    elif header[1] != VERSION:
+        raise TableError("unsupported table version {}".format(header[1]))
+
+    return header
+
+
+def _matrix_offsets(header):
+    """
+    Returns the offsets of the distance and next-hop matrices in a table.
+    """
+    _, _, word_length, count, _, _ = header
+    distances = HEADER.size + word_length * count
+    return distances, distances + count * count
+
+
+def _resume(path, header):
+    """
+    Returns the number of rows done in an existing table for the same words,
+    or None if there is no such table.
+    """
+    try:
+        with open(path, "rb") as f:
+            existing = _read_header(f.read(HEADER.size))
+    except (IOError, TableError):
+        return None
+
+    if existing[:4] + existing[5:] != header[:4] + header[5:]:
+        return None
+
+    return existing[4]
+
+
+def _create(path, header, words):
+    """
+    Writes a new, empty table.
+    """
+    count = len(words)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(*header))
+        f.write("".join(words))
+        f.truncate(_matrix_offsets(header)[1] + 2 * count * count)
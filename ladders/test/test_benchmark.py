@@ -0,0 +1,166 @@
+import os
+import StringIO
+import unittest
+
+from ladders import benchmark
+
+
+class PairsTests(unittest.TestCase):
+    words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY", "RICH", "POOR"]
+
+
+    def test_reproducible(self):
+        self.assertEqual(benchmark.random_pairs(self.words, 5, seed=1),
+                         benchmark.random_pairs(self.words, 5, seed=1))
+
+
+    def test_same_length(self):
+        for start, target in benchmark.random_pairs(self.words, 20):
+            self.assertEqual(len(start), len(target))
+            self.assertNotEqual(start, target)
+
+
+    def test_synthetic_words(self):
+        words = benchmark.synthetic_words(4, 100, seed=3)
+        self.assertEqual(words, benchmark.synthetic_words(4, 100, seed=3))
+        self.assertEqual(len(set(words)), 100)
+        self.assertTrue(all(len(word) == 4 for word in words))
+        self.assertRaises(ValueError, benchmark.synthetic_words, 1, 100)
+
+
+
+class RunTests(unittest.TestCase):
+    words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY"]
+
+
+    def test_run(self):
+        results = benchmark.run([("pigsty", self.words)], ["bidirectional"],
+                                pairs=3)
+        self.assertEqual(len(results), 2 * 2 * 3)
+        for result in results:
+            self.assertEqual(result.length, abs(self.words.index(result.start)
+                                                - self.words.index(result.target))
+                             + 1)
+            self.assertGreater(result.nodes_expanded, 0)
+            self.assertGreaterEqual(result.nodes_generated, result.length - 1)
+            self.assertFalse(result.timed_out)
+
+
+    def test_timeout(self):
+        def forever(*args, **kwargs):
+            while True:
+                pass
+            yield
+
+        measured = benchmark.run_query(forever, "PIG", "STY", self.words, None,
+                                       timeout=0.05)
+        self.assertEqual(measured[2:], (None, True))
+        self.assertEqual(measured[1].expanded, 0)
+
+
+    def test_memory(self):
+        results = benchmark.run([("pigsty", self.words)], ["bidirectional"],
+                                pairs=1)
+        for result in results:
+            if hasattr(os, "fork"):
+                self.assertGreaterEqual(result.peak_memory, 0)
+            else:
+                self.assertIsNone(result.peak_memory)
+
+
+    def test_save_and_load(self):
+        results = benchmark.run([("pigsty", self.words)], ["a-star"], pairs=2)
+        f = StringIO.StringIO()
+        benchmark.save(results, f, pairs=2)
+        f.seek(0)
+        self.assertEqual(benchmark.load(f), results)
+
+
+    def test_load_old_results(self):
+        f = StringIO.StringIO('{"results": [{"dictionary": "pigsty", '
+                              '"algorithm": "a-star", "cache": false, '
+                              '"optimal": true, "start": "PIG", '
+                              '"target": "STY", "seconds": 0.1, '
+                              '"nodes_expanded": 5, "peak_memory": null, '
+                              '"length": 6, "timed_out": false}]}')
+        (result,) = benchmark.load(f)
+        self.assertEqual(result.nodes_expanded, 5)
+        self.assertEqual(result.max_queue, None)
+
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "needs fork")
+class IsolatedTests(unittest.TestCase):
+    def test_result(self):
+        value, memory = benchmark.isolated(sorted, [3, 1, 2])
+        self.assertEqual(value, [1, 2, 3])
+
+
+    def test_memory(self):
+        """
+        Tests that the memory a call needs is measured, and not what the
+        calls before it needed.
+        """
+        def allocate(count):
+            return len(range(count))
+
+        _, large = benchmark.isolated(allocate, 10 ** 7)
+        _, small = benchmark.isolated(allocate, 10)
+        self.assertGreater(large, 50000)
+        self.assertLess(small, large / 10)
+
+
+    def test_state(self):
+        changed = []
+        benchmark.isolated(changed.append, 1)
+        self.assertEqual(changed, [])
+
+
+    def test_failure(self):
+        with self.assertRaisesRegexp(RuntimeError, "ZeroDivisionError"):
+            benchmark.isolated(lambda: 1 / 0)
+
+
+
+class DistanceTests(unittest.TestCase):
+    def test_agree(self):
+        for a, b in benchmark.DISTANCE_SAMPLES:
+            distances = set(f(a, b)
+                            for f in benchmark.distance_functions.values())
+            self.assertEqual(len(distances), 1, (a, b))
+
+
+    def test_time(self):
+        timings = benchmark.time_distances(["packed", "loop"], number=10)
+        self.assertEqual(list(timings), ["packed", "loop"])
+        for seconds in timings.values():
+            self.assertEqual(len(seconds), len(benchmark.DISTANCE_SAMPLES))
+
+
+
+class CompareTests(unittest.TestCase):
+    def result(self, seconds=1.0, nodes=10, length=5, timed_out=False,
+               start="PIG"):
+        return benchmark.Result("pigsty", "a-star", False, True, start, "STY",
+                                seconds, nodes, nodes, 1, 0.0, None, length,
+                                timed_out)
+
+
+    def test_no_regression(self):
+        old = [self.result()]
+        new = [self.result(seconds=1.1, nodes=8)]
+        self.assertEqual(benchmark.compare(old, new), [])
+
+
+    def test_regressions(self):
+        old = [self.result()]
+        for new in [self.result(seconds=2.0), self.result(nodes=11),
+                    self.result(length=6), self.result(length=None),
+                    self.result(timed_out=True)]:
+            self.assertEqual(len(benchmark.compare(old, [new])), 1, new)
+
+
+    def test_only_common_queries(self):
+        old = [self.result()]
+        new = [self.result(), self.result(seconds=5.0, start="WIG")]
+        self.assertEqual(benchmark.compare(old, new), [])
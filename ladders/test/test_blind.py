@@ -5,7 +5,7 @@ Test cases for blind searching.
 import itertools
 import unittest
 
-from ladders import graph, blind
+from ladders import benchmark, blind, graph, search, wordgraph
 from ladders.test import memorynode
 
 
@@ -87,3 +87,209 @@ class DepthFirstSearchTests(unittest.TestCase, CommonSearchTestsMixin):
             self.assertTrue(step.readFrom)
 
         self.assertRaises(StopIteration, paths.next)
+
+
+    def test_lower_bound_order(self):
+        """
+        Tests that with a lower bound, the children with the smallest bound
+        are tried first.
+        """
+        root = graph.Node("root")
+        far, near = graph.create_branch("abcG"), graph.create_branch("xG")
+        root.children.update([far[0], near[0]])
+        bounds = {"root": 2, "a": 3, "b": 2, "c": 1, "x": 1, "G": 0}
+
+        def lower_bound(node):
+            return bounds[node.name]
+
+        paths = self.search_function(root, lambda n: n.name == "G",
+                                     lower_bound=lower_bound)
+        self.assertEqual([n.name for n in paths.next()], ["root", "x", "G"])
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_optimal_expansions(self):
+        """
+        Tests that searching for a shortest path on a sparse word graph
+        doesn't expand nodes again and again.
+        """
+        words = benchmark.synthetic_words(4, 600, seed=1)
+        source = wordgraph.WordGraph.from_words(words)
+        ladder_graph = graph.LadderGraph(words, source)
+        stats = search.SearchStats()
+        paths = self.search_function(ladder_graph.node("GDEF"),
+                                     lambda n: n.name == "FGAE",
+                                     lower_bound=graph.distance_to("FGAE"),
+                                     stats=stats)
+        self.assertEqual(len(list(paths)[-1]), 6)
+        # unguided, this expands tens of thousands of nodes
+        self.assertLess(stats.expanded, len(words))
+
+
+
+def link(*nodes):
+    """
+    Links consecutive nodes in both directions.
+    """
+    for first, second in zip(nodes, nodes[1:]):
+        first.children.add(second)
+        second.children.add(first)
+
+
+
+class BidirectionalSearchTests(unittest.TestCase):
+    def test_one_node(self):
+        r = graph.Node('root')
+        paths = blind.bidirectional_search(r, r)
+
+        self.assertEquals([r], paths.next())
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_two_nodes(self):
+        r, g = graph.Node('root'), graph.Node('goal')
+        link(r, g)
+        paths = blind.bidirectional_search(r, g)
+
+        self.assertEquals([r, g], paths.next())
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_two_disjunct_nodes(self):
+        r, g = graph.Node('root'), graph.Node('goal')
+        paths = blind.bidirectional_search(r, g)
+
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_shortest_branch(self):
+        r, g = graph.Node("r"), graph.Node("G")
+        long_branch = [graph.Node(i) for i in "ABCDEF"]
+        short_branch = [graph.Node(i) for i in "abc"]
+        link(r, *(long_branch + [g]))
+        link(r, *(short_branch + [g]))
+
+        paths = blind.bidirectional_search(r, g)
+        self.assertEquals([graph.Node(i) for i in "rabcG"], paths.next())
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_uneven_frontiers(self):
+        """
+        Tests that a wide start and a narrow target still meet on a shortest
+        path.
+        """
+        r, g = graph.Node("r"), graph.Node("G")
+        link(r, *([graph.Node(i) for i in "abcd"] + [g]))
+        for i in xrange(20):
+            link(r, graph.Node(("leaf", i)))
+
+        path = blind.bidirectional_search(r, g).next()
+        self.assertEquals([graph.Node(i) for i in "rabcdG"], path)
+
+
+
+def diamonds(count):
+    """
+    Makes a chain of diamonds: every step from one corner to the next can go
+    left or right, so there are 2 ** count shortest paths through it.
+    """
+    corners = [graph.Node(("corner", i)) for i in xrange(count + 1)]
+    for i in xrange(count):
+        for side in ("left", "right"):
+            link(corners[i], graph.Node((side, i)), corners[i + 1])
+    return corners[0], corners[-1]
+
+
+
+class AllShortestPathsSearchTests(unittest.TestCase, CommonSearchTestsMixin):
+    def setUp(self):
+        self.search_function = blind.all_shortest_paths_search
+
+
+    def test_diamonds(self):
+        r, g = diamonds(4)
+        paths = list(blind.all_shortest_paths_search(r, lambda n: n == g))
+
+        self.assertEqual(len(paths), 16)
+        self.assertEqual(len(set(map(tuple, paths))), 16)
+        for path in paths:
+            self.assertEqual((path[0], path[-1], len(path)), (r, g, 9))
+
+
+    def test_only_shortest(self):
+        r, g = diamonds(1)
+        link(r, *([graph.Node(i) for i in "abc"] + [g]))
+        paths = blind.all_shortest_paths_search(r, lambda n: n == g)
+
+        self.assertEqual(sorted(map(len, paths)), [3, 3])
+
+
+    def test_several_goals(self):
+        r = graph.Node("r")
+        link(r, graph.Node("a"), graph.Node("G1"))
+        link(r, graph.Node("b"), graph.Node("G2"))
+        link(r, graph.Node("c"), graph.Node("d"), graph.Node("G3"))
+        paths = blind.all_shortest_paths_search(r, lambda n: "G" in n.name)
+
+        self.assertEqual(sorted(path[-1].name for path in paths),
+                         ["G1", "G2"])
+
+
+    def test_stats(self):
+        r, g = diamonds(2)
+        stats = search.SearchStats()
+        paths = list(blind.all_shortest_paths_search(r, lambda n: n == g,
+                                                     stats=stats))
+
+        self.assertEqual(len(paths), 4)
+        self.assertEqual(stats.expanded, 6) # all but the goal
+        self.assertEqual(stats.generated, 6) # all but the root
+
+
+
+class ShortestPathsSearchTests(unittest.TestCase):
+    def test_one_node(self):
+        r = graph.Node('root')
+        paths = blind.shortest_paths_search(r, r)
+
+        self.assertEquals([r], paths.next())
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_two_disjunct_nodes(self):
+        r, g = graph.Node('root'), graph.Node('goal')
+        paths = blind.shortest_paths_search(r, g)
+
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_shortest_first(self):
+        r, g = diamonds(1)
+        link(r, *([graph.Node(i) for i in "abc"] + [g]))
+        paths = list(blind.shortest_paths_search(r, g))
+
+        self.assertEqual([len(path) for path in paths], [3, 3, 5])
+        self.assertEqual([graph.Node(i) for i in "abc"], paths[-1][1:4])
+
+
+    def test_simple_paths(self):
+        """
+        Tests that paths never visit a node twice, and that every path that
+        doesn't is found exactly once.
+        """
+        r, g = diamonds(3)
+        paths = list(blind.shortest_paths_search(r, g))
+
+        for path in paths:
+            self.assertEqual(len(set(path)), len(path))
+        self.assertEqual(len(set(map(tuple, paths))), len(paths))
+        self.assertEqual([len(path) for path in paths],
+                         sorted(len(path) for path in paths))
+        self.assertEqual(len([path for path in paths if len(path) == 7]), 8)
+
+
+    def test_lazy(self):
+        r, g = diamonds(20)
+        paths = itertools.islice(blind.shortest_paths_search(r, g), 5)
+        self.assertEqual([len(path) for path in paths], [41] * 5)
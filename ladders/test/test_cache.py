@@ -1,36 +1,163 @@
+import os
+import shutil
 import sqlite3
+import tempfile
 import unittest
 
 from ladders import cache
 
 
-class TestLikePatterns(unittest.TestCase):
-	def test_single_character(self):
-		patterns = cache._find_like_patterns("A")
-		self.assertEqual(patterns, [])
+class TestCache(unittest.TestCase):
+	def setUp(self):
+		self.db = sqlite3.connect(":memory:")
+		self.cache = cache.Cache(self.db)
 
 
-	def test_word(self):
-		patterns = cache._find_like_patterns("ABCDE")
-		self.assertEqual(patterns, ["A_CDE", "AB_DE", "ABC_E", "ABCD_"])
+	def test_cache(self):
+		c = self.cache
+		c.add_words(["AAA", "AAB", "AAC", "AAD", "ABB", "ABA"])
+		adjacent_words = set(c.find_adjacent_words("AAA"))
+		for negative in ["AAA", "ABB"]:
+			self.assertNotIn(negative, adjacent_words)
+		for positive in ["AAB", "AAC", "AAD", "ABA"]:
+			self.assertIn(positive, adjacent_words)
 
 
+	def test_edges(self):
+		self.cache.add_words(["AAA", "AAB", "ABB", "AAAA"])
+		(edges,) = self.db.execute("SELECT COUNT(*) FROM edges").fetchone()
+		self.assertEqual(edges, 4) # AAA-AAB and AAB-ABB, both ways
 
-class TestExactMatches(unittest.TestCase):
-	def test_word(self):
-		matches = set(cache._find_exact_matches("ABC"))
-		self.assertNotIn("ABC", matches)
-		self.assertEqual(len(matches), 25) # each letter except A
 
+	def test_incremental(self):
+		"""
+		Tests that words added later get edges to the words already there.
+		"""
+		self.cache.add_words(["AAA", "ABB"])
+		self.assertEqual(list(self.cache.find_adjacent_words("AAA")), [])
+		self.cache.add_words(["AAB", "AAA"])
+		self.assertEqual(set(self.cache.find_adjacent_words("AAA")),
+						 set(["AAB"]))
+		self.assertEqual(set(self.cache.find_adjacent_words("ABB")),
+						 set(["AAB"]))
 
 
-class TestCache(unittest.TestCase):
-	def test_cache(self):
+	def test_unknown_word(self):
+		self.cache.add_words(["AAA", "AAB", "ABB"])
+		adjacent_words = set(self.cache.find_adjacent_words("AAC"))
+		self.assertEqual(adjacent_words, set(["AAA", "AAB"]))
+
+
+	def test_words_are_strings(self):
+		self.cache.add_words(["AAA", "AAB"])
+		adjacent_word, = self.cache.find_adjacent_words("AAA")
+		self.assertIsInstance(adjacent_word, str)
+
+
+
+class TestIngestion(unittest.TestCase):
+	def setUp(self):
+		self.db = sqlite3.connect(":memory:")
+		self.cache = cache.Cache(self.db)
+
+
+	def count(self, table):
+		(count,) = self.db.execute(
+			"SELECT COUNT(*) FROM {}".format(table)).fetchone()
+		return count
+
+
+	def test_ingest(self):
+		self.assertTrue(self.cache.ingest(["AAA", "AAB", "ABB"]))
+		self.assertEqual(set(self.cache.find_adjacent_words("AAB")),
+						 set(["AAA", "ABB"]))
+		self.assertEqual(self.count("word_lists"), 1)
+
+
+	def test_unchanged_list_is_skipped(self):
+		self.cache.ingest(["AAA", "AAB"])
+		self.assertFalse(self.cache.ingest(["AAB", "AAA", "AAA"]))
+		self.assertTrue(self.cache.ingest(["AAA", "AAB", "ABB"]))
+		self.assertEqual(self.count("words"), 3)
+
+
+	def test_durability_is_restored(self):
+		(before,) = self.db.execute("PRAGMA synchronous").fetchone()
+		self.cache.ingest(["AAA", "AAB"])
+		(after,) = self.db.execute("PRAGMA synchronous").fetchone()
+		self.assertEqual(before, after)
+
+
+	def test_journal_mode_is_restored(self):
+		directory = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, directory)
+		db = sqlite3.connect(os.path.join(directory, "cache.db"))
+		self.addCleanup(db.close)
+
+		cache.Cache(db).ingest(["AAA", "AAB"])
+		(mode,) = db.execute("PRAGMA journal_mode").fetchone()
+		self.assertEqual(mode, "delete")
+
+
+	def test_failed_ingest_is_rolled_back(self):
+		self.cache.add_words(["AAA"])
+
+		def add_words(words):
+			self.db.execute("INSERT INTO words (word, length) VALUES ('AAB', 3)")
+			raise ValueError()
+
+		self.cache._add_words = add_words
+		self.assertRaises(ValueError, self.cache.ingest, ["AAB"])
+		self.assertEqual(self.count("words"), 1)
+		self.assertEqual(self.count("word_lists"), 0)
+
+
+	def test_remove_words(self):
+		self.cache.ingest(["AAA", "AAB", "ABB", "ABC"])
+		self.cache.remove_words(["AAB", "XYZ"])
+
+		self.assertEqual(list(self.cache.find_adjacent_words("AAA")), [])
+		self.assertEqual(list(self.cache.find_adjacent_words("ABB")), ["ABC"])
+		self.assertEqual(self.count("edges"), 2)
+		self.assertEqual(self.count("patterns"), 9)
+		self.assertEqual(set(self.cache.find_adjacent_words("AAB")),
+						 set(["AAA", "ABB"])) # through the remaining patterns
+
+
+	def test_removing_forgets_ingested_lists(self):
+		words = ["AAA", "AAB"]
+		self.cache.ingest(words)
+		self.cache.remove_words(["AAB"])
+		self.assertTrue(self.cache.ingest(words))
+		self.assertEqual(list(self.cache.find_adjacent_words("AAA")), ["AAB"])
+
+
+
+class TestMigration(unittest.TestCase):
+	def test_words_only_cache(self):
+		"""
+		Tests that caches from before edges were stored get their edges.
+		"""
 		db = sqlite3.connect(":memory:")
+		db.execute("CREATE TABLE words (word TEXT PRIMARY KEY)")
+		db.executemany("INSERT INTO words VALUES (?)", [("AAA",), ("AAB",)])
+
 		c = cache.Cache(db)
-		c.add_words(["AAA", "AAB", "AAC", "AAD", "ABB", "ABA"])
-		adjacent_words = set(c.find_adjacent_words("AAA"))
-		for negative in ["AAA", "ABB"]:
-			self.assertNotIn(negative, adjacent_words)
-		for positive in ["AAB", "AAC", "AAD", "ABA"]:
-			self.assertIn(positive, adjacent_words)
+		self.assertEqual(list(c.find_adjacent_words("AAA")), ["AAB"])
+
+
+	def test_version_one_cache(self):
+		"""
+		Tests that caches from before word lists were recorded keep their
+		words.
+		"""
+		db = sqlite3.connect(":memory:")
+		for statement in cache.SCHEMA[:-1]:
+			db.execute(statement)
+		db.execute("PRAGMA user_version=1")
+		cache.Cache(db).add_words(["AAA", "AAB"])
+		db.execute("PRAGMA user_version=1")
+
+		c = cache.Cache(db)
+		self.assertEqual(list(c.find_adjacent_words("AAA")), ["AAB"])
+		self.assertTrue(c.ingest(["AAA", "AAB"]))
@@ -0,0 +1,114 @@
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+
+from ladders import compiled, main, wordgraph, wordlist
+
+
+words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY", "CAT", "COT", "PIGS",
+         "WIGS"]
+
+
+class CompiledGraphTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "words.dict")
+        compiled.write(self.path, words + ["PIG"])
+        self.graph = compiled.CompiledGraph(self.path)
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def test_same_as_word_graph(self):
+        expected = wordgraph.WordGraph.from_words(sorted(set(words)))
+        self.assertEqual(list(self.graph.words), expected.words)
+        self.assertEqual(list(self.graph.components), list(expected.components))
+        for word_id in xrange(len(expected)):
+            self.assertEqual(list(self.graph.neighbors(word_id)),
+                             list(expected.neighbors(word_id)))
+
+
+    def test_words(self):
+        self.assertEqual(len(self.graph), len(words))
+        self.assertIn("PIGS", self.graph)
+        self.assertNotIn("PIGSTY", self.graph)
+        self.assertNotIn("DOG", self.graph)
+        self.assertEqual(self.graph.word(self.graph.id("WAG")), "WAG")
+        self.assertRaises(KeyError, self.graph.id, "DOG")
+
+
+    def test_neighbors(self):
+        self.assertEqual(set(self.graph.find_adjacent_words("WIG")),
+                         set(["PIG", "WAG"]))
+        self.assertEqual(set(self.graph.find_adjacent_words("PIT")),
+                         set(["PIG"]))
+        self.assertTrue(self.graph.connected("PIG", "STY"))
+        self.assertFalse(self.graph.connected("PIG", "CAT"))
+
+
+    def test_search(self):
+        ladder = main.find_ladder(main.algorithms["bidirectional"], "PIG",
+                                  "STY", self.graph.words, self.graph)
+        self.assertEqual([node.name for node in ladder],
+                         ["PIG", "WIG", "WAG", "WAY", "SAY", "STY"])
+
+
+    def test_load_words(self):
+        self.assertTrue(compiled.is_compiled(self.path))
+        self.assertEqual(wordlist.load_words(self.path, set([4])),
+                         ["PIGS", "WIGS"])
+
+        words, graph = main.load_word_list(self.path)
+        self.assertEqual(len(words), len(self.graph))
+        self.assertIsInstance(graph, compiled.CompiledGraph)
+
+
+    def test_not_compiled(self):
+        text = os.path.join(self.directory, "words")
+        with open(text, "w") as f:
+            f.write("PIG\nWIG\n")
+        self.assertFalse(compiled.is_compiled(text))
+        self.assertFalse(compiled.is_compiled("-"))
+        self.assertEqual(main.load_word_list(text), (["PIG", "WIG"], None))
+        self.assertRaises(compiled.DictionaryError, compiled.CompiledGraph,
+                          text)
+
+
+    def test_truncated(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data[:-1])
+        self.assertRaises(compiled.DictionaryError, compiled.CompiledGraph,
+                          self.path)
+
+
+    def test_invalid_files_are_closed(self):
+        """
+        Tests that the mapping is closed when a file turns out not to be a
+        compiled word list.
+        """
+        maps, real_mmap = [], mmap.mmap
+        def tracked_mmap(*args, **kwargs):
+            maps.append(real_mmap(*args, **kwargs))
+            return maps[-1]
+        mmap.mmap = tracked_mmap
+        self.addCleanup(setattr, mmap, "mmap", real_mmap)
+
+        with open(self.path, "r+b") as f:
+            f.write("NOT A DICTIONARY")
+        self.assertRaises(compiled.DictionaryError, compiled.CompiledGraph,
+                          self.path)
+        (mapping,) = maps
+        self.assertRaises(ValueError, len, mapping) # closed
+
+
+    def test_empty_word_list(self):
+        compiled.write(self.path, [])
+        graph = compiled.CompiledGraph(self.path)
+        self.assertEqual(len(graph), 0)
+        self.assertNotIn("PIG", graph)
@@ -3,9 +3,10 @@
 Test cases for the basic graph components.
 """
 import itertools
+import pickle
 import unittest
 
-from ladders import graph
+from ladders import graph, neighborcache
 
 
 class NodeTests(unittest.TestCase):
@@ -82,6 +83,18 @@ class NodeTests(unittest.TestCase):
         self.assertNotEquals(hash(self.n2), hash(self.n3))
 
 
+    def test_pickle(self):
+        """
+        Tests that nodes can be pickled with every protocol, even though
+        they have slots.
+        """
+        self.n1.children.add(self.n3)
+        for protocol in xrange(pickle.HIGHEST_PROTOCOL + 1):
+            node = pickle.loads(pickle.dumps(self.n1, protocol))
+            self.assertEquals(node, self.n1)
+            self.assertEquals(node.children, set([self.n3]))
+
+
 
 class BranchCreationTests(unittest.TestCase):
     def _test(self, identifiers):
@@ -239,3 +252,100 @@ class CycleTests(unittest.TestCase):
     def test_infinite_cycle(self):
         path = itertools.cycle([graph.Node(i) for i in xrange(3)])
         self.assertTrue(graph.has_cycle(path))
+
+
+
+class LadderGraphTests(unittest.TestCase):
+    words = ["PIG", "WIG", "WAG", "PIT", "STY"]
+
+
+    def test_nodes_are_interned(self):
+        ladder_graph = graph.LadderGraph(self.words)
+        self.assertIs(ladder_graph.node("PIG"), ladder_graph.node("PIG"))
+
+        (wig,) = [n for n in ladder_graph.node("WAG").children]
+        self.assertIs(wig, ladder_graph.node("WIG"))
+
+
+    def test_children(self):
+        ladder_graph = graph.LadderGraph(self.words)
+        children = ladder_graph.node("PIG").children
+        self.assertEqual(set(n.name for n in children), set(["WIG", "PIT"]))
+        self.assertIs(ladder_graph.node("PIG").children, children)
+        self.assertEqual((ladder_graph.neighbors.hits,
+                          ladder_graph.neighbors.misses), (0, 1))
+
+
+    def test_words_not_in_list(self):
+        ladder_graph = graph.LadderGraph(self.words)
+        children = ladder_graph.node("SIG").children
+        self.assertEqual(set(n.name for n in children),
+                         set(["PIG", "WIG"]))
+
+
+    def test_cache(self):
+        class Source(object):
+            lookups = 0
+
+            def find_adjacent_words(self, word):
+                self.lookups += 1
+                return ["WIG"] if word == "PIG" else []
+
+        source = Source()
+        ladder_graph = graph.LadderGraph(None, source)
+        node = ladder_graph.node("PIG")
+        self.assertEqual([n.name for n in node.children], ["WIG"])
+        self.assertEqual([n.name for n in node.children], ["WIG"])
+        self.assertEqual(source.lookups, 1)
+        self.assertIs(ladder_graph.neighbors, source)
+
+
+    def test_shared_neighbor_cache(self):
+        shared = neighborcache.NeighborCache(graph.LinearSource(self.words))
+        for _ in range(2):
+            ladder_graph = graph.LadderGraph(None, shared)
+            self.assertIs(ladder_graph.neighbors, shared)
+            ladder_graph.node("PIG").children
+        self.assertEqual((shared.hits, shared.misses), (1, 1))
+
+
+    def test_nodes_are_flyweights(self):
+        node = graph.LadderGraph(self.words).node("PIG")
+        self.assertFalse(hasattr(node, "__dict__"))
+
+
+    def test_pickle(self):
+        ladder_graph = graph.LadderGraph(self.words)
+        for protocol in xrange(pickle.HIGHEST_PROTOCOL + 1):
+            node = pickle.loads(pickle.dumps(ladder_graph.node("PIG"),
+                                             protocol))
+            self.assertEqual(node, ladder_graph.node("PIG"))
+            self.assertEqual(set(n.name for n in node.children),
+                             set(["WIG", "PIT"]))
+
+
+
+class LinearSourceTests(unittest.TestCase):
+    def test_no_copy(self):
+        words = ["PIG", "WIG"]
+        source = graph.LinearSource(words)
+        words.append("PIT")
+        self.assertEqual(sorted(source.find_adjacent_words("PIG")),
+                         ["PIT", "WIG"])
+
+
+    def test_words_that_cant_be_packed(self):
+        source = graph.LinearSource(["PIG", "WIG", "pig", "PIGS", "P1G"])
+        self.assertEqual(sorted(source.find_adjacent_words("PIG")),
+                         ["P1G", "WIG"])
+        self.assertEqual(list(source.find_adjacent_words("PIT")), ["PIG"])
+        self.assertEqual(sorted(source.find_adjacent_words("pit")), ["pig"])
+        self.assertEqual(sorted(source.find_adjacent_words("P1T")),
+                         ["P1G"])
+        self.assertEqual(list(source.find_adjacent_words("PIGSTY")), [])
+
+
+    def test_iterable(self):
+        source = graph.LinearSource(iter(["PIG", "WIG"]))
+        for _ in range(2):
+            self.assertEqual(list(source.find_adjacent_words("PIG")), ["WIG"])
@@ -2,7 +2,7 @@ import functools
 import itertools
 import unittest
 
-from ladders import graph, heuristic
+from ladders import graph, heuristic, search
 from ladders.test import memorynode
 
 
@@ -41,4 +41,269 @@ class HeuristicTest(unittest.TestCase):
         paths.next()
 
         for step in left[:-1]:
-            self.assertTrue(step.readFrom)
\ No newline at end of file
+            self.assertTrue(step.readFrom)
+
+
+class AStarTest(unittest.TestCase):
+    def setUp(self):
+        self.root, self.goal_node = graph.Node("r"), graph.Node("G")
+
+
+    def goal(self, node):
+        return node == self.goal_node
+
+
+    def test_one_node(self):
+        paths = heuristic.a_star_search(self.root, lambda n: True, lambda n: 0)
+        self.assertEqual([self.root], paths.next())
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_no_path(self):
+        paths = heuristic.a_star_search(self.root, self.goal, lambda n: 0)
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_shortest_path(self):
+        """
+        Tests that A* finds the shortest path, even when the heuristic
+        prefers a longer one.
+        """
+        short = graph.create_branch("abG")
+        long = graph.create_branch("ABCDG")
+        self.root.children.update([short[0], long[0]])
+
+        def _heuristic(node):
+            return 0 if node.name.isupper() else 1
+
+        path = heuristic.a_star_search(self.root, self.goal, _heuristic).next()
+        self.assertEqual([graph.Node(i) for i in "rabG"], path)
+
+
+    def test_expands_once(self):
+        """
+        Tests that nodes reachable along many paths are expanded once, and
+        that the heuristic is only computed once per node.
+        """
+        left, right, shared = map(memorynode.MemoryNode, ["a", "b", "c"])
+        self.root.children.update([left, right])
+        left.children.add(shared)
+        right.children.add(shared)
+        shared.reset()
+
+        estimated = []
+        def _heuristic(node):
+            estimated.append(node)
+            return 0
+
+        paths = heuristic.a_star_search(self.root, self.goal, _heuristic)
+        self.assertRaises(StopIteration, paths.next)
+        self.assertEqual(len(estimated), len(set(estimated)))
+        self.assertTrue(shared.readFrom)
+
+
+
+class IDAStarTest(unittest.TestCase):
+    def setUp(self):
+        self.root, self.goal_node = graph.Node("r"), graph.Node("G")
+
+
+    def goal(self, node):
+        return node == self.goal_node
+
+
+    def test_one_node(self):
+        paths = heuristic.ida_star_search(self.root, lambda n: True,
+                                          lambda n: 0)
+        self.assertEqual([self.root], paths.next())
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_no_path(self):
+        """
+        Tests that the search gives up, even when there are cycles.
+        """
+        a, b = graph.Node("a"), graph.Node("b")
+        self.root.children.add(a)
+        a.children.update([self.root, b])
+        b.children.update([a, self.root])
+
+        paths = heuristic.ida_star_search(self.root, self.goal, lambda n: 0)
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_shortest_path(self):
+        """
+        Tests that IDA* finds the shortest path, even when the heuristic
+        prefers a longer one.
+        """
+        short = graph.create_branch("abG")
+        long = graph.create_branch("ABCDG")
+        self.root.children.update([short[0], long[0]])
+
+        def _heuristic(node):
+            return 0 if node.name.isupper() else 1
+
+        path = heuristic.ida_star_search(self.root, self.goal,
+                                         _heuristic).next()
+        self.assertEqual([graph.Node(i) for i in "rabG"], path)
+
+
+    def test_memory(self):
+        """
+        Tests that only the current path is kept, by the stats.
+        """
+        branch = graph.create_branch("abcdeG")
+        self.root.children.add(branch[0])
+        for node in branch[:-1]:
+            node.children.update(graph.Node(node.name + str(i))
+                                 for i in range(5))
+
+        stats = search.SearchStats()
+        path = heuristic.ida_star_search(self.root, self.goal, lambda n: 0,
+                                         stats=stats).next()
+        self.assertEqual(len(path), 7)
+        self.assertEqual(stats.max_queue, 6)
+
+
+    def diamonds(self, count):
+        """
+        Chains diamonds after the root, so that there are 2 ** count paths
+        to the last node, and returns the last node.
+        """
+        top = self.root
+        for i in xrange(count):
+            bottom = graph.Node(i)
+            for side in "lr":
+                middle = graph.Node(side + str(i))
+                top.children.add(middle)
+                middle.children.add(bottom)
+            top = bottom
+        return top
+
+
+    def test_transpositions(self):
+        """
+        Tests that nodes reached again along paths that are no shorter are
+        not expanded again.
+        """
+        self.diamonds(10)
+        expanded = []
+        for table_size in (heuristic.DEFAULT_TABLE_SIZE, 0):
+            stats = search.SearchStats()
+            paths = heuristic.ida_star_search(self.root, self.goal,
+                                              lambda n: 0, stats=stats,
+                                              table_size=table_size)
+            self.assertRaises(StopIteration, paths.next)
+            expanded.append(stats.expanded)
+
+        # each of the 21 iterations expands each of the 31 nodes at most once
+        self.assertLessEqual(expanded[0], 21 * 31)
+        self.assertGreater(expanded[1], 2 ** 10)
+
+
+    def test_small_table(self):
+        """
+        Tests that the shortest path is still found once the table is full.
+        """
+        self.diamonds(6).children.add(self.goal_node)
+        shortcut = graph.create_branch("abcdefghijklG")
+        self.root.children.add(shortcut[0])
+
+        paths = heuristic.ida_star_search(self.root, self.goal, lambda n: 0,
+                                          table_size=3)
+        path = paths.next()
+        self.assertEqual(len(path), 14)
+        # the suspended search holds the table
+        self.assertEqual(len(paths.gi_frame.f_locals["table"]), 3)
+
+
+    def test_words(self):
+        """
+        Tests that only the words of the ladder found are turned into nodes,
+        and that the table stays within its size.
+        """
+        words = ["".join(letters)
+                 for letters in itertools.product("ABCD", repeat=3)]
+        ladders = heuristic.ida_star("AAA", "DDD", words)
+        ladder = ladders.next()
+        self.assertEqual(len(ladder), 4)
+        self.assertEqual((ladder[0].name, ladder[-1].name), ("AAA", "DDD"))
+
+        ladder_graph = ladders.gi_frame.f_locals["ladder_graph"]
+        self.assertEqual(len(ladder_graph._nodes), len(ladder))
+        table = ladders.gi_frame.f_locals["paths"].gi_frame.f_locals["table"]
+        self.assertLessEqual(len(table), heuristic.DEFAULT_TABLE_SIZE)
+
+
+
+class BeamTest(unittest.TestCase):
+    # AAB looks closest to BBB, but is a dead end
+    words = ["AAA", "AAB", "CAA", "CBA", "CBB", "BBB"]
+
+
+    def test_width(self):
+        """
+        Tests that only the best nodes of each depth are expanded.
+        """
+        root = graph.Node("r")
+        branches = map(memorynode.create_branch, ["aG", "bG", "cG", "dG"])
+        root.children.update(branch[0] for branch in branches)
+        for node in itertools.chain(*branches):
+            node.reset()
+
+        def goal(node):
+            return False
+
+        def _heuristic(path):
+            return ord(path[-1].name)
+
+        paths = heuristic.beam_search(root, goal, _heuristic, width=2)
+        self.assertRaises(StopIteration, paths.next)
+        self.assertEqual([branch[0].readFrom for branch in branches],
+                         [True, True, False, False])
+
+
+    def test_shared_child(self):
+        """
+        Tests that a node reached from two nodes of the same depth only
+        takes up one place in the beam.
+        """
+        root = graph.Node("r")
+        a, b, shared, c = map(graph.Node, "abzc")
+        root.children.update([a, b])
+        a.children.update([shared, c])
+        b.children.add(shared)
+        goal = graph.Node("G")
+        c.children.add(goal)
+
+        def _heuristic(path):
+            return {"z": 0, "c": 1}.get(path[-1].name, 2)
+
+        paths = heuristic.beam_search(root, goal.__eq__, _heuristic, width=2)
+        self.assertEqual(paths.next(), [root, a, c, goal])
+
+
+    def test_invalid_width(self):
+        self.assertRaises(ValueError, heuristic.beam_search, graph.Node("r"),
+                          lambda n: True, lambda p: 0, width=0)
+
+
+    def _names(self, ladders):
+        return [[node.name for node in ladder] for ladder in ladders]
+
+
+    def test_narrow_beam(self):
+        ladders = heuristic.beam("AAA", "BBB", self.words, width=1)
+        self.assertEqual(self._names(ladders), [])
+
+        ladders = heuristic.beam("AAA", "BBB", self.words, width=2)
+        self.assertEqual(self._names(ladders),
+                         [["AAA", "CAA", "CBA", "CBB", "BBB"]])
+
+
+    def test_fallback(self):
+        ladders = heuristic.beam("AAA", "BBB", self.words, width=1,
+                                 fallback=True)
+        self.assertEqual(self._names(ladders),
+                         [["AAA", "CAA", "CBA", "CBB", "BBB"]])
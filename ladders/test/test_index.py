@@ -0,0 +1,47 @@
+import unittest
+
+from ladders import index
+
+
+class TestWildcardPatterns(unittest.TestCase):
+    def test_single_character(self):
+        self.assertEqual(index.wildcard_patterns("A"), ["_"])
+
+
+    def test_word(self):
+        patterns = index.wildcard_patterns("PIG")
+        self.assertEqual(patterns, ["_IG", "P_G", "PI_"])
+
+
+
+class TestWildcardIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = index.WildcardIndex(["AAA", "AAB", "AAC", "ABB", "ABA"])
+
+
+    def test_adjacent_words(self):
+        adjacent_words = set(self.index.find_adjacent_words("AAA"))
+        self.assertEqual(adjacent_words, set(["AAB", "AAC", "ABA"]))
+
+
+    def test_unindexed_word(self):
+        adjacent_words = set(self.index.find_adjacent_words("AAD"))
+        self.assertEqual(adjacent_words, set(["AAA", "AAB", "AAC"]))
+
+
+    def test_different_lengths(self):
+        self.index.add_words(["AA", "AAAA"])
+        adjacent_words = set(self.index.find_adjacent_words("AAA"))
+        self.assertEqual(adjacent_words, set(["AAB", "AAC", "ABA"]))
+
+
+    def test_duplicates(self):
+        self.index.add_words(["AAB", "AAB"])
+        self.assertEqual(len(self.index), 5)
+        adjacent_words = list(self.index.find_adjacent_words("AAA"))
+        self.assertEqual(sorted(adjacent_words), ["AAB", "AAC", "ABA"])
+
+
+    def test_contains(self):
+        self.assertIn("AAA", self.index)
+        self.assertNotIn("AAD", self.index)
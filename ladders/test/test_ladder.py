@@ -1,7 +1,7 @@
 import functools
 import unittest
 
-from ladders import heuristic, naive
+from ladders import heuristic, index, naive
 
 red_herrings = {
     3: ['CAD', 'TRY', 'POT', 'NOT', 'ROT', 'TOT', 'COT'],
@@ -41,7 +41,8 @@ def add_sample_tests(test_case):
         for f in sample_tests:
             base_name = f.__name__.lstrip("_test_")
             name = "test_{}_{}_{}".format(base_name, start, end)
-            setattr(test_case, name, lambda self: f(self, words))
+            setattr(test_case, name,
+                    lambda self, f=f, words=words: f(self, words))
 
     return test_case
 
@@ -51,6 +52,16 @@ def sample_test(f):
     return f
 
 
+def indexed(find_ladders):
+    """
+    Makes a ladder finding function use a wildcard index of the word list.
+    """
+    def find_indexed_ladders(start, target, words):
+        return find_ladders(start, target, words, index.WildcardIndex(words))
+
+    return staticmethod(find_indexed_ladders)
+
+
 
 @add_sample_tests
 class _LadderTest(object):
@@ -87,5 +98,83 @@ class DepthFirstTest(_LadderTest, unittest.TestCase):
 
 
 
+class OptimalBreadthFirstTest(_LadderTest, unittest.TestCase):
+    find_ladders = staticmethod(
+        functools.partial(naive.breadth_first, optimal=True))
+
+
+
+class OptimalDepthFirstTest(_LadderTest, unittest.TestCase):
+    find_ladders = staticmethod(
+        functools.partial(naive.depth_first, optimal=True))
+
+
+
+class BidirectionalTest(_LadderTest, unittest.TestCase):
+    find_ladders = staticmethod(naive.bidirectional)
+
+
+
 class HeuristicTest(_LadderTest, unittest.TestCase):
     find_ladders = staticmethod(heuristic.find_ladders)
+
+
+
+class IndexedBreadthFirstTest(_LadderTest, unittest.TestCase):
+    find_ladders = indexed(naive.breadth_first)
+
+
+
+class IndexedDepthFirstTest(_LadderTest, unittest.TestCase):
+    find_ladders = indexed(naive.depth_first)
+
+
+
+class IndexedBidirectionalTest(_LadderTest, unittest.TestCase):
+    find_ladders = indexed(naive.bidirectional)
+
+
+
+class IndexedHeuristicTest(_LadderTest, unittest.TestCase):
+    find_ladders = indexed(heuristic.find_ladders)
+
+
+
+class OptimalHeuristicTest(_LadderTest, unittest.TestCase):
+    find_ladders = staticmethod(
+        functools.partial(heuristic.find_ladders, optimal=True))
+
+
+
+class AStarTest(_LadderTest, unittest.TestCase):
+    find_ladders = staticmethod(heuristic.a_star)
+
+
+
+class IndexedAStarTest(_LadderTest, unittest.TestCase):
+    find_ladders = indexed(heuristic.a_star)
+
+
+
+class IDAStarTest(_LadderTest, unittest.TestCase):
+    find_ladders = staticmethod(heuristic.ida_star)
+
+
+
+class IndexedIDAStarTest(_LadderTest, unittest.TestCase):
+    find_ladders = indexed(heuristic.ida_star)
+
+
+
+class BeamTest(_LadderTest, unittest.TestCase):
+    find_ladders = staticmethod(heuristic.beam)
+
+
+
+class IndexedBeamTest(_LadderTest, unittest.TestCase):
+    find_ladders = indexed(heuristic.beam)
+
+
+
+class NarrowBeamTest(_LadderTest, unittest.TestCase):
+    find_ladders = staticmethod(functools.partial(heuristic.beam, width=1))
@@ -0,0 +1,99 @@
+import itertools
+import unittest
+
+from ladders import graph, heuristic, landmarks, main, search, wordgraph
+
+
+class LandmarksTests(unittest.TestCase):
+    # a single chain, AAB - AAA - CAA - CBA - CBB - BBB, that detours: AAA
+    # and BBB differ in three letters, but are four steps apart
+    words = ["AAA", "AAB", "CAA", "CBA", "CBB", "BBB", "XYZ"]
+
+
+    def setUp(self):
+        self.graph = wordgraph.WordGraph.from_words(self.words)
+
+
+    def _landmarks(self, count):
+        return landmarks.Landmarks(self.graph, count)
+
+
+    def _distance(self, start, target):
+        goal = self.graph.id(target)
+        for node, _, depth in search.breadth_first_layers(
+                self.graph.id(start), self.graph.neighbors):
+            if node == goal:
+                return depth
+        return None
+
+
+    def test_farthest_points(self):
+        """
+        Tests that landmarks are picked at the ends of the chain, and not in
+        the smaller component.
+        """
+        ends = set(self.graph.path_words(self._landmarks(2).landmarks))
+        self.assertEqual(ends, set(["AAB", "BBB"]))
+
+
+    def test_count(self):
+        self.assertEqual(len(self._landmarks(3).landmarks), 3)
+        self.assertEqual(len(self._landmarks(100).landmarks), 6)
+        self.assertEqual(self._landmarks(0).landmarks, [])
+
+
+    def test_distances(self):
+        lm = self._landmarks(1)
+        self.assertEqual(self.graph.path_words(lm.landmarks), ["BBB"])
+        distances = lm.distances[0]
+        self.assertEqual(distances[self.graph.id("AAA")], 4)
+        self.assertEqual(distances[self.graph.id("XYZ")],
+                         landmarks.UNREACHABLE)
+
+
+    def test_detour(self):
+        distance_to_bbb = self._landmarks(2).distances_to("BBB")
+        self.assertEqual(graph.distance("AAA", "BBB"), 3)
+        self.assertEqual(distance_to_bbb("AAA"), 4)
+
+
+    def test_admissible(self):
+        """
+        Tests that the bound is never more than the actual distance, and
+        never less than the number of differing letters.
+        """
+        lm = self._landmarks(2)
+        chain = self.words[:-1]
+        for start, target in itertools.product(chain, repeat=2):
+            bound = lm.distances_to(target)(start)
+            self.assertLessEqual(bound, self._distance(start, target))
+            self.assertGreaterEqual(bound, graph.distance(start, target))
+
+
+    def test_unknown_words(self):
+        lm = self._landmarks(2)
+        self.assertEqual(lm.distances_to("BBB")("ABC"), 2)
+        self.assertEqual(lm.distances_to("ABC")("AAA"), 2)
+        self.assertEqual(lm.distances_to("XYZ")("AAA"), 3)
+
+
+    def test_neighbor_source(self):
+        lm = self._landmarks(2)
+        self.assertEqual(set(lm.find_adjacent_words("CAA")),
+                         set(["AAA", "CBA"]))
+        self.assertFalse(lm.connected("AAA", "XYZ"))
+
+        stats = search.SearchStats()
+        ladder = heuristic.a_star("AAA", "BBB", self.words, lm,
+                                  stats=stats).next()
+        self.assertEqual([node.name for node in ladder],
+                         ["AAA", "CAA", "CBA", "CBB", "BBB"])
+        # the bound is exact, so only the ladder itself is expanded
+        self.assertEqual(stats.expanded, 4)
+
+
+    def test_make_neighbor_source(self):
+        source = main.make_neighbor_source(self.words, None,
+                                           landmark_count=2)
+        self.assertIsInstance(source, landmarks.Landmarks)
+        self.assertEqual(len(source.landmarks), 2)
@@ -0,0 +1,192 @@
+import logging
+import os
+import shutil
+import StringIO
+import sys
+import tempfile
+import unittest
+
+from ladders import main, search, wordgraph
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+
+class ParsePairsTests(unittest.TestCase):
+    def test_pairs(self):
+        lines = ["pig sty\n", "\n", "# comment\n", "RICH  POOR\n"]
+        pairs = list(main.parse_pairs(lines))
+        self.assertEqual(pairs, [("PIG", "STY"), ("RICH", "POOR")])
+
+
+    def test_malformed(self):
+        lines = ["PIG\n", "PIG STY WIG\n", "COLD WARM\n"]
+        records = _Records()
+        main.log.addHandler(records)
+        try:
+            pairs = list(main.parse_pairs(lines))
+        finally:
+            main.log.removeHandler(records)
+
+        self.assertEqual(pairs, [("COLD", "WARM")])
+        self.assertEqual([record.getMessage() for record in records.records],
+                         ["skipping line 1: expected START TARGET, got "
+                          "'PIG'",
+                          "skipping line 2: expected START TARGET, got "
+                          "'PIG STY WIG'"])
+
+
+
+class BatchModeTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.words = self._write("words", ["PIG", "WIG", "WAG", "WAY", "SAY",
+                                           "STY", "CAT", "SWIG", "SWAG"])
+        self.handlers = logging.root.handlers[:]
+
+
+    def tearDown(self):
+        logging.root.handlers[:] = self.handlers
+        shutil.rmtree(self.directory)
+
+
+    def _write(self, name, lines):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as f:
+            f.write("".join(line + "\n" for line in lines))
+        return path
+
+
+    def _main(self, *argv):
+        stdout, sys.stdout = sys.stdout, StringIO.StringIO()
+        argv, sys.argv = sys.argv, ["ladder"] + list(argv)
+        try:
+            main.main()
+            return sys.stdout.getvalue()
+        finally:
+            sys.stdout, sys.argv = stdout, argv
+
+
+    def test_batch(self):
+        pairs = self._write("pairs", ["PIG STY", "PIG CAT", "SWIG SWAG"])
+        output = self._main("-w", self.words, "-b", pairs, "-o")
+        self.assertEqual(output.splitlines(),
+                         ["PIG STY 6", "PIG CAT 0", "SWIG SWAG 2"])
+
+
+    def test_missing_word_list(self):
+        missing = os.path.join(self.directory, "missing")
+        stderr, sys.stderr = sys.stderr, StringIO.StringIO()
+        try:
+            with self.assertRaises(SystemExit) as raised:
+                self._main("-w", missing, "PIG", "STY")
+            error = sys.stderr.getvalue()
+        finally:
+            sys.stderr = stderr
+
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("can't open '{}'".format(missing), error)
+
+
+
+class FindLadderTests(unittest.TestCase):
+    words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY", "PAG", "PAY"]
+
+
+    def _find_ladder(self, start, target, optimal):
+        algorithm = main.algorithms["depth-first"]
+        return main.find_ladder(algorithm, start, target, self.words, None,
+                                optimal)
+
+
+    def test_optimal(self):
+        ladder = self._find_ladder("PIG", "STY", True)
+        self.assertEqual(len(ladder), 5)
+
+
+    def test_no_ladder(self):
+        self.assertEqual(self._find_ladder("PIG", "CAT", False), None)
+        self.assertEqual(self._find_ladder("PIG", "CAT", True), None)
+
+
+    def test_different_lengths(self):
+        self.assertEqual(self._find_ladder("PIG", "PIGS", False), None)
+
+
+    def test_different_components(self):
+        """
+        Tests that words the word graph knows are not connected are rejected
+        without searching.
+        """
+        def algorithm(*args, **kwargs):
+            self.fail("searched for a ladder that can't exist")
+
+        source = wordgraph.WordGraph.from_words(self.words + ["CAT", "COT"])
+        ladder = main.find_ladder(algorithm, "PIG", "CAT", self.words, source)
+        self.assertEqual(ladder, None)
+
+
+    def test_stats(self):
+        for name in sorted(main.algorithms):
+            stats = search.SearchStats()
+            source = wordgraph.WordGraph.from_words(self.words)
+            ladder = main.find_ladder(main.algorithms[name], "PIG", "STY",
+                                      self.words, source, False, stats)
+            self.assertGreaterEqual(stats.expanded, len(ladder) - 2, name)
+            self.assertEqual(stats.lookups, stats.expanded, name)
+
+
+
+class FindShortestLaddersTests(unittest.TestCase):
+    # two ways from PIG to WAG, and a longer way around through PAY
+    words = ["PIG", "WIG", "PAG", "WAG", "PAY", "WAY", "SAY", "STY", "CAT"]
+
+
+    def setUp(self):
+        self.source = wordgraph.WordGraph.from_words(self.words)
+
+
+    def _names(self, ladders):
+        return [main.format_words(ladder) for ladder in ladders]
+
+
+    def test_all_shortest(self):
+        ladders = main.find_shortest_ladders("PIG", "WAY", self.words,
+                                             self.source)
+        self.assertEqual(sorted(self._names(ladders)),
+                         ["PIG PAG PAY WAY", "PIG PAG WAG WAY",
+                          "PIG WIG WAG WAY"])
+
+
+    def test_count(self):
+        names = self._names(main.find_shortest_ladders("PIG", "WAG",
+                                                       self.words,
+                                                       self.source, 3))
+        self.assertEqual(sorted(names[:2]), ["PIG PAG WAG", "PIG WIG WAG"])
+        self.assertEqual(names[2], "PIG PAG PAY WAY WAG")
+
+
+    def test_no_ladder(self):
+        for count in (None, 3):
+            ladders = main.find_shortest_ladders("PIG", "CAT", self.words,
+                                                 self.source, count)
+            self.assertEqual(list(ladders), [])
+
+
+
+class FormatLadderTests(unittest.TestCase):
+    def test_ladder(self):
+        line = main.format_ladder("PIG", "STY", ["PIG", "WIG", "STY"])
+        self.assertEqual(line, "PIG STY 3")
+
+
+    def test_no_ladder(self):
+        self.assertEqual(main.format_ladder("PIG", "CAT", None), "PIG CAT 0")
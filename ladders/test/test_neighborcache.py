@@ -0,0 +1,79 @@
+import pickle
+import unittest
+
+from ladders import neighborcache
+
+
+class Source(object):
+    def __init__(self):
+        self.lookups = []
+
+
+    def find_adjacent_words(self, word):
+        self.lookups.append(word)
+        return iter([word.lower()])
+
+
+    def connected(self, start, target):
+        return True
+
+
+
+class NeighborCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.source = Source()
+        self.cache = neighborcache.NeighborCache(self.source, maxsize=2)
+
+
+    def test_hits_and_misses(self):
+        self.assertEqual(self.cache.find_adjacent_words("PIG"), ("pig",))
+        self.assertEqual(self.cache.find_adjacent_words("PIG"), ("pig",))
+        self.assertEqual(self.source.lookups, ["PIG"])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+
+    def test_evicts_least_recently_used(self):
+        for word in ["PIG", "WIG", "PIG", "STY"]:
+            self.cache.find_adjacent_words(word)
+        self.assertEqual(len(self.cache), 2)
+
+        self.cache.find_adjacent_words("PIG")
+        self.cache.find_adjacent_words("WIG")
+        self.assertEqual(self.source.lookups, ["PIG", "WIG", "STY", "WIG"])
+
+
+    def test_unbounded(self):
+        cache = neighborcache.NeighborCache(self.source, maxsize=None)
+        for word in ["PIG", "WIG", "STY", "PIG"]:
+            cache.find_adjacent_words(word)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.hits, 1)
+
+
+    def test_disabled(self):
+        cache = neighborcache.NeighborCache(self.source, maxsize=0)
+        cache.find_adjacent_words("PIG")
+        cache.find_adjacent_words("PIG")
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.misses, 2)
+
+
+    def test_clear(self):
+        self.cache.find_adjacent_words("PIG")
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+        self.cache.find_adjacent_words("PIG")
+        self.assertEqual(self.source.lookups, ["PIG", "PIG"])
+
+
+    def test_passes_other_attributes_through(self):
+        self.assertTrue(self.cache.connected("PIG", "STY"))
+
+
+    def test_pickle(self):
+        self.cache.find_adjacent_words("PIG")
+        cache = pickle.loads(pickle.dumps(self.cache))
+        self.assertEqual((len(cache), cache.maxsize), (0, 2))
+        self.assertEqual(cache.find_adjacent_words("PIG"), ("pig",))
+        self.assertTrue(cache.connected("PIG", "STY"))
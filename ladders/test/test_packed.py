@@ -0,0 +1,123 @@
+import unittest
+
+from ladders import graph, packed
+
+
+def zip_distance(a, b):
+    return sum(x != y for (x, y) in zip(a, b))
+
+
+
+class TestEncoding(unittest.TestCase):
+    def test_round_trip(self):
+        for word in ["A", "PIG", "ZZZ", "ABCDEFGHIJKLMNOPQRSTUVWXYZ"]:
+            self.assertEqual(packed.decode(packed.encode(word), len(word)),
+                             word)
+
+
+    def test_first_letter_in_lowest_lane(self):
+        self.assertEqual(packed.encode("BA"), 2 | 1 << packed.BITS)
+
+
+    def test_lowercase_is_not_encodable(self):
+        self.assertRaises(ValueError, packed.encode, "pig")
+        self.assertIs(packed.try_encode("pig"), None)
+
+
+    def test_non_words_are_not_encodable(self):
+        self.assertIs(packed.try_encode("P1G"), None)
+        self.assertIs(packed.try_encode(["P", "I", "G"]), None)
+
+
+
+class TestMemo(unittest.TestCase):
+    def setUp(self):
+        self.memo_size = packed.MEMO_SIZE
+        packed._codes.clear()
+
+
+    def tearDown(self):
+        packed.MEMO_SIZE = self.memo_size
+        packed._codes.clear()
+
+
+    def test_bounded(self):
+        packed.MEMO_SIZE = 3
+        for word in ["PIG", "WIG", "WAG", "WAY", "SAY", "STY"]:
+            self.assertEqual(packed.decode(packed.try_encode(word), 3), word)
+            self.assertLessEqual(len(packed._codes), 3)
+
+
+    def test_failures_are_not_memoized(self):
+        self.assertIs(packed.try_encode("pig"), None)
+        self.assertIs(packed.try_encode("P1G"), None)
+        self.assertEqual(packed._codes, {})
+
+
+    def test_not_memoizing(self):
+        code = packed.try_encode("PIG", memoize=False)
+        self.assertEqual(packed.decode(code, 3), "PIG")
+        self.assertEqual(packed._codes, {})
+
+
+
+class TestDistance(unittest.TestCase):
+    pairs = [
+        ("PIG", "PIG"), ("PIG", "WIG"), ("PIG", "PIT"), ("PIG", "STY"),
+        ("ABCDEFGHIJKLMNO", "ABCDEFGHIJKLMNP"),
+        ("ABCDEFGHIJKLMNO", "ONMLKJIHGFEDCBA"),
+        ("AZAZAZAZAZAZAZ", "ZAZAZAZAZAZAZA"),
+    ]
+
+
+    def test_distance_matches_letter_comparison(self):
+        for a, b in self.pairs:
+            mask = packed.lane_mask(len(a))
+            distance = packed.distance(packed.encode(a), packed.encode(b), mask)
+            self.assertEqual(distance, zip_distance(a, b), (a, b))
+
+
+    def test_adjacent(self):
+        for a, b in self.pairs:
+            mask = packed.lane_mask(len(a))
+            adjacent = packed.adjacent(packed.encode(a), packed.encode(b), mask)
+            self.assertEqual(adjacent, zip_distance(a, b) == 1, (a, b))
+
+
+    def test_adjacent_words(self):
+        words = ["PIG", "WIG", "PIT", "STY", "PIG", "PIE"]
+        entries = [(packed.encode(word), word) for word in words]
+        found = packed.adjacent_words(entries, packed.encode("PIG"),
+                                      packed.lane_mask(3))
+        self.assertEqual(found, ["WIG", "PIT", "PIE"])
+
+
+    def test_lane_mask(self):
+        self.assertEqual(packed.lane_mask(0), 0)
+        self.assertEqual(packed.lane_mask(2), 1 | 1 << packed.BITS)
+
+
+
+class TestGraphDistance(unittest.TestCase):
+    def test_packed_and_unpacked_words_agree(self):
+        self.assertEqual(graph.distance("PIG", "STY"), 3)
+        self.assertEqual(graph.distance("pig", "sty"), 3)
+        self.assertEqual(graph.distance("PIG", "pig"), 3)
+
+
+    def test_different_lengths_compare_common_prefix(self):
+        self.assertEqual(graph.distance("PIG", "PITS"), 1)
+
+
+    def test_adjacent_requires_same_length(self):
+        self.assertTrue(graph.adjacent("PIG", "PIT"))
+        self.assertFalse(graph.adjacent("PIG", "PITS"))
+        self.assertFalse(graph.adjacent("PIG", "PIG"))
+        self.assertTrue(graph.adjacent("pig", "pit"))
+
+
+    def test_distance_to(self):
+        distance_to = graph.distance_to("PIG")
+        self.assertEqual(distance_to(graph.Node("STY")), 3)
+        self.assertEqual(distance_to(graph.Node("sty")), 3)
+        self.assertEqual(distance_to(graph.Node("PIGS")), 0)
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+import unittest
+
+from ladders import parallel
+
+
+class ParallelMapTests(unittest.TestCase):
+    def test_single_job(self):
+        results = parallel.imap(lambda x: x * 2, xrange(5), 1)
+        self.assertEqual(list(results), [0, 2, 4, 6, 8])
+
+
+    def test_order(self):
+        """
+        Tests that results come back in the order of the items, even from
+        several workers.
+        """
+        results = parallel.imap(lambda x: x * 2, xrange(50), 3)
+        self.assertEqual(list(results), range(0, 100, 2))
+
+
+    def test_closure(self):
+        """
+        Tests that the workers can use data the function closes over, which
+        can't be pickled.
+        """
+        squares = dict((i, i * i) for i in xrange(10))
+        unpicklable = lambda: None
+        results = parallel.imap(lambda i: (squares[i], unpicklable()),
+                                xrange(10), 2)
+        self.assertEqual([square for square, _ in results],
+                         [i * i for i in xrange(10)])
+
+
+
+class WorkerPoolTests(unittest.TestCase):
+    def tearDown(self):
+        self.pool.close()
+
+
+    def test_apply(self):
+        self.pool = parallel.WorkerPool(lambda x: x * 2, 2)
+        self.assertEqual([self.pool.apply(i) for i in xrange(5)],
+                         [0, 2, 4, 6, 8])
+
+
+    def test_in_process(self):
+        self.pool = parallel.WorkerPool(lambda x: x * 2, 0)
+        self.assertEqual(self.pool.apply(21), 42)
+
+
+    def test_exception(self):
+        self.pool = parallel.WorkerPool(lambda x: 1 / x, 1)
+        self.assertRaises(ZeroDivisionError, self.pool.apply, 0)
+        self.assertEqual(self.pool.apply(1), 1)
+
+
+    def test_timeout(self):
+        """
+        Tests that a worker that takes too long is replaced.
+        """
+        def function(x):
+            while x:
+                pass
+            return x
+
+        self.pool = parallel.WorkerPool(function, 1)
+        self.assertRaises(parallel.Timeout, self.pool.apply, 1, 0.1)
+        self.assertEqual(self.pool.apply(0), 0)
+
+
+    def test_dead_worker(self):
+        """
+        Tests that a worker that dies is replaced.
+        """
+        def function(x):
+            if x:
+                os._exit(1)
+            return x
+
+        self.pool = parallel.WorkerPool(function, 1)
+        self.assertRaises(parallel.WorkerError, self.pool.apply, 1)
+        self.assertEqual(self.pool.apply(0), 0)
+        self.assertEqual(len(self.pool._workers), 1)
+
+
+    def test_replaced_worker_time_limit(self):
+        """
+        Tests that a worker started from another thread, as the server's
+        handler threads do, still enforces time limits.
+        """
+        def function(x):
+            try:
+                with parallel.time_limit(None if x == "hang" else 0.05):
+                    while x:
+                        pass
+            except parallel.Timeout:
+                return "limited"
+            return x
+
+        self.pool = parallel.WorkerPool(function, 1)
+        thread = threading.Thread(target=self.assertRaises,
+                                  args=(parallel.Timeout, self.pool.apply,
+                                        "hang", 0.1))
+        thread.start()
+        thread.join()
+        self.assertEqual(self.pool.apply(1, 5), "limited")
+
+
+    def test_threads(self):
+        """
+        Tests that workers are replaced correctly when several threads time
+        out at once.
+        """
+        def function(x):
+            while x:
+                pass
+            return x
+
+        self.pool = parallel.WorkerPool(function, 2)
+        threads = [threading.Thread(target=self.assertRaises,
+                                    args=(parallel.Timeout, self.pool.apply,
+                                          1, 0.1))
+                   for _ in xrange(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.pool._workers), 2)
+        self.assertEqual([self.pool.apply(0) for _ in xrange(3)], [0] * 3)
+
+
+
+class TimeLimitTests(unittest.TestCase):
+    def test_time_limit(self):
+        def spin():
+            with parallel.time_limit(0.05):
+                while True:
+                    pass
+
+        self.assertRaises(parallel.Timeout, spin)
+
+
+    def test_no_limit(self):
+        with parallel.time_limit(None):
+            pass
+
+
+    def test_other_thread(self):
+        """
+        Tests that there is no limit in threads that can't handle signals.
+        """
+        finished = []
+
+        def wait():
+            with parallel.time_limit(0.01):
+                time.sleep(0.05)
+            finished.append(True)
+
+        thread = threading.Thread(target=wait)
+        thread.start()
+        thread.join()
+        self.assertEqual(finished, [True])
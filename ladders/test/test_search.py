@@ -4,6 +4,7 @@ Tests for generic test tools.
 import unittest
 
 from ladders import graph, search
+from ladders.test import memorynode
 
 
 class AcyclicExtendedPathTests(unittest.TestCase):
@@ -74,4 +75,140 @@ class AcyclicExtendedPathTests(unittest.TestCase):
         badPath = [r, b1[0], b1[1], b2[0], b2[1]]
         aep = list(search._acyclic_extended_paths(badPath))
         self.assertEquals(len(aep), 1) # 2 children, 1 cycle
-        self.assertEquals(aep[0], badPath + [b2[2]])
\ No newline at end of file
+        self.assertEquals(aep[0], badPath + [b2[2]])
+
+
+class BranchAndBoundTests(unittest.TestCase):
+    def setUp(self):
+        self.root, self.goal_node = graph.Node("r"), graph.Node("G")
+
+
+    def goal(self, node):
+        return node == self.goal_node
+
+
+    def _search(self, lower_bound=lambda node: 0):
+        expander = lambda extensions, queue: queue.extendleft(extensions)
+        return search._branch_and_bound_search(self.root, self.goal,
+                                               expander, lower_bound)
+
+
+    def test_one_node(self):
+        paths = search._branch_and_bound_search(self.root, lambda n: True,
+                                                None, lambda n: 0)
+        self.assertEquals([self.root], paths.next())
+        self.assertRaises(StopIteration, paths.next)
+
+
+    def test_successively_shorter(self):
+        """
+        Tests that a depth-first branch and bound search reports shorter and
+        shorter paths, ending with the shortest one.
+        """
+        for names in ["ABCDEFG", "abcG", "xyzwG"]:
+            self.root.children.add(graph.create_branch(names)[0])
+
+        lengths = [len(path) for path in self._search()]
+        self.assertEquals(lengths, sorted(set(lengths), reverse=True))
+        self.assertEquals(lengths[-1], 5)
+
+
+    def test_shorter_path_to_visited_node(self):
+        """
+        Tests that a node is expanded again when it is reached along a
+        shorter path.
+        """
+        shared = graph.create_branch("sG")
+        long_branch = graph.create_branch("ABC")
+        long_branch[-1].children.add(shared[0])
+        short_branch = graph.create_branch("a")
+        short_branch[-1].children.add(shared[0])
+        self.root.children.update([long_branch[0], short_branch[0]])
+
+        path = list(self._search())[-1]
+        self.assertEquals([graph.Node(i) for i in "rasG"], path)
+
+
+    def test_pruning(self):
+        """
+        Tests that partial paths that can not beat the best path so far are
+        not expanded.
+        """
+        short_branch = graph.create_branch("aG")
+        long_branch = memorynode.create_branch("ABCDEFG")
+        self.root.children.update([short_branch[0], long_branch[0]])
+        for node in long_branch:
+            node.reset()
+
+        def lower_bound(node):
+            return 0 if node == self.goal_node else 1
+
+        expander = lambda extensions, queue: queue.extend(extensions)
+        paths = search._branch_and_bound_search(self.root, self.goal,
+                                                expander, lower_bound)
+
+        self.assertEquals([graph.Node(i) for i in "raG"], list(paths)[-1])
+        self.assertFalse(long_branch[1].readFrom)
+
+
+
+class BreadthFirstLayersTests(unittest.TestCase):
+    def test_root(self):
+        r = graph.Node("r")
+        self.assertEquals(list(search.breadth_first_layers(r)),
+                          [(r, None, 0)])
+
+
+    def test_depths_and_parents(self):
+        r = graph.Node("r")
+        long_branch, short_branch = graph.create_branch("abc"), [graph.Node("x")]
+        short_branch[0].children.add(long_branch[-1])
+        r.children.update([long_branch[0], short_branch[0]])
+
+        layers = list(search.breadth_first_layers(r))
+        self.assertEquals(len(layers), 5)
+        self.assertEquals([depth for _, _, depth in layers], [0, 1, 1, 2, 2])
+
+        parents = dict((node, parent) for node, parent, _ in layers)
+        self.assertEquals(parents[graph.Node("c")], graph.Node("x"))
+
+
+
+class SearchStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.root, self.a, self.b, self.goal = [graph.Node(i) for i in range(4)]
+        self.root.children.update([self.a, self.b])
+        self.a.children.add(self.goal)
+
+
+    def expander(self, extensions, queue):
+        queue.extend(extensions)
+
+
+    def test_counts(self):
+        stats = search.SearchStats()
+        paths = search._generic_search(self.root, lambda n: n is self.goal,
+                                       self.expander, stats=stats)
+        self.assertEqual(list(paths), [[self.root, self.a, self.goal]])
+
+        self.assertEqual(stats.expanded, 4)
+        self.assertEqual(stats.lookups, 4)
+        self.assertEqual(stats.generated, 3)
+        self.assertEqual(stats.max_queue, 2)
+        self.assertTrue(0 <= stats.lookup_time <= stats.search_time)
+
+
+    def test_branch_and_bound_counts(self):
+        stats = search.SearchStats()
+        paths = search._generic_search(self.root, lambda n: n is self.goal,
+                                       self.expander, lower_bound=lambda n: 0,
+                                       stats=stats)
+        self.assertEqual(list(paths), [[self.root, self.a, self.goal]])
+        self.assertEqual(stats.generated, 3)
+        self.assertEqual(stats.expanded, 3) # the goal is not expanded
+
+
+    def test_without_stats(self):
+        paths = search._generic_search(self.root, lambda n: n is self.goal,
+                                       self.expander)
+        self.assertEqual(list(paths), [[self.root, self.a, self.goal]])
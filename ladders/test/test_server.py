@@ -0,0 +1,122 @@
+import json
+import socket
+import threading
+import unittest
+
+from ladders import main, server, wordgraph
+
+
+def forever(*args, **kwargs):
+    while True:
+        pass
+    yield
+
+
+
+class LadderServiceTests(unittest.TestCase):
+    words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY"]
+    jobs = 0
+
+
+    def setUp(self):
+        main.algorithms["forever"] = forever
+        source = wordgraph.WordGraph.from_words(self.words)
+        self.service = server.LadderService({"pigsty": (self.words, source)},
+                                            timeout=1, jobs=self.jobs)
+
+
+    def tearDown(self):
+        self.service.close()
+        del main.algorithms["forever"]
+
+
+    def test_ladder(self):
+        response = self.service.answer({"start": "pig", "target": "sty",
+                                        "id": 7})
+        self.assertEqual(response, {"start": "PIG", "target": "STY",
+                                    "ladder": self.words, "length": 6,
+                                    "id": 7})
+
+
+    def test_no_ladder(self):
+        response = self.service.answer({"start": "PIG", "target": "CAT"})
+        self.assertEqual((response["ladder"], response["length"]), (None, 0))
+
+
+    def test_errors(self):
+        for query in [[], {"start": "PIG"},
+                      {"start": "PIG", "target": "STY", "dictionary": "x"},
+                      {"start": "PIG", "target": "STY", "algorithm": "x"},
+                      {"start": "PIG", "target": "STY", "dictionary": ["x"]},
+                      {"start": "PIG", "target": "STY", "dictionary": {}},
+                      {"start": "PIG", "target": "STY", "algorithm": ["x"]},
+                      {"start": "PIG", "target": "STY", "algorithm": {}},
+                      {"start": "PIG", "target": "STY", "timeout": "x"},
+                      {"start": "PIG", "target": "STY", "timeout": -1},
+                      {"start": "PIG", "target": "STY", "timeout": 0},
+                      {"start": "PIG", "target": "STY", "timeout": True},
+                      {"start": "PIG", "target": "STY", "beam_width": 0},
+                      {"start": u"P\xcfG", "target": "STY"}]:
+            self.assertIn("error", self.service.answer(query), query)
+
+
+    def test_beam(self):
+        response = self.service.answer({"start": "PIG", "target": "STY",
+                                        "algorithm": "beam", "beam_width": 1})
+        self.assertEqual(response["ladder"], self.words)
+
+
+    def test_error_keeps_id(self):
+        response = self.service.answer({"start": "PIG", "id": "a"})
+        self.assertEqual(response["id"], "a")
+
+
+
+class WorkerLadderServiceTests(LadderServiceTests):
+    jobs = 1
+
+
+    def test_timeout(self):
+        response = self.service.answer({"start": "PIG", "target": "STY",
+                                        "algorithm": "forever",
+                                        "timeout": 0.05})
+        self.assertEqual(response, {"error": "timed out"})
+
+        response = self.service.answer({"start": "PIG", "target": "STY"})
+        self.assertEqual(response["length"], 6)
+
+
+
+class SocketTests(unittest.TestCase):
+    def setUp(self):
+        words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY"]
+        source = wordgraph.WordGraph.from_words(words)
+        self.service = server.LadderService({"pigsty": (words, source)},
+                                            jobs=0)
+        self.server = server.make_server(self.service, port=0)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.close()
+
+
+    def test_json_lines(self):
+        connection = socket.create_connection(self.server.server_address)
+        f = connection.makefile("r+")
+        try:
+            f.write('{"start": "PIG", "target": "STY"}\n\nnonsense\n')
+            f.write('{"start": "WIG", "target": "WAG"}\n')
+            f.flush()
+            responses = [json.loads(f.readline()) for _ in xrange(3)]
+        finally:
+            f.close()
+            connection.close()
+
+        self.assertEqual(responses[0]["length"], 6)
+        self.assertIn("error", responses[1])
+        self.assertEqual(responses[2]["ladder"], ["WIG", "WAG"])
@@ -0,0 +1,136 @@
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+
+from ladders import table
+
+
+words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY", "PAG", "PAY", "CAT", "COT"]
+
+
+class Interrupted(Exception):
+    pass
+
+
+
+class TableTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "table")
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def test_distances(self):
+        table.build(self.path, words)
+        t = table.DistanceTable(self.path)
+
+        self.assertEqual(len(t), len(words))
+        self.assertEqual(t.distance("PIG", "PIG"), 0)
+        self.assertEqual(t.distance("PIG", "WIG"), 1)
+        self.assertEqual(t.distance("PIG", "STY"), 4)
+        self.assertEqual(t.distance("STY", "PIG"), 4)
+        self.assertEqual(t.distance("PIG", "CAT"), None)
+        self.assertEqual(t.distance("PIG", "DOG"), None)
+
+
+    def test_paths(self):
+        table.build(self.path, words)
+        t = table.DistanceTable(self.path)
+
+        self.assertEqual(t.path("PIG", "STY"), ["PIG", "PAG", "PAY", "SAY", "STY"])
+        self.assertEqual(t.path("CAT", "COT"), ["CAT", "COT"])
+        self.assertEqual(t.path("WIG", "WIG"), ["WIG"])
+        self.assertEqual(t.path("WIG", "COT"), None)
+
+
+    def test_find_ladders(self):
+        table.build(self.path, words)
+        ladder, = table.DistanceTable(self.path).find_ladders("WIG", "SAY")
+        self.assertEqual([node.name for node in ladder],
+                         ["WIG", "WAG", "WAY", "SAY"])
+
+
+    def test_contains(self):
+        table.build(self.path, words)
+        t = table.DistanceTable(self.path)
+        self.assertIn("WAG", t)
+        self.assertNotIn("ZAG", t)
+        self.assertNotIn("WAGS", t)
+
+
+    def test_resume(self):
+        """
+        Tests that an interrupted build can be finished later.
+        """
+        def interrupt(done, total):
+            if done >= 3:
+                raise Interrupted()
+
+        self.assertRaises(Interrupted, table.build, self.path, words,
+                          interrupt, batch_size=1)
+        self.assertRaises(table.TableError, table.DistanceTable, self.path)
+
+        progress = []
+        table.build(self.path, words,
+                    lambda done, total: progress.append(done), batch_size=1)
+        self.assertEqual(progress, range(4, len(words) + 1))
+        self.assertEqual(table.DistanceTable(self.path).distance("PIG", "STY"), 4)
+
+
+    def test_different_words(self):
+        """
+        Tests that a table for other words is rebuilt instead of resumed.
+        """
+        table.build(self.path, words[:3])
+        table.build(self.path, words)
+        self.assertEqual(len(table.DistanceTable(self.path)), len(words))
+
+
+    def test_different_lengths(self):
+        self.assertRaises(ValueError, table.build, self.path, ["PIG", "PIGS"])
+
+
+    def test_not_a_table(self):
+        with open(self.path, "wb") as f:
+            f.write("PIG\nWIG\n" * 10)
+        self.assertRaises(table.TableError, table.DistanceTable, self.path)
+
+
+    def test_truncated(self):
+        table.build(self.path, words)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        for size in (len(data) - 1, len(data) // 2, table.HEADER.size):
+            with open(self.path, "wb") as f:
+                f.write(data[:size])
+            self.assertRaises(table.TableError, table.DistanceTable,
+                              self.path)
+
+
+    def test_empty(self):
+        open(self.path, "wb").close()
+        self.assertRaises(table.TableError, table.DistanceTable, self.path)
+
+
+    def test_invalid_files_are_closed(self):
+        """
+        Tests that the mapping is closed when a file turns out not to be a
+        usable table.
+        """
+        maps, real_mmap = [], mmap.mmap
+        def tracked_mmap(*args, **kwargs):
+            maps.append(real_mmap(*args, **kwargs))
+            return maps[-1]
+        mmap.mmap = tracked_mmap
+        self.addCleanup(setattr, mmap, "mmap", real_mmap)
+
+        with open(self.path, "wb") as f:
+            f.write("PIG\nWIG\n" * 10)
+        self.assertRaises(table.TableError, table.DistanceTable, self.path)
+        (mapping,) = maps
+        self.assertRaises(ValueError, len, mapping) # closed
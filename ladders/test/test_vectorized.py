@@ -0,0 +1,64 @@
+import unittest
+
+from ladders import graph, heuristic, naive, vectorized
+
+
+words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY", "PIGS", "WIGS"]
+
+
+@unittest.skipUnless(vectorized.numpy, "NumPy is not installed")
+class WordMatrixTests(unittest.TestCase):
+    def setUp(self):
+        self.matrix = vectorized.WordMatrix(words)
+
+
+    def test_words(self):
+        self.assertEqual(self.matrix.words(3),
+                         ["PIG", "SAY", "STY", "WAG", "WAY", "WIG"])
+        self.assertEqual(self.matrix.words(4), ["PIGS", "WIGS"])
+        self.assertEqual(self.matrix.words(5), [])
+        self.assertIn("WAG", self.matrix)
+        self.assertNotIn("WAGS", self.matrix)
+
+
+    def test_distances(self):
+        distances = self.matrix.distances("PIG").tolist()
+        expected = [graph.distance("PIG", w) for w in self.matrix.words(3)]
+        self.assertEqual(distances, expected)
+
+
+    def test_frontier_distances(self):
+        frontier = ["PIG", "SAY"]
+        distances = self.matrix.frontier_distances(frontier).tolist()
+        expected = [[graph.distance(f, w) for w in self.matrix.words(3)]
+                    for f in frontier]
+        self.assertEqual(distances, expected)
+
+
+    def test_find_adjacent_words(self):
+        self.assertEqual(set(self.matrix.find_adjacent_words("WAG")),
+                         set(["WIG", "WAY"]))
+        self.assertEqual(set(self.matrix.find_adjacent_words("PIGS")),
+                         set(["WIGS"]))
+        self.assertEqual(list(self.matrix.find_adjacent_words("ABCDE")), [])
+
+
+    def test_distances_to(self):
+        distance_to_sty = self.matrix.distances_to("STY")
+        for word in words[:6] + ["XYZ"]:
+            self.assertEqual(distance_to_sty(word), graph.distance(word, "STY"))
+
+
+    def test_ladders(self):
+        for find_ladders in [naive.bidirectional, heuristic.find_ladders,
+                             heuristic.a_star, heuristic.ida_star]:
+            ladder = find_ladders("PIG", "STY", words, self.matrix).next()
+            self.assertEqual([node.name for node in ladder],
+                             ["PIG", "WIG", "WAG", "WAY", "SAY", "STY"])
+
+
+
+class FallbackTests(unittest.TestCase):
+    def test_distance_to_without_source(self):
+        distance_to_sty = graph.distance_to("STY")
+        self.assertEqual(distance_to_sty(graph.Node("SAY")), 1)
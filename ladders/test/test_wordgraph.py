@@ -0,0 +1,117 @@
+import unittest
+
+from ladders import blind, heuristic, graph, wordgraph
+
+
+class WordGraphTests(unittest.TestCase):
+    def setUp(self):
+        words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY", "PIG", "CAT"]
+        self.graph = wordgraph.WordGraph.from_words(words)
+
+
+    def test_interning(self):
+        self.assertEqual(len(self.graph), 7)
+        self.assertEqual(self.graph.id("PIG"), 0)
+        self.assertEqual(self.graph.word(5), "STY")
+        self.assertIn("CAT", self.graph)
+        self.assertNotIn("DOG", self.graph)
+        self.assertRaises(KeyError, self.graph.id, "DOG")
+
+
+    def test_offsets(self):
+        self.assertEqual(len(self.graph.offsets), len(self.graph) + 1)
+        self.assertEqual(self.graph.offsets[-1], len(self.graph.neighbor_ids))
+
+
+    def test_neighbors(self):
+        neighbors = self.graph.neighbors(self.graph.id("WAG"))
+        self.assertEqual(self.graph.path_words(neighbors), ["WIG", "WAY"])
+
+
+    def test_isolated_word(self):
+        self.assertFalse(self.graph.neighbors(self.graph.id("CAT")))
+
+
+    def test_find_adjacent_words(self):
+        adjacent_words = set(self.graph.find_adjacent_words("WAY"))
+        self.assertEqual(adjacent_words, set(["WAG", "SAY"]))
+
+
+    def test_find_adjacent_words_unknown_word(self):
+        adjacent_words = set(self.graph.find_adjacent_words("SAG"))
+        self.assertEqual(adjacent_words, set(["WAG", "SAY"]))
+
+
+
+class ComponentTests(unittest.TestCase):
+    def setUp(self):
+        words = ["PIG", "WIG", "WAG", "CAT", "COT", "DOG", "PIGS"]
+        self.graph = wordgraph.WordGraph.from_words(words)
+
+
+    def component(self, word):
+        return self.graph.components[self.graph.id(word)]
+
+
+    def test_labels(self):
+        self.assertEqual(len(self.graph.components), len(self.graph))
+        self.assertEqual(self.component("PIG"), self.component("WAG"))
+        self.assertEqual(self.component("CAT"), self.component("COT"))
+        self.assertNotEqual(self.component("PIG"), self.component("CAT"))
+        self.assertNotEqual(self.component("DOG"), self.component("COT"))
+
+
+    def test_connected(self):
+        self.assertTrue(self.graph.connected("PIG", "WAG"))
+        self.assertFalse(self.graph.connected("PIG", "CAT"))
+        self.assertFalse(self.graph.connected("PIG", "PIGS"))
+        self.assertTrue(self.graph.connected("DOG", "DOG"))
+
+
+    def test_connected_unknown_words(self):
+        self.assertTrue(self.graph.connected("CAG", "PIG"))
+        self.assertTrue(self.graph.connected("CAG", "COT"))
+        self.assertFalse(self.graph.connected("XYZ", "PIG"))
+        self.assertFalse(self.graph.connected("PIG", "PIT"))
+
+
+
+class WordGraphSearchTests(unittest.TestCase):
+    """
+    Tests that the search functions can run directly on word IDs.
+    """
+    def setUp(self):
+        words = ["PIG", "WIG", "WAG", "WAY", "SAY", "STY", "PAG", "PAY"]
+        self.graph = wordgraph.WordGraph.from_words(words)
+        self.root, self.target = self.graph.id("PIG"), self.graph.id("STY")
+
+
+    def goal(self, word_id):
+        return word_id == self.target
+
+
+    def test_breadth_first(self):
+        paths = blind.breadth_first_search(self.root, self.goal,
+                                           self.graph.neighbors)
+        words = self.graph.path_words(paths.next())
+        self.assertEqual(words, ["PIG", "PAG", "PAY", "SAY", "STY"])
+
+
+    def test_depth_first(self):
+        paths = blind.depth_first_search(self.root, self.goal,
+                                         self.graph.neighbors)
+        for path in paths:
+            self.assertFalse(graph.has_cycle(path))
+            words = self.graph.path_words(path)
+            self.assertEqual((words[0], words[-1]), ("PIG", "STY"))
+
+
+    def test_heuristic(self):
+        def _heuristic(path):
+            return graph.distance(self.graph.word(path[-1]), "STY")
+
+        paths = heuristic.heuristic_search(self.root, self.goal, _heuristic,
+                                           self.graph.neighbors)
+        words = self.graph.path_words(paths.next())
+        self.assertEqual(words[0], "PIG")
+        self.assertEqual(words[-1], "STY")
@@ -0,0 +1,54 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from ladders import wordlist
+
+
+lines = ["pig\n", "  WIG \n", "\n", "don't\n", "PIG\n", "SWIG\n", "42\n"]
+
+
+class ReadWordsTests(unittest.TestCase):
+    def test_normalization(self):
+        words = list(wordlist.read_words(lines))
+        self.assertEqual(words, ["PIG", "WIG", "SWIG"])
+
+
+    def test_lengths(self):
+        self.assertEqual(list(wordlist.read_words(lines, set([4]))), ["SWIG"])
+        self.assertEqual(list(wordlist.read_words(lines, set([3, 4]))),
+                         ["PIG", "WIG", "SWIG"])
+
+
+    def test_lazy(self):
+        words = wordlist.read_words(iter(lines))
+        self.assertEqual(words.next(), "PIG")
+
+
+
+class LoadWordsTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def test_plain(self):
+        path = os.path.join(self.directory, "words")
+        with open(path, "w") as f:
+            f.writelines(lines)
+
+        self.assertEqual(wordlist.load_words(path, set([3])), ["PIG", "WIG"])
+
+
+    def test_gzip(self):
+        path = os.path.join(self.directory, "words") # no .gz extension
+        f = gzip.open(path, "wb")
+        f.writelines(lines)
+        f.close()
+
+        self.assertEqual(wordlist.load_words(path), ["PIG", "WIG", "SWIG"])
@@ -0,0 +1,119 @@
+"""
+Vectorized distance computations, using NumPy.
+
+NumPy is optional. Without it, ``numpy`` is None and word matrices can't be
+built; everything else falls back to the pure Python implementations.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from ladders import graph
+
+
+
+class WordMatrix(object):
+    """
+    A word list stored as one two-dimensional array of letters per length.
+
+    Row ``i`` of the matrix for a length holds the letters of the ``i``th
+    word of that length, as unsigned bytes. The distances from one word to
+    every word of the same length are then computed in a single vectorized
+    comparison instead of a Python loop per word.
+
+    A word matrix has a ``find_adjacent_words`` method, so it can be used as
+    a neighbor source for ladder nodes, and a ``distances_to`` method, which
+    ``graph.distance_to`` uses to compute heuristics in bulk.
+    """
+    def __init__(self, words):
+        if numpy is None:
+            raise ImportError("word matrices require NumPy")
+
+        by_length = {}
+        for word in words:
+            by_length.setdefault(len(word), []).append(word)
+
+        self._words, self._matrices, self._rows = {}, {}, {}
+        for length, group in by_length.iteritems():
+            group = sorted(set(group))
+            letters = numpy.frombuffer("".join(group), dtype=numpy.uint8)
+            self._words[length] = group
+            self._matrices[length] = letters.reshape(len(group), length)
+            self._rows[length] = dict((w, i) for i, w in enumerate(group))
+
+
+    def __contains__(self, word):
+        return word in self._rows.get(len(word), ())
+
+
+    def words(self, length):
+        """
+        Returns the words of a length, in the order of the matrix rows.
+        """
+        return self._words.get(length, [])
+
+
+    def distances(self, word):
+        """
+        Returns an array with the distance from the given word to every word
+        of the same length, in the order of ``words``.
+        """
+        matrix = self._matrices.get(len(word))
+        if matrix is None:
+            return numpy.zeros(0, dtype=numpy.intp)
+
+        letters = numpy.frombuffer(word, dtype=numpy.uint8)
+        return (matrix != letters).sum(axis=1)
+
+
+    def frontier_distances(self, frontier):
+        """
+        Returns a matrix with the distance from each of some words of the same
+        length to every word of that length.
+
+        Row ``i`` holds the distances from the ``i``th word of the frontier,
+        in the order of ``words``.
+        """
+        frontier = list(frontier)
+        if not frontier:
+            return numpy.zeros((0, 0), dtype=numpy.intp)
+
+        length = len(frontier[0])
+        matrix = self._matrices.get(length)
+        if matrix is None:
+            return numpy.zeros((len(frontier), 0), dtype=numpy.intp)
+
+        letters = numpy.frombuffer("".join(frontier), dtype=numpy.uint8)
+        letters = letters.reshape(len(frontier), length)
+        return (matrix[numpy.newaxis, :, :] != letters[:, numpy.newaxis, :]
+                ).sum(axis=2)
+
+
+    def find_adjacent_words(self, word):
+        """
+        Finds the words that differ from the given word by exactly one letter.
+        """
+        words = self.words(len(word))
+        return (words[i] for i in numpy.flatnonzero(self.distances(word) == 1))
+
+
+    def distances_to(self, target):
+        """
+        Returns a function that computes the distance from a word to the
+        target.
+
+        The distances from every word of the target's length are computed
+        up front, in one go; looking one up is a dictionary lookup. Words
+        that aren't in the matrix are compared to the target one by one.
+        """
+        distances = self.distances(target).tolist()
+        rows = self._rows.get(len(target), {})
+
+        def distance_to_target(word):
+            row = rows.get(word)
+            if row is None:
+                return graph.distance(word, target)
+            return distances[row]
+
+        return distance_to_target
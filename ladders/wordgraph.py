@@ -0,0 +1,184 @@
+"""
+A compact word adjacency graph, addressed by integer word IDs.
+"""
+import array
+import collections
+
+from ladders import graph, index
+
+
+
+class WordGraph(object):
+    """
+    The adjacency graph of a word list.
+
+    Every word is interned to an integer ID (its position in ``words``). The
+    adjacency is stored in compressed sparse row form: the neighbors of the
+    word with ID ``i`` are ``neighbor_ids[offsets[i]:offsets[i + 1]]``. Both
+    are flat arrays of unsigned integers, so the whole graph costs a few
+    bytes per edge instead of an object per node.
+
+    The search functions can run directly on IDs by passing ``neighbors`` as
+    the children function. A word graph also has a ``find_adjacent_words``
+    method, so it can be used as a neighbor source for ladder nodes.
+
+    Every word is also labeled with the connected component it is in, so
+    whether there is a ladder between two words at all can be answered
+    without searching.
+    """
+    def __init__(self, words, offsets, neighbor_ids, components=None):
+        self.words = words
+        self.offsets = offsets
+        self.neighbor_ids = neighbor_ids
+        self._ids = self._index(words)
+
+        if components is None:
+            components = _label_components(offsets, neighbor_ids)
+        self.components = components
+
+
+    @classmethod
+    def from_words(cls, words):
+        """
+        Builds the graph of a word list.
+
+        Duplicate words are ignored; IDs are assigned in order of first
+        appearance.
+        """
+        unique_words, seen = [], set()
+        for word in words:
+            if word not in seen:
+                seen.add(word)
+                unique_words.append(word)
+
+        buckets = collections.defaultdict(list)
+        for word_id, word in enumerate(unique_words):
+            for pattern in index.wildcard_patterns(word):
+                buckets[pattern].append(word_id)
+
+        offsets, neighbor_ids = array.array("I", [0]), array.array("I")
+        for word_id, word in enumerate(unique_words):
+            adjacent = set()
+            for pattern in index.wildcard_patterns(word):
+                adjacent.update(buckets[pattern])
+            adjacent.discard(word_id)
+
+            neighbor_ids.extend(sorted(adjacent))
+            offsets.append(len(neighbor_ids))
+
+        return cls(unique_words, offsets, neighbor_ids)
+
+
+    def _index(self, words):
+        """
+        Returns a mapping from words to their IDs.
+        """
+        return dict((word, i) for i, word in enumerate(words))
+
+
+    def __len__(self):
+        return len(self.words)
+
+
+    def __contains__(self, word):
+        return word in self._ids
+
+
+    def id(self, word):
+        """
+        Returns the ID of a word.
+
+        @raise KeyError: If the word is not in the graph.
+        """
+        return self._ids[word]
+
+
+    def word(self, word_id):
+        """
+        Returns the word with the given ID.
+        """
+        return self.words[word_id]
+
+
+    def neighbors(self, word_id):
+        """
+        Returns the IDs of the words adjacent to the word with the given ID.
+        """
+        return self.neighbor_ids[self.offsets[word_id]:self.offsets[word_id + 1]]
+
+
+    def connected(self, start, target):
+        """
+        Checks if there can be a ladder from the start word to the target.
+
+        The target has to be in the graph. The start word does not, but then
+        one of its adjacent words has to be connected to the target. For
+        words in the graph, this takes constant time.
+        """
+        if start == target:
+            return True
+        elif target not in self._ids:
+            return False
+
+        component = self.components[self._ids[target]]
+        if start in self._ids:
+            return self.components[self._ids[start]] == component
+
+        return any(self.components[self._ids[word]] == component
+                   for word in self.find_adjacent_words(start))
+
+
+    def path_words(self, path):
+        """
+        Translates a path of word IDs into the list of words on that path.
+        """
+        return [self.words[word_id] for word_id in path]
+
+
+    def find_adjacent_words(self, word):
+        """
+        Finds the words adjacent to the given word.
+
+        Words that are not in the graph have to be compared against every
+        word in it, which is slow, but usually only happens for the start
+        word of a ladder.
+        """
+        try:
+            word_id = self._ids[word]
+        except KeyError:
+            return (w for w in self.words if graph.adjacent(w, word))
+
+        return (self.words[i] for i in self.neighbors(word_id))
+
+
+
+def _label_components(offsets, neighbor_ids):
+    """
+    Labels every word with the connected component it is in.
+
+    Uses union-find over the edges. The label of a component is the ID of
+    one of the words in it.
+    """
+    parents = range(len(offsets) - 1)
+    sizes = [1] * len(parents)
+
+    def find(word_id):
+        while parents[word_id] != word_id:
+            parents[word_id] = parents[parents[word_id]] # path halving
+            word_id = parents[word_id]
+        return word_id
+
+    for word_id in xrange(len(parents)):
+        for neighbor_id in neighbor_ids[offsets[word_id]:offsets[word_id + 1]]:
+            if neighbor_id < word_id:
+                continue # every edge is stored both ways
+
+            first, second = find(word_id), find(neighbor_id)
+            if first == second:
+                continue
+            if sizes[first] < sizes[second]:
+                first, second = second, first
+            parents[second] = first
+            sizes[first] += sizes[second]
+
+    return array.array("I", (find(word_id) for word_id in xrange(len(parents))))
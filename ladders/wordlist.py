@@ -0,0 +1,73 @@
+"""
+Reading word lists.
+"""
+import gzip
+import sys
+
+from ladders import compiled
+
+
+GZIP_MAGIC = "\x1f\x8b"
+
+
+def open_word_list(fn):
+    """
+    Opens a word list for reading.
+
+    A file name of ``-`` means standard input. Gzipped files are recognized
+    by their contents, so they don't need a ``.gz`` extension.
+    """
+    if fn == "-":
+        return sys.stdin
+
+    with open(fn, "rb") as f:
+        magic = f.read(len(GZIP_MAGIC))
+
+    if magic == GZIP_MAGIC:
+        return gzip.open(fn, "rb")
+    else:
+        return open(fn)
+
+
+def read_words(f, lengths=None):
+    """
+    Reads words from a file, one per line.
+
+    Words are stripped and uppercased. Lines that aren't a single word made
+    of letters are skipped, and so are words that were already read. If
+    lengths are given, only words with one of those lengths are kept.
+
+    Words are read lazily, one line at a time, so only the words that are
+    kept take up any memory.
+    """
+    seen = set()
+
+    for line in f:
+        word = line.strip().upper()
+        if not word.isalpha() or word in seen:
+            continue
+        if lengths is not None and len(word) not in lengths:
+            continue
+
+        seen.add(word)
+        yield word
+
+
+def load_words(fn, lengths=None):
+    """
+    Reads a word list from a file; see ``open_word_list`` and ``read_words``.
+    Compiled word lists (see ``ladders.compiled``) can be read too.
+
+    Returns a list of words.
+    """
+    if compiled.is_compiled(fn):
+        words = compiled.CompiledGraph(fn).words
+        return [word for word in words
+                if lengths is None or len(word) in lengths]
+
+    f = open_word_list(fn)
+    try:
+        return list(read_words(f, lengths))
+    finally:
+        if f is not sys.stdin:
+            f.close()